@@ -4,17 +4,13 @@ import os
 from argparse import Namespace
 from time import perf_counter
 
-from ariadne import (
-    gql,
-    graphql_sync,
-)
+from ariadne import graphql_sync
 
-from dataall.base.api import bootstrap as bootstrap_schema, get_executable_schema
+from dataall.base.api import bootstrap as bootstrap_schema, get_executable_schema, read_schema_sdl
+from dataall.base.api.document_cache import document_cache
 from dataall.base.utils.api_handler_utils import (
     extract_groups,
-    attach_tenant_policy_for_groups,
-    check_reauth,
-    validate_and_block_if_maintenance_window,
+    run_preflight_checks,
     redact_creds,
 )
 from dataall.core.tasks.service_handlers import Worker
@@ -23,6 +19,7 @@ from dataall.base.context import set_context, dispose_context, RequestContext
 from dataall.base.db import get_engine
 from dataall.base.loader import load_modules, ImportMode
 
+from graphql import GraphQLError
 from graphql.pyutils import did_you_mean
 
 logger = logging.getLogger()
@@ -40,7 +37,8 @@ if not ALLOW_INTROSPECTION:
 
 load_modules(modes={ImportMode.API})
 SCHEMA = bootstrap_schema()
-TYPE_DEFS = gql(SCHEMA.gql(with_directives=False))
+# SDL of the schema written when the image was built, see dataall.base.api.build_sdl
+SCHEMA_SDL_PATH = os.getenv('GRAPHQL_SCHEMA_SDL_PATH')
 ENVNAME = os.getenv('envname', 'local')
 ENGINE = get_engine(envname=ENVNAME)
 ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*')
@@ -64,7 +62,7 @@ def resolver_adapter(resolver):
     return adapted
 
 
-executable_schema = get_executable_schema()
+executable_schema = get_executable_schema(SCHEMA, type_defs=read_schema_sdl(SCHEMA_SDL_PATH))
 end = perf_counter()
 print(f'Lambda Context Initialization took: {end - start:.3f} sec')
 
@@ -122,7 +120,6 @@ def handler(event, context):
         log.debug('username is %s', username)
 
         groups: list = extract_groups(user_id=user_id, claims=claims)
-        attach_tenant_policy_for_groups(groups=groups)
 
         set_context(RequestContext(ENGINE, username, groups, user_id))
         app_context = {
@@ -132,34 +129,50 @@ def handler(event, context):
             'schema': SCHEMA,
         }
 
-        query = json.loads(event.get('body'))
+        try:
+            query = document_cache.resolve_persisted_query(json.loads(event.get('body')))
+        except GraphQLError as e:
+            dispose_context()
+            return response_with_headers(200, json.dumps({'errors': [e.formatted]}))
 
-        maintenance_window_validation_response = validate_and_block_if_maintenance_window(query=query, groups=groups)
-        if maintenance_window_validation_response is not None:
-            return maintenance_window_validation_response
-        reauth_validation_response = check_reauth(query=query, auth_time=claims['auth_time'], username=username)
-        if reauth_validation_response is not None:
-            return reauth_validation_response
+        preflight_response = run_preflight_checks(
+            query=query, groups=groups, auth_time=claims['auth_time'], username=username
+        )
+        if preflight_response is not None:
+            return preflight_response
 
     else:
         raise Exception(f'Could not initialize user context from event {event}')
 
     success, response = graphql_sync(
-        schema=executable_schema, data=query, context_value=app_context, introspection=ALLOW_INTROSPECTION
+        schema=executable_schema,
+        data=query,
+        context_value=app_context,
+        introspection=ALLOW_INTROSPECTION,
+        query_parser=document_cache.query_parser,
+        query_validator=document_cache.query_validator,
     )
 
+    try:
+        SqsQueue.flush()
+    except Exception:
+        log.exception('Failed to send the tasks queued by the request')
     dispose_context()
     response = json.dumps(response)
 
     log.info('Lambda Response Success: %s', success)
     log.debug('Lambda Response %s', response)
+    return response_with_headers(200 if success else 400, response)
+
+
+def response_with_headers(status_code, body):
     return {
-        'statusCode': 200 if success else 400,
+        'statusCode': status_code,
         'headers': {
             'content-type': 'application/json',
             'Access-Control-Allow-Origin': ALLOWED_ORIGINS,
             'Access-Control-Allow-Headers': '*',
             'Access-Control-Allow-Methods': '*',
         },
-        'body': response,
+        'body': body,
     }
@@ -3,7 +3,7 @@ import logging
 import os
 
 from dataall.core.tasks.service_handlers import Worker
-from dataall.base.db import get_engine
+from dataall.base.db import PoolConfig, get_engine
 from dataall.base.loader import load_modules, ImportMode
 
 logger = logging.getLogger()
@@ -12,16 +12,35 @@ log = logging.getLogger(__name__)
 
 ENVNAME = os.getenv('envname', 'local')
 
-engine = get_engine(envname=ENVNAME)
-
 load_modules(modes={ImportMode.HANDLERS})
 
+engine = get_engine(envname=ENVNAME, pool_config=PoolConfig.for_import_modes({ImportMode.HANDLERS}))
+
 
 def handler(event, context=None):
-    """Processes  messages received from sqs"""
+    """
+    Processes a batch of messages received from sqs.
+    The tasks of all the messages are processed together, if they can not be claimed or their results saved
+    the messages are reported as failed so that only them are retried by SQS: Worker.process has then made
+    the claimed tasks pending again for the retry
+    """
     log.info(f'Received Event: {event}')
+    task_ids = {}
+    failures = []
     for record in event['Records']:
         log.info('Consumed record from queue: %s' % record)
-        message = json.loads(record['body'])
+        try:
+            message = json.loads(record['body'])
+        except ValueError:
+            log.exception(f'Invalid message {record["messageId"]}')
+            failures.append({'itemIdentifier': record['messageId']})
+            continue
         log.info(f'Extracted Message: {message}')
-        Worker.process(engine=engine, task_ids=message)
+        task_ids[record['messageId']] = message
+
+    try:
+        Worker.process(engine=engine, task_ids=[task_id for message in task_ids.values() for task_id in message])
+    except Exception:
+        log.exception('Failed to process the tasks of the batch')
+        failures.extend({'itemIdentifier': message_id} for message_id in task_ids)
+    return {'batchItemFailures': failures}
@@ -1,3 +1,4 @@
+import os
 from argparse import Namespace
 
 from ariadne import (
@@ -68,8 +69,20 @@ def resolver_adapter(resolver):
     return adapted
 
 
-def get_executable_schema():
-    schema = bootstrap()
+def read_schema_sdl(path):
+    """Returns the SDL written by build_sdl when the API image was built, None if there is none"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
+
+
+def get_executable_schema(schema=None, type_defs=None):
+    """
+    :param schema: the schema returned by bootstrap, bootstrapped if None
+    :param type_defs: the SDL of the schema, generated from the schema if None
+    """
+    schema = schema or bootstrap()
     _types = []
     for _type in schema.types:
         if _type.name == 'Query':
@@ -103,6 +116,6 @@ def get_executable_schema():
     for union in schema.unions:
         _unions.append(UnionType(union.name, union.resolver))
 
-    type_defs = GQL(schema.gql(with_directives=False))
+    type_defs = type_defs or GQL(schema.gql(with_directives=False))
     executable_schema = make_executable_schema(type_defs, *(_types + _enums + _unions))
     return executable_schema
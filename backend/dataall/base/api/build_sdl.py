@@ -0,0 +1,14 @@
+"""
+Writes the SDL of the API schema to the given file. Run when the API image is built, so that the Lambda does not
+generate and validate the SDL on cold starts: python -m dataall.base.api.build_sdl schema.graphql
+"""
+
+import sys
+
+from dataall.base.api import bootstrap
+from dataall.base.loader import load_modules, ImportMode
+
+if __name__ == '__main__':
+    load_modules(modes={ImportMode.API})
+    with open(sys.argv[1], 'w') as f:
+        f.write(bootstrap().gql(with_directives=False))
@@ -0,0 +1,69 @@
+"""
+Request scoped batching and caching of the lookups done by field resolvers.
+
+GraphQL resolves the nested fields of a list one parent object at a time, so a field such as S3Dataset.environment
+runs one query per listed dataset. A DataLoader collects the keys that are about to be requested (primed by the
+resolver that returns the list) and fetches all of them with a single IN (...) query on the first load.
+Loaded objects are memoized until the end of the request.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List
+
+from dataall.base.context import get_context, get_request_cache
+
+log = logging.getLogger(__name__)
+
+
+class DataLoader:
+    def __init__(self, batch_load_fn: Callable[[Any, List[str]], Iterable[Any]], key: Callable[[Any], str]):
+        """
+        :param batch_load_fn: function(session, keys) returning the objects found for the keys
+        :param key: function returning the key of a loaded object
+        """
+        self._batch_load_fn = batch_load_fn
+        self._key = key
+        self._cache: Dict[str, Any] = {}
+        self._pending: List[str] = []
+
+    def prime(self, keys: Iterable[str]) -> None:
+        """Registers keys to fetch with the next load, does not run any query"""
+        for key in keys:
+            if key and key not in self._cache and key not in self._pending:
+                self._pending.append(key)
+
+    def load(self, key: str) -> Any:
+        """Returns the object for the key or None if it doesn't exist"""
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable[str]) -> List[Any]:
+        keys = list(keys)
+        self.prime(keys)
+        if any(key not in self._cache for key in keys if key):
+            self._dispatch()
+        return [self._cache.get(key) if key else None for key in keys]
+
+    def clear(self, key: str = None) -> None:
+        """Forgets the object of the key (or all objects), e.g. after it has been updated"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        log.debug(f'Batch loading {len(keys)} keys')
+        with get_context().db_engine.scoped_session() as session:
+            found = {self._key(item): item for item in self._batch_load_fn(session, keys)}
+        for key in keys:
+            self._cache[key] = found.get(key)
+
+
+def get_dataloader(name: str, batch_load_fn: Callable[[Any, List[str]], Iterable[Any]], key: Callable[[Any], str]):
+    """Returns the loader with the given name for the current request, creating it on first use"""
+    loaders = get_request_cache('dataloaders')
+    if loaders is None:
+        return DataLoader(batch_load_fn, key)
+    if name not in loaders:
+        loaders[name] = DataLoader(batch_load_fn, key)
+    return loaders[name]
@@ -0,0 +1,121 @@
+"""
+Cache of parsed and validated GraphQL documents.
+
+The frontend sends a fixed set of operations, so a warm container sees the same query texts over and over.
+Parsed documents are kept in an LRU cache keyed by the sha256 of the query text, and the documents that passed
+validation against a schema are not validated again. The hash is the one of Apollo's automatic persisted queries:
+a client can send {"extensions": {"persistedQuery": {"sha256Hash": ...}}} instead of the text of a query
+the container has already seen.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from graphql import DocumentNode, GraphQLError, parse, validate
+
+log = logging.getLogger(__name__)
+
+DOCUMENT_CACHE_SIZE = int(os.getenv('GRAPHQL_DOCUMENT_CACHE_SIZE', '256'))
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__('PersistedQueryNotFound', extensions={'code': 'PERSISTED_QUERY_NOT_FOUND'})
+
+
+class _CachedDocument:
+    __slots__ = ('query', 'document', 'validated')
+
+    def __init__(self, query: str, document: DocumentNode):
+        self.query = query
+        self.document = document
+        # (schema, rules) the document passed validation with
+        self.validated = set()
+
+
+class DocumentCache:
+    """Thread-safe LRU cache of parsed GraphQL documents and of their successful validations"""
+
+    def __init__(self, max_size: int = DOCUMENT_CACHE_SIZE):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def query_hash(query: str) -> str:
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+    def parse(self, query: str) -> DocumentNode:
+        """Returns the parsed document of the query, parse errors are raised and not cached"""
+        return self._get_or_parse(query).document
+
+    def resolve_persisted_query(self, data: dict) -> dict:
+        """
+        Fills in the query text of a request that only sends the hash of a persisted query,
+        and checks that the hash matches the query text when both are sent
+        """
+        query_hash = ((data.get('extensions') or {}).get('persistedQuery') or {}).get('sha256Hash')
+        if not query_hash:
+            return data
+        if data.get('query'):
+            if self.query_hash(data['query']) != query_hash:
+                raise GraphQLError('provided sha does not match query')
+            return data
+        with self._lock:
+            entry = self._entries.get(query_hash)
+            if entry is None:
+                raise PersistedQueryNotFound()
+            self._entries.move_to_end(query_hash)
+        return {**data, 'query': entry.query}
+
+    def query_parser(self, context_value, data: dict) -> DocumentNode:
+        """ariadne query_parser"""
+        return self.parse(data['query'])
+
+    def query_validator(self, schema, document_ast: DocumentNode, rules=None, max_errors=None, type_info=None):
+        """ariadne query_validator, only validates the cached documents once per schema and rules"""
+        key = (id(schema), tuple(rules or ()))
+        entry = self._find(document_ast)
+        if entry is not None and key in entry.validated:
+            return []
+        errors = validate(schema, document_ast, rules=rules, max_errors=max_errors, type_info=type_info)
+        if entry is not None and not errors:
+            with self._lock:
+                entry.validated.add(key)
+        return errors
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get_or_parse(self, query: str) -> _CachedDocument:
+        query_hash = self.query_hash(query)
+        with self._lock:
+            entry = self._entries.get(query_hash)
+            if entry is not None:
+                self._entries.move_to_end(query_hash)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = _CachedDocument(query, parse(query))
+        with self._lock:
+            self._entries[query_hash] = entry
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _find(self, document: DocumentNode):
+        if document.loc is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(self.query_hash(document.loc.source.body))
+        return entry if entry is not None and entry.document is document else None
+
+
+document_cache = DocumentCache()
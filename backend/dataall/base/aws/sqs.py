@@ -1,19 +1,34 @@
 import json
 import logging
 import os
-import uuid
+import threading
+import time
 
 import boto3
 from botocore.exceptions import ClientError
+from sqlalchemy import update
 
+from dataall.base.context import get_request_cache
 from dataall.base.utils import Parameter
+from dataall.core.tasks.db.task_models import Task
 
 logger = logging.getLogger(__name__)
 
+# maximum number of entries of a send_message_batch call
+SEND_BATCH_SIZE = 10
+# seconds during which a task is skipped when a task of the same action and target has already been sent
+COALESCE_WINDOW = int(os.getenv('SQS_COALESCE_WINDOW', '30'))
+
 
 class SqsQueue:
     disabled = True
     queue_url = None
+    # read-only actions whose duplicates within COALESCE_WINDOW are not sent
+    coalesced_actions = {'cloudformation.stack.describe_resources'}
+    _client = None
+    _lock = threading.Lock()
+    # (action, targetUri) -> (taskUri, time it was sent) of the coalesced actions
+    _recently_sent = {}
 
     @classmethod
     def configure_(cls, queue_url):
@@ -37,26 +52,124 @@ class SqsQueue:
 
     @classmethod
     def get_sqs_client(cls):
+        if cls.queue_url is None:
+            cls.configure_(Parameter().get_parameter(env=cls.get_envname(), path='sqs/queue_url'))
         if not cls.disabled:
-            client = boto3.client('sqs', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
-            return client
+            if cls._client is None:
+                cls._client = boto3.client('sqs', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
+            return cls._client
 
     @classmethod
     def send(cls, engine, task_ids: [str]):
-        cls.configure_(Parameter().get_parameter(env=cls.get_envname(), path='sqs/queue_url'))
-        client = cls.get_sqs_client()
-        logger.debug(f'Sending task {task_ids} through SQS {cls.queue_url}')
-        try:
-            return client.send_message(
-                QueueUrl=cls.queue_url,
-                MessageBody=json.dumps(task_ids),
-                MessageGroupId=cls._get_random_message_id(),
-                MessageDeduplicationId=cls._get_random_message_id(),
+        """
+        Queues the tasks. During a request the tasks are buffered and sent with flush when the request ends,
+        otherwise they are sent right away.
+        """
+        buffer = get_request_cache('sqs')
+        if buffer is None:
+            return cls._send(engine, task_ids)
+        buffer.setdefault('engine', engine)
+        buffer.setdefault('task_ids', []).extend(task_ids)
+
+    @classmethod
+    def flush(cls):
+        """Sends the tasks buffered during the current request"""
+        buffer = get_request_cache('sqs')
+        if not buffer or not buffer.get('task_ids'):
+            return
+        task_ids = buffer.pop('task_ids')
+        cls._send(buffer['engine'], task_ids)
+
+    @classmethod
+    def _send(cls, engine, task_ids: [str]):
+        """
+        Sends one message per task, in batches of SEND_BATCH_SIZE messages.
+        The tasks of a target share a message group so that they are processed in order.
+        Tasks that can not be sent are marked as failed and an exception is raised.
+        """
+        with engine.scoped_session() as session:
+            tasks = session.query(Task).filter(Task.taskUri.in_(task_ids)).all()
+            tasks = sorted(tasks, key=lambda task: task_ids.index(task.taskUri))
+
+        entries = []
+        # (task, uri of the task it is coalesced with)
+        coalesced = []
+        # (action, targetUri) -> uri of the task sent for it by this call
+        sending = {}
+        for task in tasks:
+            key = (task.action, task.targetUri) if task.action in cls.coalesced_actions else None
+            sent_uri = key and (sending.get(key) or cls._recently_sent_uri(key))
+            if sent_uri:
+                coalesced.append((task, sent_uri))
+                continue
+            if key:
+                sending[key] = task.taskUri
+            entries.append(
+                {
+                    'MessageBody': json.dumps([task.taskUri]),
+                    'MessageGroupId': task.targetUri,
+                    'MessageDeduplicationId': task.taskUri,
+                }
             )
-        except ClientError as e:
-            logger.error(e)
-            raise e
+
+        logger.debug(f'Sending tasks {task_ids} through SQS {cls.queue_url}')
+        errors = cls._send_entries(entries) if entries else {}
+        cls._record_sent({key: uri for key, uri in sending.items() if uri not in errors})
+
+        updates = [{'taskUri': uri, 'status': 'failed', 'error': {'message': error}} for uri, error in errors.items()]
+        for task, sent_uri in coalesced:
+            if sent_uri in errors:
+                updates.append({'taskUri': task.taskUri, 'status': 'failed', 'error': {'message': errors[sent_uri]}})
+            else:
+                logger.info(f'Task {task.taskUri} coalesced with task {sent_uri}')
+                updates.append(
+                    {'taskUri': task.taskUri, 'status': 'completed', 'response': {'coalescedWith': sent_uri}}
+                )
+        if updates:
+            with engine.scoped_session() as session:
+                session.execute(update(Task), updates)
+        if errors:
+            raise Exception(f'Failed to send the tasks {list(errors)} through SQS')
+
+    @classmethod
+    def _send_entries(cls, entries: [dict]) -> dict:
+        """Sends the entries, retrying the failed ones once, and returns the errors by task uri"""
+        client = cls.get_sqs_client()
+        errors = {}
+        for attempt in range(2):
+            errors = {}
+            failed_entries = []
+            for i in range(0, len(entries), SEND_BATCH_SIZE):
+                batch = [{**entry, 'Id': str(index)} for index, entry in enumerate(entries[i : i + SEND_BATCH_SIZE])]
+                try:
+                    failures = client.send_message_batch(QueueUrl=cls.queue_url, Entries=batch).get('Failed', [])
+                except ClientError as e:
+                    logger.error(e)
+                    failures = [{'Id': entry['Id'], 'Message': str(e)} for entry in batch]
+                for failure in failures:
+                    entry = batch[int(failure['Id'])]
+                    logger.error(f'Failed to send task {entry["MessageBody"]}: {failure.get("Message")}')
+                    failed_entries.append(entries[i + int(failure['Id'])])
+                    errors[entry['MessageDeduplicationId']] = failure.get('Message') or failure.get('Code')
+            if not failed_entries:
+                break
+            entries = failed_entries
+        return errors
+
+    @classmethod
+    def _recently_sent_uri(cls, key):
+        """Returns the uri of the task of the same action and target sent within COALESCE_WINDOW, if any"""
+        with cls._lock:
+            sent = cls._recently_sent.get(key)
+        if sent and time.monotonic() - sent[1] < COALESCE_WINDOW:
+            return sent[0]
+        return None
 
     @classmethod
-    def _get_random_message_id(cls):
-        return str(uuid.uuid4())
+    def _record_sent(cls, sent: dict):
+        """Records the (action, targetUri) of the coalesced actions whose task has been sent"""
+        now = time.monotonic()
+        with cls._lock:
+            cls._recently_sent = {k: v for k, v in cls._recently_sent.items() if now - v[1] < COALESCE_WINDOW}
+            for key, uri in sent.items():
+                cls._recently_sent[key] = (uri, now)
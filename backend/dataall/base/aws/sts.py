@@ -1,7 +1,11 @@
 import json
 import logging
 import os
+import threading
+import time
 import urllib
+from collections import OrderedDict
+from datetime import datetime, timezone
 
 import boto3
 from botocore.client import Config
@@ -21,6 +25,180 @@ except ImportError:
 log = logging.getLogger(__name__)
 
 
+class _CredentialCache:
+    """Process-wide, thread-safe cache of temporary credentials returned by sts:AssumeRole.
+
+    Entries are keyed by (account, region, role arn, external id) and are refreshed
+    REFRESH_MARGIN seconds before the credentials expire.
+    The pivot role external id read from SSM is cached as well for EXTERNAL_ID_TTL seconds.
+    """
+
+    REFRESH_MARGIN = 5 * 60
+    EXTERNAL_ID_TTL = 15 * 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._key_locks = {}
+        self._external_id = None
+        self._external_id_expires_at = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get_external_id(self, loader):
+        with self._lock:
+            if time.monotonic() < self._external_id_expires_at:
+                return self._external_id
+        external_id = loader()
+        if external_id:
+            with self._lock:
+                self._external_id = external_id
+                self._external_id_expires_at = time.monotonic() + self.EXTERNAL_ID_TTL
+        return external_id
+
+    def get_credentials(self, key, assume_role):
+        """Returns cached credentials for the key, calling assume_role() on a miss or when they are about to expire"""
+        with self._lock:
+            credentials = self._get_valid(key)
+            if credentials:
+                self._hits += 1
+                return credentials
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # only one thread assumes a given role at a time, the others wait and reuse its credentials
+        with key_lock:
+            with self._lock:
+                credentials = self._get_valid(key)
+                if credentials:
+                    self._hits += 1
+                    return credentials
+                self._misses += 1
+            credentials = assume_role()
+            with self._lock:
+                self._credentials[key] = credentials
+        return credentials
+
+    def _get_valid(self, key):
+        credentials = self._credentials.get(key)
+        if not credentials:
+            return None
+        expiration = credentials.get('Expiration')
+        if not isinstance(expiration, datetime):
+            return None
+        if expiration.tzinfo is None:
+            expiration = expiration.replace(tzinfo=timezone.utc)
+        remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+        return credentials if remaining > self.REFRESH_MARGIN else None
+
+    def clear(self):
+        with self._lock:
+            self._credentials.clear()
+            self._key_locks.clear()
+            self._external_id = None
+            self._external_id_expires_at = 0
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'size': len(self._credentials)}
+
+
+_credential_cache = _CredentialCache()
+
+
+class _ClientCache:
+    """Process-wide, thread-safe LRU cache of boto3 clients.
+
+    Entries are keyed by (credentials identity, service, region, endpoint, config) so that the clients of
+    the same assumed role credentials are shared by all the sessions built from them.
+    Botocore clients are thread-safe, only their creation is serialized per key.
+    """
+
+    MAX_SIZE = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = OrderedDict()
+        self._key_locks = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_client(self, key, create_client):
+        with self._lock:
+            client = self._get(key)
+            if client is not None:
+                return client
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                client = self._get(key)
+                if client is not None:
+                    return client
+                self._misses += 1
+            client = create_client()
+            with self._lock:
+                self._clients[key] = client
+                if len(self._clients) > self.MAX_SIZE:
+                    evicted, _ = self._clients.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+        return client
+
+    def _get(self, key):
+        client = self._clients.get(key)
+        if client is not None:
+            self._clients.move_to_end(key)
+            self._hits += 1
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._key_locks.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'size': len(self._clients)}
+
+
+_client_cache = _ClientCache()
+
+# botocore configuration of the cached clients, merged with the configuration given by the callers
+DEFAULT_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    max_pool_connections=int(os.getenv('BOTO_MAX_POOL_CONNECTIONS', '32')),
+)
+
+
+class _CachingSession(boto3.Session):
+    """boto3 Session whose clients come from the process-wide client cache"""
+
+    def __init__(self, identity, **kwargs):
+        super().__init__(**kwargs)
+        self._identity = identity
+
+    def client(self, service_name, region_name=None, endpoint_url=None, config=None, **kwargs):
+        if kwargs:
+            # credentials or other overrides, not shared
+            return super().client(
+                service_name, region_name=region_name, endpoint_url=endpoint_url, config=config, **kwargs
+            )
+        config_key = repr(sorted(config._user_provided_options.items())) if config else None
+        key = (self._identity, service_name, region_name or self.region_name, endpoint_url, config_key)
+        return _client_cache.get_client(
+            key,
+            lambda: super(_CachingSession, self).client(
+                service_name,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=DEFAULT_CLIENT_CONFIG.merge(config) if config else DEFAULT_CLIENT_CONFIG,
+            ),
+        )
+
+
 class SessionHelper:
     """SessionHelpers is a class simplifying common aws boto3 session tasks and helpers"""
 
@@ -48,26 +226,32 @@ class SessionHelper:
                     RoleArn=role_arn,
                     RoleSessionName=role_arn.split('/')[1],
                 )
-            try:
-                region = os.getenv('AWS_REGION', 'eu-west-1')
+            region = os.getenv('AWS_REGION', 'eu-west-1')
+
+            def assume_role():
                 sts = base_session.client(
                     'sts',
                     config=Config(user_agent_extra=f'{__pkg_name__}/{__version__}'),
                     region_name=region,
                     endpoint_url=f'https://sts.{region}.amazonaws.com',
                 )
-                response = sts.assume_role(**assume_role_dict)
-                return boto3.Session(
-                    aws_access_key_id=response['Credentials']['AccessKeyId'],
-                    aws_secret_access_key=response['Credentials']['SecretAccessKey'],
-                    aws_session_token=response['Credentials']['SessionToken'],
+                return sts.assume_role(**assume_role_dict)['Credentials']
+
+            try:
+                cache_key = (cls.extract_account_from_role_arn(role_arn), region, role_arn, external_id_secret)
+                credentials = _credential_cache.get_credentials(cache_key, assume_role)
+                return _CachingSession(
+                    identity=(role_arn, credentials['AccessKeyId']),
+                    aws_access_key_id=credentials['AccessKeyId'],
+                    aws_secret_access_key=credentials['SecretAccessKey'],
+                    aws_session_token=credentials['SessionToken'],
                 )
             except ClientError as e:
                 log.error(f'Failed to assume role {role_arn} due to: {e} ')
                 raise e
 
         else:
-            return boto3.Session()
+            return _CachingSession(identity='default')
 
     @classmethod
     def _get_parameter_value(cls, parameter_path=None):
@@ -97,10 +281,38 @@ class SessionHelper:
         :return:
         :rtype:
         """
-        return SessionHelper._get_parameter_value(
-            parameter_path=f'/dataall/{os.getenv("envname", "local")}/pivotRole/externalId'
+        return _credential_cache.get_external_id(
+            lambda: SessionHelper._get_parameter_value(
+                parameter_path=f'/dataall/{os.getenv("envname", "local")}/pivotRole/externalId'
+            )
         )
 
+    @staticmethod
+    def get_credential_cache_stats():
+        """Returns the hits, misses and number of entries of the process-wide assumed role credential cache
+        Returns:
+            dict : {'hits': int, 'misses': int, 'size': int}
+        """
+        return _credential_cache.stats()
+
+    @staticmethod
+    def clear_credential_cache():
+        """Drops all cached assumed role credentials and the cached pivot role external id"""
+        _credential_cache.clear()
+
+    @staticmethod
+    def get_client_cache_stats():
+        """Returns the hits, misses and number of entries of the process-wide boto3 client cache
+        Returns:
+            dict : {'hits': int, 'misses': int, 'size': int}
+        """
+        return _client_cache.stats()
+
+    @staticmethod
+    def clear_client_cache():
+        """Drops all cached boto3 clients"""
+        _client_cache.clear()
+
     @classmethod
     def get_delegation_role_name(cls, region):
         """Returns the role name that this package assumes on remote accounts
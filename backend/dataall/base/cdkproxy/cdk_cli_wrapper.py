@@ -4,10 +4,14 @@
 # see : https://github.com/aws-samples/cdk-assume-role-credential-plugin
 
 import ast
+import hashlib
+import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from abc import abstractmethod
 from typing import Dict
 
@@ -40,6 +44,16 @@ class CDKCliWrapperExtension:
 
 _CDK_CLI_WRAPPER_EXTENSIONS: Dict[str, CDKCliWrapperExtension] = {}
 
+# statuses of the stacks whose last deployment succeeded
+DEPLOYED_STACK_STATUSES = ['CREATE_COMPLETE', 'UPDATE_COMPLETE', 'IMPORT_COMPLETE']
+# context the cdk cli adds with its default settings to the context of the apps it synthesizes
+CDK_CLI_CONTEXT = {
+    'aws:cdk:enable-path-metadata': True,
+    'aws:cdk:enable-asset-metadata': True,
+    'aws:cdk:version-reporting': True,
+    'aws:cdk:bundling-stacks': ['**'],
+}
+
 
 def aws_configure(profile_name='default'):
     print('..............................................')
@@ -134,6 +148,26 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
 
             CommandSanitizer(input_args)
 
+            cdk_app = f'{sys.executable} {app_path}'
+            template_hash = None
+            if not extension:
+                outdir = tempfile.mkdtemp(prefix='cdk.out.')
+                template_hash = synth_cdk_app(stack, app_path, cwd, env, outdir)
+                if template_hash and template_hash == stack.templateHash:
+                    meta = describe_stack(stack)
+                    if meta['StackStatus'] in DEPLOYED_STACK_STATUSES:
+                        logger.info(f'Stack {stack.name} has not changed since its last deployment, skipping deploy')
+                        shutil.rmtree(outdir, ignore_errors=True)
+                        stack.stackid = meta['StackId']
+                        stack.status = meta['StackStatus']
+                        update_stack_output(session, stack)
+                        return
+                if template_hash:
+                    # deploys the synthesized cloud assembly instead of synthesizing the app again
+                    cdk_app = outdir
+                else:
+                    shutil.rmtree(outdir, ignore_errors=True)
+
             cmd = [
                 '. ~/.nvm/nvm.sh &&',
                 'cdk',
@@ -158,7 +192,7 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                 "data='{}'",
                 # skips synth step when no changes apply
                 '--app',
-                f'"{sys.executable} {app_path}"',
+                f'"{cdk_app}"',
                 '--verbose',
             ]
             logger.info(f'Running command : \n {" ".join(cmd)}')
@@ -182,10 +216,14 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                     f'There is no CDK deployment extension for {stack.stack}. Proceeding further with the post-deployment'
                 )
 
+            if template_hash:
+                shutil.rmtree(cdk_app, ignore_errors=True)
+
             if process.returncode == 0:
                 meta = describe_stack(stack)
                 stack.stackid = meta['StackId']
                 stack.status = meta['StackStatus']
+                stack.templateHash = template_hash
                 update_stack_output(session, stack)
             else:
                 stack.status = 'CREATE_FAILED'
@@ -198,6 +236,68 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
             raise e
 
 
+def synth_cdk_app(stack: Stack, app_path: str, cwd: str, env: dict, outdir: str):
+    """
+    Synthesizes the stack app into outdir without the cdk cli, passing the context like the cdk cli does,
+    and returns the fingerprint of its templates and assets, None if the synthesis failed
+    """
+    context = {}
+    for context_file, key in [('cdk.json', 'context'), ('cdk.context.json', None)]:
+        context_path = os.path.join(cwd, context_file)
+        if os.path.exists(context_path):
+            with open(context_path) as f:
+                content = json.load(f)
+            context.update(content.get(key, {}) if key else content)
+    context.update(CDK_CLI_CONTEXT)
+    context.update(
+        {
+            'appid': stack.name,
+            'account': stack.accountid,
+            'region': stack.region,
+            'stack': stack.stack,
+            'target_uri': stack.targetUri,
+            'data': '{}',
+        }
+    )
+    # aws-cdk-lib runs on jsii, which starts node: it is put on the PATH by nvm like for the cdk deploy command
+    cmd = ['. ~/.nvm/nvm.sh &&', sys.executable, app_path]
+    synth_env = {
+        **env,
+        'HOME': os.path.expanduser('~'),
+        'PATH': os.environ.get('PATH', os.defpath),
+        'CDK_CONTEXT_JSON': json.dumps(context),
+        'CDK_OUTDIR': outdir,
+    }
+    process = subprocess.run(  # nosemgrep
+        ' '.join(cmd),  # nosemgrep
+        text=True,  # nosemgrep
+        shell=True,  # nosec  # nosemgrep
+        encoding='utf-8',  # nosemgrep
+        env=synth_env,  # nosemgrep
+        cwd=cwd,  # nosemgrep
+    )
+    if process.returncode != 0:
+        logger.warning(f'Failed to synthesize stack {stack.name}, deploying it with the cdk cli')
+        return None
+    with open(os.path.join(outdir, 'manifest.json')) as f:
+        if json.load(f).get('missing'):
+            # context lookups are done by the cdk cli
+            logger.info(f'Stack {stack.name} needs context lookups, deploying it with the cdk cli')
+            return None
+    return cloud_assembly_hash(outdir)
+
+
+def cloud_assembly_hash(outdir: str) -> str:
+    """Fingerprint of the CloudFormation templates and the asset manifests of a cloud assembly"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(outdir)):
+        if name.endswith('.template.json') or name.endswith('.assets.json'):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(outdir, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
 def describe_stack(stack, engine: Engine = None, stackid: str = None):
     if not stack:
         with engine.scoped_session() as session:
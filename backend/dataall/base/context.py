@@ -7,8 +7,8 @@ The class uses Flask's approach to handle request: ThreadLocal
 That approach should work fine for AWS Lambdas and local server that uses FastApi app
 """
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 
 from dataall.base.db.connection import Engine
 from threading import local
@@ -25,6 +25,8 @@ class RequestContext:
     username: str
     groups: List[str]
     user_id: str
+    # values memoized for the duration of the request (e.g. permission decisions), dropped with the context
+    cache: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
 
 
 def get_context() -> RequestContext:
@@ -37,6 +39,14 @@ def set_context(context: RequestContext) -> None:
     _request_storage.context = context
 
 
+def get_request_cache(name: str) -> Dict:
+    """Returns the named cache of the current request or None when there is no request in progress (e.g. ECS tasks)"""
+    context = getattr(_request_storage, 'context', None)
+    if context is None:
+        return None
+    return context.cache.setdefault(name, {})
+
+
 def dispose_context() -> None:
     """Dispose context after the request completion"""
     _request_storage.context = None
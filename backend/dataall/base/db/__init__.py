@@ -2,6 +2,7 @@ from .base import Base, Resource
 from . import exceptions
 from .connection import (
     Engine,
+    PoolConfig,
     get_engine,
     create_schema_if_not_exists,
     create_schema_and_tables,
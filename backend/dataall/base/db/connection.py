@@ -1,15 +1,21 @@
 import json
 import logging
 import os
+import threading
 from contextlib import contextmanager
+from types import SimpleNamespace
+from dataclasses import dataclass, fields, replace
+from typing import Optional, Set
 
 import sqlalchemy
 from sqlalchemy.engine import reflection
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
 from dataall.base.aws.secrets_manager import SecretsManager
 from dataall.base.db import Base
 from dataall.base.db.dbconfig import DbConfig
+from dataall.base.loader import ImportMode, list_active_modes
 from dataall.base.utils import Parameter
 
 try:
@@ -21,14 +27,99 @@ log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
 
 
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Connection pooling of an Engine.
+    mode 'queue' keeps up to pool_size + max_overflow connections open in the process,
+    mode 'null' opens a connection per session, for when the pooling is done by RDS Proxy or PgBouncer.
+    session_scope 'thread' gives each thread its own session, 'process' shares one session between all threads.
+    Every setting can be overridden with the DB_POOL_<SETTING> environment variables, e.g. DB_POOL_MODE=null
+    """
+
+    mode: str = 'queue'
+    pool_size: int = 1
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    # seconds after which connections are reopened, before the server or a proxy drops them
+    pool_recycle: int = 3600
+    pool_pre_ping: bool = True
+    session_scope: str = 'thread'
+
+    @staticmethod
+    def for_import_modes(modes: Optional[Set[ImportMode]] = None) -> 'PoolConfig':
+        """
+        Default pooling of the workload: the largest of the defaults of its modes, overridden by the environment
+        :param modes: the modes of the workload, the modes loaded so far if None
+        """
+        if modes is None:
+            modes = list_active_modes()
+        defaults = max(
+            (_POOL_DEFAULTS[mode] for mode in modes if mode in _POOL_DEFAULTS),
+            key=lambda d: d['pool_size'] + d['max_overflow'],
+            default={},
+        )
+        return PoolConfig(**defaults).with_env_overrides()
+
+    def with_env_overrides(self) -> 'PoolConfig':
+        overrides = {}
+        for field in fields(self):
+            value = os.getenv(f'DB_POOL_{field.name.upper()}')
+            if value is None:
+                continue
+            if field.type in (bool, 'bool'):
+                overrides[field.name] = value.lower() == 'true'
+            elif field.type in (int, 'int'):
+                overrides[field.name] = int(value)
+            else:
+                overrides[field.name] = value
+        return replace(self, **overrides)
+
+    def engine_kwargs(self) -> dict:
+        if self.mode == 'null':
+            return {'poolclass': NullPool, 'pool_pre_ping': self.pool_pre_ping}
+        if self.mode != 'queue':
+            raise ValueError(f'Unknown DB pool mode {self.mode}')
+        return {
+            'poolclass': QueuePool,
+            'pool_size': self.pool_size,
+            'max_overflow': self.max_overflow,
+            'pool_timeout': self.pool_timeout,
+            'pool_recycle': self.pool_recycle,
+            'pool_pre_ping': self.pool_pre_ping,
+        }
+
+
+# handler threads of the worker Lambda, see dataall.core.tasks.service_handlers
+WORKER_MAX_THREADS = int(os.getenv('WORKER_MAX_THREADS', '8'))
+
+# Lambdas serve one request at a time, ECS tasks may run workers in threads.
+# The worker Lambda needs a connection per handler thread, plus the main thread and the resource locks heartbeat.
+_POOL_DEFAULTS = {
+    ImportMode.API: {'pool_size': 1, 'max_overflow': 2},
+    ImportMode.HANDLERS: {'pool_size': 2, 'max_overflow': WORKER_MAX_THREADS},
+    ImportMode.CDK: {'pool_size': 1, 'max_overflow': 2},
+    ImportMode.STACK_UPDATER_TASK: {'pool_size': 4, 'max_overflow': 4},
+    ImportMode.CATALOG_INDEXER_TASK: {'pool_size': 2, 'max_overflow': 2},
+    ImportMode.SHARES_TASK: {'pool_size': 8, 'max_overflow': 8},
+}
+
+
 class Engine:
-    def __init__(self, dbconfig: DbConfig):
+    """
+    SQLAlchemy engine and sessions. Each thread gets its own session from scoped_session unless
+    the session scope of the pool config is 'process', nested scoped_session calls share the session
+    of the outermost one.
+    """
+
+    def __init__(self, dbconfig: DbConfig, pool_config: PoolConfig = None):
         self.dbconfig = dbconfig
+        self.pool_config = pool_config or PoolConfig.for_import_modes()
         self.engine = sqlalchemy.create_engine(
             dbconfig.url,
             echo=False,
-            pool_size=1,
             connect_args={'options': f'-c search_path={dbconfig.schema}'},
+            **self.pool_config.engine_kwargs(),
         )
         try:
             create_schema_if_not_exists(self.engine, dbconfig.schema)
@@ -36,31 +127,46 @@ class Engine:
         except Exception as e:
             log.exception('Could not create schema')
 
-        self.sessions = {}
-        self._session = None
-        self._active_sessions = 0
+        if self.pool_config.session_scope not in ('thread', 'process'):
+            raise ValueError(f'Unknown DB session scope {self.pool_config.session_scope}')
+        self._session_factory = sessionmaker(bind=self.engine, autoflush=True, expire_on_commit=False)
+        self._local = threading.local() if self.pool_config.session_scope == 'thread' else SimpleNamespace()
 
     def session(self):
-        if self._session is None:
-            self._session = sessionmaker(bind=self.engine, autoflush=True, expire_on_commit=False)()
+        if getattr(self._local, 'session', None) is None:
+            self._local.session = self._session_factory()
+            self._local.active_sessions = 0
 
-        return self._session
+        return self._local.session
 
     @contextmanager
     def scoped_session(self):
         s = self.session()
         try:
-            self._active_sessions += 1
+            self._local.active_sessions += 1
             yield s
             s.commit()
         except Exception as e:
             s.rollback()
             raise e
         finally:
-            self._active_sessions -= 1
-            if self._active_sessions == 0:
+            self._local.active_sessions -= 1
+            if self._local.active_sessions == 0:
                 s.close()
-                self._session = None
+                self._local.session = None
+
+    def pool_status(self) -> dict:
+        """Statistics of the connection pool of the process"""
+        pool = self.engine.pool
+        status = {'mode': self.pool_config.mode}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return status
 
     def dispose(self):
         self.engine.dispose()
@@ -103,7 +209,7 @@ def drop_schema_if_exists(engine, envname):
         raise e
 
 
-def get_engine(envname=ENVNAME):
+def get_engine(envname=ENVNAME, pool_config: PoolConfig = None):
     if envname not in ['local', 'pytest', 'dkrcompose']:
         param_store = Parameter()
         credential_arn = param_store.get_parameter(env=envname, path='aurora/dbcreds')
@@ -128,7 +234,7 @@ def get_engine(envname=ENVNAME):
             'pwd': 'docker',
             'schema': envname,
         }
-    return Engine(DbConfig(**db_params))
+    return Engine(DbConfig(**db_params), pool_config=pool_config)
 
 
 def has_table(table_name, engine):
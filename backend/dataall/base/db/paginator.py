@@ -1,10 +1,30 @@
+import base64
+import json
 import math
+from datetime import date, datetime
+from enum import Enum
 
-__version__ = '0.0.2'
+from sqlalchemy import and_, distinct, func, inspect, or_, select
+from sqlalchemy.sql import operators
+
+__version__ = '0.0.3'
+
+
+class CountMode(Enum):
+    """How paginate computes the total number of rows of a query
+
+    EXACT: SELECT COUNT(DISTINCT pk) over the filtered query
+    ESTIMATE: row estimate of the PostgreSQL planner, never lower than the rows seen so far
+    NONE: no count query, total is the number of rows seen so far (plus one if there is a next page)
+    """
+
+    EXACT = 'exact'
+    ESTIMATE = 'estimate'
+    NONE = 'none'
 
 
 class Page(object):
-    def __init__(self, items, page, page_size, total):
+    def __init__(self, items, page, page_size, total, has_next=None):
         self.page_size = page_size
         self.page = page
         self.items = items
@@ -14,7 +34,7 @@ class Page(object):
         if self.has_previous:
             self.previous_page = page - 1
         previous_items = (page - 1) * page_size
-        self.has_next = previous_items + len(items) < total
+        self.has_next = previous_items + len(items) < total if has_next is None else has_next
         if self.has_next:
             self.next_page = page + 1
         self.total = total
@@ -34,16 +54,46 @@ class Page(object):
         }
 
 
-def paginate(query, page, page_size):
+class KeysetPage(object):
+    def __init__(self, items, page_size, has_next, has_previous, next_cursor):
+        self.items = items
+        self.page_size = page_size
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+
+    def to_dict(self):
+        return {
+            'count': None,
+            'pages': None,
+            'page': None,
+            'pageSize': self.page_size,
+            'nodes': self.items,
+            'hasNext': self.has_next,
+            'hasPrevious': self.has_previous,
+            'nextPage': None,
+            'previousPage': None,
+            'nextCursor': self.next_cursor,
+        }
+
+
+def paginate(query, page, page_size, count_mode=CountMode.EXACT):
     if page <= 0:
         raise AttributeError('page needs to be >= 1')
     if page_size <= 0:
         raise AttributeError('page_size needs to be >= 1')
-    items = query.limit(page_size).offset((page - 1) * page_size).all()
-    # count doesn't de-duplicate the rows as described here https://tinyurl.com/3f7d8d5a
-    # nosemgrep: python.sqlalchemy.performance.performance-improvements.len-all-count
-    total = len(query.order_by(None).all())
-    return Page(items, page, page_size, total)
+    offset = (page - 1) * page_size
+    if count_mode == CountMode.EXACT:
+        items = query.limit(page_size).offset(offset).all()
+        return Page(items, page, page_size, count(query))
+
+    # fetch one extra row to know if there is a next page without counting
+    items = query.limit(page_size + 1).offset(offset).all()
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    seen = offset + len(items) + (1 if has_next else 0)
+    total = max(estimate_count(query), seen) if count_mode == CountMode.ESTIMATE else seen
+    return Page(items, page, page_size, total, has_next=has_next)
 
 
 def paginate_list(items, page, page_size):
@@ -55,3 +105,119 @@ def paginate_list(items, page, page_size):
     end = start + page_size
     total = len(items)
     return Page(items[start:end], page, page_size, total)
+
+
+def count(query) -> int:
+    """
+    Counts the rows that query.all() returns without loading them.
+    Query.all() de-duplicates rows when the query selects ORM entities (https://tinyurl.com/3f7d8d5a),
+    so entities are counted by DISTINCT primary key instead of Query.count() that counts the joined rows.
+    """
+    query = query.order_by(None)
+    if not any(_is_entity(description['expr']) for description in query.column_descriptions):
+        return query.count()
+
+    rows = query.subquery()
+    keys = _distinct_keys(query, rows)
+    if keys is None:
+        keys = list(rows.c)
+    if len(keys) == 1:
+        statement = select(func.count(distinct(keys[0])))
+    else:
+        statement = select(func.count()).select_from(select(*keys).distinct().subquery())
+    return query.session.execute(statement).scalar()
+
+
+def estimate_count(query) -> int:
+    """Returns the number of rows of the query as estimated by the PostgreSQL planner, without executing it"""
+    session = query.session
+    compiled = query.order_by(None).statement.compile(
+        dialect=session.bind.dialect, compile_kwargs={'render_postcompile': True}
+    )
+    plan = session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def paginate_keyset(query, order_by, page_size, cursor=None):
+    """
+    Cursor (keyset) pagination: instead of OFFSET, the next page starts right after the last row of the
+    previous page, so every page costs the same whatever its position and no count query is issued.
+    :param query: the query to paginate, without ORDER BY
+    :param order_by: list of columns (or column.desc()) that identify a row uniquely, e.g. (label, uri)
+    :param page_size: number of rows per page
+    :param cursor: the nextCursor returned with the previous page, None for the first page
+    """
+    if page_size <= 0:
+        raise AttributeError('page_size needs to be >= 1')
+    keys = [_parse_order_by(clause) for clause in order_by]
+    query = query.order_by(None).order_by(*order_by)
+    if cursor:
+        query = query.filter(_after(keys, _decode_cursor(cursor, keys)))
+
+    items = query.limit(page_size + 1).all()
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = _encode_cursor([getattr(items[-1], column.key) for column, _ in keys]) if has_next else None
+    return KeysetPage(items, page_size, has_next=has_next, has_previous=bool(cursor), next_cursor=next_cursor)
+
+
+def _is_entity(expr) -> bool:
+    info = inspect(expr, raiseerr=False)
+    return info is not None and (getattr(info, 'is_mapper', False) or getattr(info, 'is_aliased_class', False))
+
+
+def _distinct_keys(query, rows):
+    """Columns of the subquery rows that identify a de-duplicated row: primary keys of entities and plain columns"""
+    keys = []
+    for description in query.column_descriptions:
+        expr = description['expr']
+        if _is_entity(expr):
+            info = inspect(expr)
+            columns = [info.selectable.corresponding_column(pk) for pk in info.mapper.primary_key]
+        else:
+            columns = [expr]
+        for column in columns:
+            key = rows.corresponding_column(column) if column is not None else None
+            if key is None:
+                return None
+            keys.append(key)
+    return keys
+
+
+def _parse_order_by(clause):
+    if getattr(clause, 'modifier', None) is operators.desc_op:
+        return clause.element, True
+    if getattr(clause, 'modifier', None) is operators.asc_op:
+        return clause.element, False
+    return clause, False
+
+
+def _after(keys, values):
+    conditions = []
+    for i, (column, descending) in enumerate(keys):
+        equal_before = [previous == value for (previous, _), value in zip(keys[:i], values[:i])]
+        conditions.append(and_(*equal_before, column < values[i] if descending else column > values[i]))
+    return or_(*conditions)
+
+
+def _encode_cursor(values) -> str:
+    serializable = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(serializable).encode()).decode()
+
+
+def _decode_cursor(cursor, keys):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise AttributeError('cursor is not valid')
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise AttributeError('cursor is not valid')
+    decoded = []
+    for (column, _), value in zip(keys, values):
+        python_type = column.type.python_type
+        if value is not None and python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        decoded.append(value)
+    return decoded
@@ -95,6 +95,10 @@ def list_loaded_modules() -> List[str]:
     return list(_LOADED_MODULES)
 
 
+def list_active_modes() -> Set[ImportMode]:
+    return set(_ACTIVE_MODES)
+
+
 def _new_modules(modes: Set[ImportMode]):
     """
     Extracts only new modules to load. It's needed to avoid multiply loading
@@ -2,8 +2,11 @@ import datetime
 import json
 import os
 import logging
+import threading
+import time
 
-from graphql import parse, utilities, OperationType, GraphQLSyntaxError
+from graphql import utilities, OperationType, GraphQLSyntaxError
+from dataall.base.api.document_cache import document_cache
 from dataall.base.aws.parameter_store import ParameterStoreManager
 from dataall.base.db import get_engine
 from dataall.base.services.service_provider_factory import ServiceProviderFactory
@@ -18,6 +21,9 @@ log = logging.getLogger(__name__)
 
 ENVNAME = os.getenv('envname', 'local')
 REAUTH_TTL = int(os.environ.get('REAUTH_TTL', '5'))
+# seconds the preflight state is reused by a warm container
+REAUTH_APIS_TTL = int(os.environ.get('REAUTH_APIS_TTL', '300'))
+MAINTENANCE_STATE_TTL = int(os.environ.get('MAINTENANCE_STATE_TTL', '10'))
 # ALLOWED OPERATIONS WHEN A USER IS NOT DATAALL ADMIN AND NO-ACCESS MODE IS SELECTED
 MAINTENANCE_ALLOWED_OPERATIONS_WHEN_NO_ACCESS = [
     item.casefold() for item in ['getGroupsForUser', 'getMaintenanceWindowStatus']
@@ -27,6 +33,37 @@ ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*')
 AWS_REGION = os.getenv('AWS_REGION')
 
 
+class _PreflightCache:
+    """Container-wide cache of the state read by the checks run before each GraphQL request.
+
+    Entries expire after their TTL or when the version they were loaded with changes.
+    Groups known to have a tenant policy are kept for the lifetime of the container.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.groups_with_tenant_policy = set()
+
+    def get(self, key, loader, ttl, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic() and entry[2] == version:
+                return entry[0]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl, version)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.groups_with_tenant_policy.clear()
+
+
+_preflight_cache = _PreflightCache()
+
+
 def redact_creds(event):
     if event.get('headers', {}).get('Authorization'):
         event['headers']['Authorization'] = 'XXXXXXXXXXXX'
@@ -97,31 +134,48 @@ def extract_groups(user_id, claims):
         return groups
 
 
+def run_preflight_checks(query, groups, auth_time, username):
+    """
+    Runs the checks required before executing a GraphQL request: attaches the tenant policy to new groups,
+    blocks the request during maintenance windows and when the operation requires a recent authentication.
+    @return: error response if the request must not be executed else None
+    """
+    attach_tenant_policy_for_groups(groups=groups)
+    maintenance_window_validation_response = validate_and_block_if_maintenance_window(query=query, groups=groups)
+    if maintenance_window_validation_response is not None:
+        return maintenance_window_validation_response
+    return check_reauth(query=query, auth_time=auth_time, username=username)
+
+
 def attach_tenant_policy_for_groups(groups=None):
-    if groups is None:
-        groups = []
+    unknown_groups = [group for group in groups or [] if group not in _preflight_cache.groups_with_tenant_policy]
+    if not unknown_groups:
+        return
     with ENGINE.scoped_session() as session:
-        for group in groups:
-            policy = TenantPolicyService.find_tenant_policy(session, group, TenantPolicyService.TENANT_NAME)
-            if not policy:
-                log.info(f'No policy found for Team {group}. Attaching TENANT_ALL permissions')
-                TenantPolicyService.attach_group_tenant_policy(
-                    session=session,
-                    group=group,
-                    permissions=TENANT_ALL,
-                    tenant_name=TenantPolicyService.TENANT_NAME,
-                )
+        attached = TenantPolicyService.attach_groups_tenant_policy(
+            session=session,
+            groups=unknown_groups,
+            permissions=TENANT_ALL,
+            tenant_name=TenantPolicyService.TENANT_NAME,
+        )
+    if attached:
+        log.info(f'No policy found for Teams {attached}. Attached TENANT_ALL permissions')
+    _preflight_cache.groups_with_tenant_policy.update(unknown_groups)
 
 
-def check_reauth(query, auth_time, username):
-    # Determine if there are any Operations that Require ReAuth From SSM Parameter
+def _load_reauth_apis():
     try:
-        reauth_apis = ParameterStoreManager.get_parameter_value(
+        return ParameterStoreManager.get_parameter_value(
             region=AWS_REGION, parameter_path=f'/dataall/{ENVNAME}/reauth/apis'
         ).split(',')
     except Exception:
         log.info('No ReAuth APIs Found in SSM')
-        reauth_apis = None
+        return None
+
+
+def check_reauth(query, auth_time, username):
+    # Determine if there are any Operations that Require ReAuth From SSM Parameter
+    reauth_apis = _preflight_cache.get('reauth_apis', _load_reauth_apis, REAUTH_APIS_TTL)
 
     # If The Operation is a ReAuth Operation - Ensure A Non-Expired Session or Return Error
     if reauth_apis and query.get('operationName', None) in reauth_apis:
@@ -153,14 +207,16 @@ def validate_and_block_if_maintenance_window(query, groups, blocked_for_mode_enu
     @return: error response if maintenance window is blocking gql calls else None
     """
     if config.get_property('modules.maintenance.active'):
-        maintenance_mode = MaintenanceService._get_maintenance_window_mode(engine=ENGINE)
-        maintenance_status = MaintenanceService.get_maintenance_window_status().status
-        isAdmin = TenantPolicyValidationService.is_tenant_admin(groups)
+        # admins are never blocked, no need to read the state of the maintenance window
+        if TenantPolicyValidationService.is_tenant_admin(groups):
+            return None
+        maintenance_mode, maintenance_status = _preflight_cache.get(
+            'maintenance', _load_maintenance_state, MAINTENANCE_STATE_TTL, version=MaintenanceService.state_version
+        )
 
         if (
             (maintenance_mode == MaintenanceModes.NOACCESS.value)
-            and (maintenance_status is not MaintenanceStatus.INACTIVE.value)
-            and not isAdmin
+            and (maintenance_status != MaintenanceStatus.INACTIVE.value)
             and (blocked_for_mode_enum is None or blocked_for_mode_enum == MaintenanceModes.NOACCESS)
         ):
             if query.get('operationName', '').casefold() not in MAINTENANCE_ALLOWED_OPERATIONS_WHEN_NO_ACCESS:
@@ -170,13 +226,12 @@ def validate_and_block_if_maintenance_window(query, groups, blocked_for_mode_enu
                 )
         elif (
             (maintenance_mode == MaintenanceModes.READONLY.value)
-            and (maintenance_status is not MaintenanceStatus.INACTIVE.value)
-            and not isAdmin
+            and (maintenance_status != MaintenanceStatus.INACTIVE.value)
             and (blocked_for_mode_enum is None or blocked_for_mode_enum == MaintenanceModes.READONLY)
         ):
             # If its mutation then block and return
             try:
-                parsed_query_document = parse(query.get('query', ''))
+                parsed_query_document = document_cache.parse(query.get('query', ''))
                 graphQL_operation_type = utilities.get_operation_ast(parsed_query_document)
                 if graphQL_operation_type.operation == OperationType.MUTATION:
                     return send_unauthorized_response(
@@ -188,3 +243,9 @@ def validate_and_block_if_maintenance_window(query, groups, blocked_for_mode_enu
                     f'Error occured while parsing query when validating for {maintenance_mode} maintenance mode due to - {e}'
                 )
                 raise e
+
+
+def _load_maintenance_state():
+    maintenance_mode = MaintenanceService._get_maintenance_window_mode(engine=ENGINE)
+    maintenance_status = MaintenanceService.get_maintenance_window_status().status
+    return maintenance_mode, maintenance_status
@@ -48,6 +48,10 @@ class EnvironmentRepository:
             raise exceptions.ObjectNotFound(Environment.__name__, uri)
         return environment
 
+    @staticmethod
+    def find_environments_by_uris(session, uris: List[str]) -> List[Environment]:
+        return session.query(Environment).filter(Environment.environmentUri.in_(uris)).all()
+
     @staticmethod
     def count_environments_with_organization_uri(session, uri):
         return session.query(Environment).filter(Environment.organizationUri == uri).count()
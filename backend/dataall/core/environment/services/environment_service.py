@@ -11,6 +11,7 @@ from dataall.base.aws.parameter_store import ParameterStoreManager
 from dataall.base.aws.s3_client import S3_client
 from dataall.base.utils import Parameter
 from dataall.base.aws.sts import SessionHelper
+from dataall.base.api.dataloader import DataLoader, get_dataloader
 from dataall.base.context import get_context
 from dataall.base.db.exceptions import AWSResourceNotFound
 from dataall.base.utils.consumption_principal_utils import EnvironmentIAMPrincipalType
@@ -908,8 +909,19 @@ class EnvironmentService:
 
     @staticmethod
     def find_environment_by_uri_simplified(uri):
-        with get_context().db_engine.scoped_session() as session:
-            return EnvironmentService.get_environment_by_uri(session, uri)
+        if not uri:
+            raise exceptions.RequiredParameter('environmentUri')
+        environment = EnvironmentService.environment_loader().load(uri)
+        if not environment:
+            raise exceptions.ObjectNotFound(Environment.__name__, uri)
+        return environment
+
+    @staticmethod
+    def environment_loader() -> DataLoader:
+        """Batches the environment lookups of the field resolvers of the current request"""
+        return get_dataloader(
+            'environment', EnvironmentRepository.find_environments_by_uris, key=lambda env: env.environmentUri
+        )
 
     @staticmethod
     def list_all_active_environments(session) -> List[Environment]:
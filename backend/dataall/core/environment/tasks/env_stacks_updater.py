@@ -9,7 +9,7 @@ from dataall.core.environment.services.environment_service import EnvironmentSer
 from dataall.core.environment.tasks.env_stack_finder import StackFinder
 from dataall.core.stacks.aws.ecs import Ecs
 from dataall.core.stacks.db.stack_repositories import StackRepository
-from dataall.base.db import get_engine
+from dataall.base.db import PoolConfig, get_engine
 from dataall.base.utils import Parameter
 
 log = logging.getLogger(__name__)
@@ -17,9 +17,16 @@ log = logging.getLogger(__name__)
 
 RETRIES = 30
 SLEEP_TIME = 30
+# number of environment stacks updated at the same time
+MAX_IN_FLIGHT = 10
 
 
-def update_stacks(engine, envname):
+def update_stacks(engine, envname, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Updates the stacks of all the environments, up to max_in_flight cdkproxy tasks at a time,
+    and then triggers the update of the stacks found by the StackFinders (datasets, pipelines...)
+    that depend on the environment stacks
+    """
     with engine.scoped_session() as session:
         all_environments: [Environment] = EnvironmentService.list_all_active_environments(session)
         additional_stacks = []
@@ -27,42 +34,72 @@ def update_stacks(engine, envname):
             additional_stacks.extend(finder.find_stack_uris(session))
 
         log.info(f'Found {len(all_environments)} environments, triggering update stack tasks...')
-        environment: Environment
-        for environment in all_environments:
-            update_stack(session=session, envname=envname, target_uri=environment.environmentUri, wait=True)
+        cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
+        update_stacks_and_wait(
+            session,
+            envname,
+            [environment.environmentUri for environment in all_environments],
+            cluster_name=cluster_name,
+            max_in_flight=max_in_flight,
+        )
 
         for stack_uri in additional_stacks:
-            update_stack(session=session, envname=envname, target_uri=stack_uri, wait=False)
+            update_stack(session=session, envname=envname, target_uri=stack_uri, cluster_name=cluster_name)
 
         return len(all_environments), len(additional_stacks)
 
 
-def update_stack(session, envname, target_uri, wait=False):
+def update_stacks_and_wait(session, envname, target_uris, cluster_name, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Runs the update of the stacks of target_uris with up to max_in_flight cdkproxy tasks at a time.
+    The in-flight tasks are polled together every SLEEP_TIME seconds, a task is not waited for
+    after RETRIES polls.
+    """
+    pending = list(target_uris)
+    # task ARN -> (target uri, number of polls)
+    in_flight = {}
+    while pending or in_flight:
+        while pending and len(in_flight) < max_in_flight:
+            target_uri = pending.pop(0)
+            task_arn = update_stack(session=session, envname=envname, target_uri=target_uri, cluster_name=cluster_name)
+            if task_arn:
+                in_flight[task_arn] = (target_uri, 0)
+        if not in_flight:
+            continue
+
+        time.sleep(SLEEP_TIME)
+        running = Ecs.get_running_tasks(cluster_name=cluster_name, task_arns=list(in_flight))
+        for task_arn, (target_uri, polls) in list(in_flight.items()):
+            if task_arn not in running:
+                log.info(f'Update for {target_uri} COMPLETE')
+                del in_flight[task_arn]
+            elif polls + 1 >= RETRIES:
+                log.info(f'Maximum number of retries exceeded ({RETRIES} retries) for {target_uri}, continuing task...')
+                del in_flight[task_arn]
+            else:
+                in_flight[task_arn] = (target_uri, polls + 1)
+        log.info(f'{len(in_flight)} stack updates in progress, {len(pending)} pending')
+
+
+def update_stack(session, envname, target_uri, cluster_name=None):
+    """
+    Starts the cdkproxy task updating the stack of target_uri unless one is already running
+    :return: the ARN of the started task, None if no task was started
+    """
     stack = StackRepository.get_stack_by_target_uri(session, target_uri=target_uri)
-    cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
+    if cluster_name is None:
+        cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
     if not Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
         stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack_uri=stack.stackUri)
-        if wait:
-            retries = 1
-            while Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
-                log.info(
-                    f'Update for {stack.name}//{stack.stackUri} is not complete, waiting for {SLEEP_TIME} seconds...'
-                )
-                time.sleep(SLEEP_TIME)
-                retries = retries + 1
-                if retries > RETRIES:
-                    log.info(f'Maximum number of retries exceeded ({RETRIES} retries), continuing task...')
-                    break
-            log.info(
-                f'Update for {stack.name}//{stack.stackUri} COMPLETE or maximum number of retries exceeded ({RETRIES} retries)'
-            )
+        return stack.EcsTaskArn
     else:
         log.info(f'Stack update is already running... Skipping stack {stack.name}//{stack.stackUri}')
+        return None
 
 
 if __name__ == '__main__':
     envname = os.environ.get('envname', 'local')
-    engine = get_engine(envname=envname)
-
     load_modules({ImportMode.STACK_UPDATER_TASK})
-    update_stacks(engine=engine, envname=envname)
+
+    engine = get_engine(envname=envname, pool_config=PoolConfig.for_import_modes({ImportMode.STACK_UPDATER_TASK}))
+    update_stacks(engine=engine, envname=envname, max_in_flight=int(os.environ.get('max_in_flight', MAX_IN_FLIGHT)))
@@ -28,6 +28,10 @@ class OrganizationRepository:
     def find_organization_by_uri(session, uri) -> models.Organization:
         return session.query(models.Organization).get(uri)
 
+    @staticmethod
+    def find_organizations_by_uris(session, uris: List[str]) -> List[models.Organization]:
+        return session.query(models.Organization).filter(models.Organization.organizationUri.in_(uris)).all()
+
     @staticmethod
     def query_user_organizations(session, username, groups, filter) -> Query:
         query = (
@@ -1,3 +1,4 @@
+from dataall.base.api.dataloader import DataLoader, get_dataloader
 from dataall.base.context import get_context
 from dataall.base.db import exceptions
 from dataall.core.activity.db.activity_models import Activity
@@ -107,9 +108,19 @@ class OrganizationService:
 
     @staticmethod
     def get_organization_simplified(uri):
-        context = get_context()
-        with context.db_engine.scoped_session() as session:
-            return OrganizationRepository.get_organization_by_uri(session=session, uri=uri)
+        if not uri:
+            raise exceptions.RequiredParameter(param_name='organizationUri')
+        org = OrganizationService.organization_loader().load(uri)
+        if not org:
+            raise exceptions.ObjectNotFound('Organization', uri)
+        return org
+
+    @staticmethod
+    def organization_loader() -> DataLoader:
+        """Batches the organization lookups of the field resolvers of the current request"""
+        return get_dataloader(
+            'organization', OrganizationRepository.find_organizations_by_uris, key=lambda org: org.organizationUri
+        )
 
     @staticmethod
     def list_organizations(filter):
@@ -20,6 +20,17 @@ class PermissionRepository:
             )
             return permission
 
+    @staticmethod
+    def find_permissions_by_names(session, permission_names: [str], permission_type: str) -> [Permission]:
+        return (
+            session.query(Permission)
+            .filter(
+                Permission.name.in_(permission_names),
+                Permission.type == permission_type,
+            )
+            .all()
+        )
+
     @staticmethod
     def count_resource_permissions(session):
         return session.query(Permission).filter(Permission.type == PermissionType.RESOURCE.name).count()
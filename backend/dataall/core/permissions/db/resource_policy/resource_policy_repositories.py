@@ -1,6 +1,7 @@
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.sql import and_
 
 from dataall.core.permissions.db.permission.permission_models import Permission
@@ -40,6 +41,30 @@ class ResourcePolicyRepository:
         else:
             return policy
 
+    @staticmethod
+    def list_groups_permissions_on_resources(session, groups: [str], resource_uris: [str]) -> List[Tuple[str, str]]:
+        """Returns the (resourceUri, permission name) pairs granted to any of the groups on any of the resources"""
+        return (
+            session.query(ResourcePolicy.resourceUri, Permission.name)
+            .join(
+                ResourcePolicyPermission,
+                ResourcePolicy.sid == ResourcePolicyPermission.sid,
+            )
+            .join(
+                Permission,
+                Permission.permissionUri == ResourcePolicyPermission.permissionUri,
+            )
+            .filter(
+                and_(
+                    ResourcePolicy.principalId.in_(groups),
+                    ResourcePolicy.principalType == 'GROUP',
+                    ResourcePolicy.resourceUri.in_(resource_uris),
+                )
+            )
+            .distinct()
+            .all()
+        )
+
     @staticmethod
     def has_group_resource_permission(
         session, group_uri: str, resource_uri: str, permission_name: str
@@ -70,6 +95,42 @@ class ResourcePolicyRepository:
         else:
             return policy
 
+    @staticmethod
+    def find_groups_resource_policies(session, groups: List[str], resource_uris: List[str]) -> List[ResourcePolicy]:
+        return (
+            session.query(ResourcePolicy)
+            .filter(
+                and_(
+                    ResourcePolicy.principalId.in_(groups),
+                    ResourcePolicy.resourceUri.in_(resource_uris),
+                )
+            )
+            .all()
+        )
+
+    @staticmethod
+    def list_policies_permissions(session, sids: List[str]) -> List[Tuple[str, str]]:
+        """Returns the (sid, permissionUri) of the permissions of the resource policies"""
+        return (
+            session.query(ResourcePolicyPermission.sid, ResourcePolicyPermission.permissionUri)
+            .filter(ResourcePolicyPermission.sid.in_(sids))
+            .all()
+        )
+
+    @staticmethod
+    def save_resource_policies(session, policies: List[dict]) -> List[Tuple[str, str, str]]:
+        """Inserts the resource policies in a single statement and returns their (principalId, resourceUri, sid)"""
+        return session.execute(
+            insert(ResourcePolicy).returning(
+                ResourcePolicy.principalId, ResourcePolicy.resourceUri, ResourcePolicy.sid
+            ),
+            policies,
+        ).all()
+
+    @staticmethod
+    def save_resource_policies_permissions(session, policy_permissions: List[dict]):
+        session.execute(insert(ResourcePolicyPermission), policy_permissions)
+
     @staticmethod
     def query_all_resource_policies(
         session, group_uri: str, resource_uri: str, resource_type: str = None, permissions: List[str] = None
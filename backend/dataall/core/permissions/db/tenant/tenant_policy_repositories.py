@@ -83,6 +83,22 @@ class TenantPolicyRepository:
         )
         return tenant_policy
 
+    @staticmethod
+    def list_groups_with_tenant_policy(session, groups: [str], tenant_name: str) -> set:
+        """Returns the subset of the groups that have a policy on the tenant"""
+        rows = (
+            session.query(TenantPolicy.principalId)
+            .join(Tenant, Tenant.tenantUri == TenantPolicy.tenantUri)
+            .filter(
+                and_(
+                    TenantPolicy.principalId.in_(groups),
+                    Tenant.name == tenant_name,
+                )
+            )
+            .all()
+        )
+        return {row.principalId for row in rows}
+
     @staticmethod
     def list_tenant_groups(session, data=None):
         query = session.query(
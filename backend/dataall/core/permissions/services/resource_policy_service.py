@@ -2,9 +2,10 @@ from dataall.core.permissions.api.enums import PermissionType
 from dataall.core.permissions.db.resource_policy.resource_policy_repositories import ResourcePolicyRepository
 from dataall.base.db import exceptions
 from dataall.core.permissions.db.resource_policy.resource_policy_models import ResourcePolicy, ResourcePolicyPermission
+from dataall.core.permissions.db.permission.permission_repositories import PermissionRepository
 from dataall.core.permissions.services.permission_service import PermissionService
-from typing import Protocol, Callable, List
-from dataall.base.context import get_context
+from typing import Protocol, Callable, List, Dict, FrozenSet
+from dataall.base.context import get_context, get_request_cache
 from functools import wraps
 
 import logging
@@ -60,25 +61,67 @@ class ResourcePolicyRequestValidationService:
 
 
 class ResourcePolicyService:
+    _PERMISSION_CACHE = 'resource_permissions'
+
     @staticmethod
     def check_user_resource_permission(session, username: str, groups: [str], resource_uri: str, permission_name: str):
-        resource_policy = None
+        has_permission = False
         if username and permission_name and resource_uri:
-            resource_policy = ResourcePolicyRepository.has_user_resource_permission(
-                session=session,
-                groups=groups,
-                permission_name=permission_name,
-                resource_uri=resource_uri,
-            )
+            permissions = ResourcePolicyService.get_user_resources_permissions(session, groups, [resource_uri])
+            has_permission = permission_name in permissions[resource_uri]
 
-        if not resource_policy:
+        if not has_permission:
             raise exceptions.ResourceUnauthorized(
                 username=username,
                 action=permission_name,
                 resource_uri=resource_uri,
             )
-        else:
-            return resource_policy
+        return True
+
+    @staticmethod
+    def get_user_resources_permissions(session, groups: [str], resource_uris: [str]) -> Dict[str, FrozenSet[str]]:
+        """
+        Returns the names of the permissions granted to any of the groups for each of the resources.
+        All grants of a resource are loaded at once and memoized in the request context, so that
+        the following checks of any permission on the same resource in the same request do not hit the database
+        """
+        cache = get_request_cache(ResourcePolicyService._PERMISSION_CACHE)
+        groups_key = tuple(sorted(groups or []))
+        permissions = {}
+        missing = []
+        for uri in resource_uris:
+            if cache is not None and (groups_key, uri) in cache:
+                permissions[uri] = cache[(groups_key, uri)]
+            elif uri not in missing:
+                missing.append(uri)
+
+        if missing:
+            loaded = {uri: set() for uri in missing}
+            if groups:
+                for uri, name in ResourcePolicyRepository.list_groups_permissions_on_resources(
+                    session, groups=groups, resource_uris=missing
+                ):
+                    loaded[uri].add(name)
+            for uri, names in loaded.items():
+                permissions[uri] = frozenset(names)
+                if cache is not None:
+                    cache[(groups_key, uri)] = permissions[uri]
+        return permissions
+
+    @staticmethod
+    def filter_user_resources_with_permission(
+        session, groups: [str], resource_uris: [str], permission_name: str
+    ) -> List[str]:
+        """Bulk check: returns the resource uris on which any of the groups has the permission, in one query"""
+        permissions = ResourcePolicyService.get_user_resources_permissions(session, groups, resource_uris)
+        return [uri for uri in resource_uris if permission_name in permissions[uri]]
+
+    @staticmethod
+    def _invalidate_permission_cache(resource_uri: str):
+        cache = get_request_cache(ResourcePolicyService._PERMISSION_CACHE)
+        if cache:
+            for key in [key for key in cache if key[1] == resource_uri]:
+                del cache[key]
 
     @staticmethod
     def find_resource_policies(session, group, resource_uri, resource_type, permissions: List[str] = None):
@@ -114,6 +157,7 @@ class ResourcePolicyService:
         :return:
         """
         policies = ResourcePolicyService.find_resource_policies(session, group, resource_uri, resource_type)
+        ResourcePolicyService._invalidate_permission_cache(resource_uri)
         try:
             for policy in policies:
                 for permission in policy.permissions:
@@ -162,6 +206,64 @@ class ResourcePolicyService:
 
         return policy
 
+    @staticmethod
+    def attach_resource_policies(
+        session,
+        groups: [str],
+        permissions: [str],
+        resource_uris: [str],
+        resource_type: str,
+    ):
+        """
+        Bulk version of attach_resource_policy: attaches the permissions to each of the groups on each of the
+        resources with one query for the permissions, one for the existing policies and their permissions
+        and one multi-row insert for the new policies and for the new policy permissions.
+        The changes are not committed.
+        """
+        for group in groups:
+            for resource_uri in resource_uris:
+                ResourcePolicyRequestValidationService.validate_attach_resource_policy_params(
+                    group, permissions, resource_uri, resource_type
+                )
+        if not groups or not resource_uris:
+            return
+
+        permission_uris = {
+            permission.name: permission.permissionUri
+            for permission in PermissionRepository.find_permissions_by_names(
+                session, permissions, permission_type=PermissionType.RESOURCE.name
+            )
+        }
+        for permission in permissions:
+            if permission not in permission_uris:
+                raise exceptions.ObjectNotFound('Permission', permission)
+
+        policies = {
+            (policy.principalId, policy.resourceUri): policy.sid
+            for policy in ResourcePolicyRepository.find_groups_resource_policies(session, groups, resource_uris)
+        }
+        new_policies = [
+            {'principalId': group, 'principalType': 'GROUP', 'resourceUri': resource_uri, 'resourceType': resource_type}
+            for group in groups
+            for resource_uri in resource_uris
+            if (group, resource_uri) not in policies
+        ]
+        existing_permissions = set(ResourcePolicyRepository.list_policies_permissions(session, list(policies.values())))
+        if new_policies:
+            for group, resource_uri, sid in ResourcePolicyRepository.save_resource_policies(session, new_policies):
+                policies[(group, resource_uri)] = sid
+
+        policy_permissions = [
+            {'sid': sid, 'permissionUri': permission_uri}
+            for sid in policies.values()
+            for permission_uri in set(permission_uris.values())
+            if (sid, permission_uri) not in existing_permissions
+        ]
+        if policy_permissions:
+            ResourcePolicyRepository.save_resource_policies_permissions(session, policy_permissions)
+        for resource_uri in resource_uris:
+            ResourcePolicyService._invalidate_permission_cache(resource_uri)
+
     @staticmethod
     def save_resource_policy(session, group, resource_uri, resource_type):
         ResourcePolicyRequestValidationService.validate_save_resource_policy_params(group, resource_uri, resource_type)
@@ -202,6 +304,7 @@ class ResourcePolicyService:
             raise exceptions.RequiredParameter(param_name='policy')
         if not permission:
             raise exceptions.RequiredParameter(param_name='permission')
+        ResourcePolicyService._invalidate_permission_cache(policy.resourceUri)
         policy_permission = ResourcePolicyPermission(
             sid=policy.sid,
             permissionUri=PermissionService.get_permission_by_name(
@@ -15,6 +15,8 @@ import logging
 import os
 from functools import wraps
 
+from sqlalchemy import insert
+
 
 log = logging.getLogger('Permissions')
 
@@ -266,6 +268,41 @@ class TenantPolicyService:
 
         return policy
 
+    @staticmethod
+    def attach_groups_tenant_policy(session, groups: [str], permissions: [str], tenant_name: str) -> [str]:
+        """
+        Same as attach_group_tenant_policy for the groups that do not have a policy on the tenant yet.
+        The policies and their permissions are created with one multi-row insert each.
+        @return: the groups the policy was attached to
+        """
+        RequestValidationService.validate_groups_param(groups)
+        RequestValidationService.validate_attach_tenant_policy(groups[0], permissions, tenant_name)
+
+        missing = sorted(
+            set(groups) - TenantPolicyRepository.list_groups_with_tenant_policy(session, groups, tenant_name)
+        )
+        if not missing:
+            return []
+
+        tenant = TenantPolicyService.get_tenant_by_name(session, tenant_name)
+        permission_uris = [
+            permission.permissionUri
+            for permission in PermissionRepository.find_permissions_by_names(
+                session, permissions, PermissionType.TENANT.name
+            )
+        ]
+        sids = session.scalars(
+            insert(TenantPolicy).returning(TenantPolicy.sid, sort_by_parameter_order=True),
+            [{'tenantUri': tenant.tenantUri, 'principalId': group, 'principalType': 'GROUP'} for group in missing],
+        ).all()
+        if permission_uris:
+            session.execute(
+                insert(TenantPolicyPermission),
+                [{'sid': sid, 'permissionUri': uri} for sid in sids for uri in permission_uris],
+            )
+        session.commit()
+        return missing
+
     @staticmethod
     def find_tenant_policy(session, group_uri: str, tenant_name: str):
         RequestValidationService.validate_find_tenant_policy(group_uri, tenant_name)
@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, DateTime
 
 from dataall.base.db import Base
 
@@ -11,6 +12,9 @@ class ResourceLock(Base):
     resourceType = Column(String, nullable=False, primary_key=True)
     acquiredByUri = Column(String, nullable=True)
     acquiredByType = Column(String, nullable=True)
+    acquiredAt = Column(DateTime, nullable=True)
+    # end of the lease of the lock, renewed by the heartbeat of its holder, expired locks can be taken over
+    expiresAt = Column(DateTime, nullable=True)
 
     def __init__(
         self,
@@ -18,8 +22,12 @@ class ResourceLock(Base):
         resourceType: str,
         acquiredByUri: Optional[str] = None,
         acquiredByType: Optional[str] = None,
+        acquiredAt: Optional[datetime] = None,
+        expiresAt: Optional[datetime] = None,
     ):
         self.resourceUri = resourceUri
         self.resourceType = resourceType
         self.acquiredByUri = acquiredByUri
         self.acquiredByType = acquiredByType
+        self.acquiredAt = acquiredAt
+        self.expiresAt = expiresAt
@@ -1,17 +1,59 @@
 import logging
+import random
+import threading
+from datetime import datetime, timedelta
 
 from dataall.core.resource_lock.db.resource_lock_models import ResourceLock
 from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from time import sleep
+from time import monotonic, sleep
 from typing import List, Tuple
 from contextlib import contextmanager
 from dataall.base.db.exceptions import ResourceLockTimeout
 
 log = logging.getLogger(__name__)
 
-MAX_RETRIES = 10
-RETRY_INTERVAL = 60
+# seconds to wait for a lock before giving up
+MAX_WAIT = 600
+# the retries back off exponentially with jitter from RETRY_INTERVAL up to MAX_RETRY_INTERVAL seconds
+RETRY_INTERVAL = 0.5
+MAX_RETRY_INTERVAL = 30
+# seconds a lock is held without heartbeat, after which it can be taken over (e.g. its ECS task died)
+LOCK_LEASE = 300
+HEARTBEAT_INTERVAL = LOCK_LEASE / 3
+
+
+class ResourceLockMetrics:
+    """Wait times of the lock acquisitions of the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, acquired: bool):
+        with self._lock:
+            if acquired:
+                self.acquired += 1
+            else:
+                self.timeouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            attempts = self.acquired + self.timeouts
+            return {
+                'acquired': self.acquired,
+                'timeouts': self.timeouts,
+                'average_wait': self.total_wait / attempts if attempts else 0.0,
+                'max_wait': self.max_wait,
+            }
+
+
+lock_metrics = ResourceLockMetrics()
 
 
 class ResourceLockRepository:
@@ -39,6 +81,9 @@ class ResourceLockRepository:
                 for resource in resources
             ]
 
+            now = datetime.utcnow()
+            ResourceLockRepository._delete_expired_locks(session.get_bind(), resources, now)
+
             if not session.query(ResourceLock).filter(or_(*filter_conditions)).first():
                 records = []
                 for resource in resources:
@@ -48,6 +93,8 @@ class ResourceLockRepository:
                             resourceType=resource[1],
                             acquiredByUri=acquired_by_uri,
                             acquiredByType=acquired_by_type,
+                            acquiredAt=now,
+                            expiresAt=now + timedelta(seconds=LOCK_LEASE),
                         )
                     )
                 session.add_all(records)
@@ -64,6 +111,30 @@ class ResourceLockRepository:
             log.error('Error occurred while acquiring lock:', e)
             return False
 
+    @staticmethod
+    def _delete_expired_locks(bind, resources, now) -> None:
+        """
+        Deletes the locks of the resources whose lease expired, in a session of its own so that the takeover is
+        committed without the pending changes of the caller and does not stay open while the caller backs off
+        """
+        with Session(bind=bind) as session:
+            expired = (
+                session.query(ResourceLock)
+                .filter(
+                    or_(
+                        *[
+                            and_(ResourceLock.resourceUri == resource[0], ResourceLock.resourceType == resource[1])
+                            for resource in resources
+                        ]
+                    ),
+                    ResourceLock.expiresAt < now,
+                )
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        if expired:
+            log.warning(f'Took over {expired} expired ResourceLocks of {resources}')
+
     @staticmethod
     def _release_lock(session, resource_uri, resource_type, share_uri):
         """
@@ -108,30 +179,74 @@ class ResourceLockRepository:
             log.error('Error occurred while releasing lock:', e)
             return False
 
+    @staticmethod
+    def _renew_locks(bind, resources, acquired_by_uri) -> None:
+        """Extends the lease of the locks of acquired_by_uri, in a session of its own as it runs in another thread"""
+        with Session(bind=bind) as session:
+            session.query(ResourceLock).filter(
+                or_(
+                    *[
+                        and_(ResourceLock.resourceUri == resource[0], ResourceLock.resourceType == resource[1])
+                        for resource in resources
+                    ]
+                ),
+                ResourceLock.acquiredByUri == acquired_by_uri,
+            ).update({'expiresAt': datetime.utcnow() + timedelta(seconds=LOCK_LEASE)}, synchronize_session=False)
+            session.commit()
+
+    @staticmethod
+    def _heartbeat(bind, resources, acquired_by_uri, stopped: threading.Event) -> None:
+        while not stopped.wait(HEARTBEAT_INTERVAL):
+            try:
+                ResourceLockRepository._renew_locks(bind, resources, acquired_by_uri)
+            except Exception as e:
+                log.error(f'Failed to renew the locks of {resources} held by {acquired_by_uri}: {e}')
+
     @staticmethod
     @contextmanager
     def acquire_lock_with_retry(
         resources: List[Tuple[str, str]], session: Session, acquired_by_uri: str, acquired_by_type: str
     ):
-        retries_remaining = MAX_RETRIES
+        """
+        Acquires the locks of all the resources, retrying with jittered exponential backoff for up to MAX_WAIT seconds.
+        The lease of the locks is renewed by a heartbeat thread while they are held.
+        Raises ResourceLockTimeout if the locks could not be acquired.
+        """
         log.info(f'Attempting to acquire lock for resources {resources} by share {acquired_by_uri}...')
+        start = monotonic()
+        interval = RETRY_INTERVAL
         while not (
             lock_acquired := ResourceLockRepository._acquire_locks(
                 resources, session, acquired_by_uri, acquired_by_type
             )
         ):
-            log.info(
-                f'Lock for one or more resources {resources} already acquired. Retrying in {RETRY_INTERVAL} seconds...'
-            )
-            sleep(RETRY_INTERVAL)
-            retries_remaining -= 1
-            if retries_remaining <= 0:
+            waited = monotonic() - start
+            if waited >= MAX_WAIT:
+                lock_metrics.record(waited, acquired=False)
                 raise ResourceLockTimeout(
                     'process shares',
                     f'Failed to acquire lock for one or more of {resources=}',
                 )
+            delay = min(random.uniform(interval / 2, interval), MAX_WAIT - waited)
+            log.info(f'Lock for one or more resources {resources} already acquired. Retrying in {delay:.1f} seconds...')
+            sleep(delay)
+            interval = min(interval * 2, MAX_RETRY_INTERVAL)
+
+        waited = monotonic() - start
+        lock_metrics.record(waited, acquired=True)
+        log.info(f'Acquired lock for resources {resources} by share {acquired_by_uri} after waiting {waited:.1f}s')
+
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=ResourceLockRepository._heartbeat,
+            args=(session.get_bind(), resources, acquired_by_uri, stopped),
+            daemon=True,
+        )
+        heartbeat.start()
         try:
             yield lock_acquired
         finally:
+            stopped.set()
+            heartbeat.join()
             for resource in resources:
                 ResourceLockRepository._release_lock(session, resource[0], resource[1], acquired_by_uri)
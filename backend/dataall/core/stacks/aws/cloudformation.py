@@ -1,5 +1,6 @@
 import logging
 import uuid
+from collections import defaultdict
 
 from botocore.exceptions import ClientError
 
@@ -10,6 +11,9 @@ from dataall.base.utils import json_utils
 
 log = logging.getLogger(__name__)
 
+# maximum number of events stored for a stack, newest first
+MAX_STACK_EVENTS = 100
+
 
 class CloudFormation:
     def __init__(self):
@@ -58,47 +62,55 @@ class CloudFormation:
             raise e
 
     @staticmethod
-    def _get_stack(**data) -> dict:
-        try:
-            accountid = data['accountid']
-            region = data['region']
-            stack_name = data['stack_name']
-            aws_session = SessionHelper.remote_session(accountid=accountid, region=region)
-            cfnclient = aws_session.client('cloudformation', region_name=region)
-            response = cfnclient.describe_stacks(StackName=stack_name)
-            return response['Stacks'][0]
-        except ClientError as e:
-            raise e
+    def describe_stack_resources(engine, task: Task):
+        CloudFormation.refresh_stacks(engine, [task.payload])
 
     @staticmethod
-    def describe_stack_resources(engine, task: Task):
-        try:
-            filtered_resources = []
-            filtered_events = []
-            filtered_outputs = {}
-            data = {
-                'accountid': task.payload['accountid'],
-                'region': task.payload['region'],
-                'stack_name': task.payload['stack_name'],
-            }
-
-            cfn_stack = CloudFormation._get_stack(**data)
-            stack_arn = cfn_stack['StackId']
-            status = cfn_stack['StackStatus']
-            stack_outputs = cfn_stack.get('Outputs', [])
-            if stack_outputs:
-                for output in stack_outputs:
-                    print(output)
-                    filtered_outputs[output['OutputKey']] = output['OutputValue']
-            resources = CloudFormation._describe_stack_resources(**data)['StackResources']
-            events = CloudFormation._describe_stack_events(**data)['StackEvents']
-            with engine.scoped_session() as session:
-                stack: Stack = session.query(Stack).get(task.payload['stackUri'])
-                stack.status = status
-                stack.stackid = stack_arn
-                stack.outputs = filtered_outputs
-                for resource in resources:
-                    filtered_resources.append(
+    def refresh_stacks(engine, stacks: [dict]):
+        """
+        Refreshes the status, outputs, resources and events of the stacks described by payloads of
+        cloudformation.stack.describe_resources tasks.
+        The stacks of the same account and region are described with the same CloudFormation client,
+        the resources are only listed when the status or the last update time of the stack changed
+        and only the events emitted since the last refresh are fetched.
+        """
+        groups = defaultdict(list)
+        for data in stacks:
+            groups[(data['accountid'], data['region'])].append(data)
+
+        for (accountid, region), group in groups.items():
+            try:
+                client = CloudFormation.client(AwsAccountId=accountid, region=region)
+            except ClientError as e:
+                log.error(f'Failed to get a CloudFormation client for {accountid}/{region}: {e}')
+                for data in group:
+                    CloudFormation._save_stack_error(engine, data['stackUri'], e)
+                continue
+            for data in group:
+                try:
+                    CloudFormation._refresh_stack(engine, client, data)
+                except ClientError as e:
+                    log.error(f'Failed to describe stack {data["stack_name"]} in {accountid}/{region}: {e}')
+                    CloudFormation._save_stack_error(engine, data['stackUri'], e)
+
+    @staticmethod
+    def _refresh_stack(engine, client, data: dict):
+        stack_name = data['stack_name']
+        cfn_stack = client.describe_stacks(StackName=stack_name)['Stacks'][0]
+        stack_arn = cfn_stack['StackId']
+        status = cfn_stack['StackStatus']
+        last_updated = str(cfn_stack.get('LastUpdatedTime') or cfn_stack.get('CreationTime'))
+        with engine.scoped_session() as session:
+            stack: Stack = session.query(Stack).get(data['stackUri'])
+            stored_resources = stack.resources if isinstance(stack.resources, dict) else {}
+            stored_events = (stack.events if isinstance(stack.events, dict) else {}).get('events', [])
+            if stack.stackid != stack_arn:
+                stored_resources, stored_events = {}, []
+
+            if status != stack.status or last_updated != stored_resources.get('lastUpdatedTime'):
+                resources = client.describe_stack_resources(StackName=stack_name)['StackResources']
+                stack.resources = {
+                    'resources': [
                         {
                             'ResourceStatus': resource.get('ResourceStatus'),
                             'LogicalResourceId': resource.get('LogicalResourceId'),
@@ -107,55 +119,48 @@ class CloudFormation:
                             'StackName': resource.get('StackName'),
                             'StackId': resource.get('StackId'),
                         }
-                    )
-                stack.resources = {'resources': filtered_resources}
-                for event in events:
-                    filtered_events.append(
-                        {
-                            'ResourceStatus': event.get('ResourceStatus'),
-                            'LogicalResourceId': event.get('LogicalResourceId'),
-                            'PhysicalResourceId': event.get('PhysicalResourceId'),
-                            'ResourceType': event.get('ResourceType'),
-                            'StackName': event.get('StackName'),
-                            'StackId': event.get('StackId'),
-                            'EventId': event.get('EventId'),
-                            'ResourceStatusReason': event.get('ResourceStatusReason'),
-                        }
-                    )
-                stack.events = {'events': filtered_events}
-                stack.error = None
-                session.commit()
-        except ClientError as e:
-            with engine.scoped_session() as session:
-                stack: Stack = session.query(Stack).get(task.payload['stackUri'])
-                if not stack.error:
-                    stack.error = {'error': json_utils.to_string(e.response['Error']['Message'])}
-                session.commit()
+                        for resource in resources
+                    ],
+                    'lastUpdatedTime': last_updated,
+                }
+            else:
+                log.info(f'Stack {stack_name} has not changed since its last refresh, skipping its resources')
+
+            last_event_id = stored_events[0]['EventId'] if stored_events else None
+            new_events = CloudFormation._describe_new_stack_events(client, stack_name, last_event_id)
+            stack.events = {'events': (new_events + stored_events)[:MAX_STACK_EVENTS]}
+            stack.status = status
+            stack.stackid = stack_arn
+            stack.outputs = {output['OutputKey']: output['OutputValue'] for output in cfn_stack.get('Outputs', [])}
+            stack.error = None
+            session.commit()
 
     @staticmethod
-    def _describe_stack_resources(**data):
-        accountid = data['accountid']
-        region = data.get('region', 'eu-west-1')
-        stack_name = data['stack_name']
-        aws_session = SessionHelper.remote_session(accountid=accountid, region=region)
-        client = aws_session.client('cloudformation', region_name=region)
-        try:
-            stack_resources = client.describe_stack_resources(StackName=stack_name)
-            log.info(f'Stack describe resources response : {stack_resources}')
-            return stack_resources
-        except ClientError as e:
-            log.error(e, exc_info=True)
+    def _describe_new_stack_events(client, stack_name, last_event_id) -> [dict]:
+        """Returns the events of the stack emitted after last_event_id, newest first, at most MAX_STACK_EVENTS"""
+        events = []
+        for page in client.get_paginator('describe_stack_events').paginate(StackName=stack_name):
+            for event in page['StackEvents']:
+                if event.get('EventId') == last_event_id or len(events) == MAX_STACK_EVENTS:
+                    return events
+                events.append(
+                    {
+                        'ResourceStatus': event.get('ResourceStatus'),
+                        'LogicalResourceId': event.get('LogicalResourceId'),
+                        'PhysicalResourceId': event.get('PhysicalResourceId'),
+                        'ResourceType': event.get('ResourceType'),
+                        'StackName': event.get('StackName'),
+                        'StackId': event.get('StackId'),
+                        'EventId': event.get('EventId'),
+                        'ResourceStatusReason': event.get('ResourceStatusReason'),
+                    }
+                )
+        return events
 
     @staticmethod
-    def _describe_stack_events(**data):
-        accountid = data['accountid']
-        region = data.get('region', 'eu-west-1')
-        stack_name = data['stack_name']
-        aws_session = SessionHelper.remote_session(accountid=accountid, region=region)
-        client = aws_session.client('cloudformation', region_name=region)
-        try:
-            stack_events = client.describe_stack_events(StackName=stack_name)
-            log.info(f'Stack describe events response : {stack_events}')
-            return stack_events
-        except ClientError as e:
-            log.error(e, exc_info=True)
+    def _save_stack_error(engine, stack_uri, error: ClientError):
+        with engine.scoped_session() as session:
+            stack: Stack = session.query(Stack).get(stack_uri)
+            if not stack.error:
+                stack.error = {'error': json_utils.to_string(error.response['Error']['Message'])}
+            session.commit()
@@ -8,6 +8,9 @@ from dataall.base.utils import Parameter
 
 log = logging.getLogger('aws:ecs')
 
+# maximum number of tasks of a describe_tasks request
+DESCRIBE_TASKS_BATCH_SIZE = 100
+
 
 class Ecs:
     def __init__(self):
@@ -85,6 +88,22 @@ class Ecs:
             log.error(e)
             raise e
 
+    @staticmethod
+    def get_running_tasks(cluster_name, task_arns) -> set:
+        """Returns the tasks of task_arns that have not stopped yet, with one describe_tasks per 100 tasks"""
+        try:
+            client = boto3.client('ecs')
+            running = set()
+            for start in range(0, len(task_arns), DESCRIBE_TASKS_BATCH_SIZE):
+                response = client.describe_tasks(
+                    cluster=cluster_name, tasks=task_arns[start : start + DESCRIBE_TASKS_BATCH_SIZE]
+                )
+                running.update(task['taskArn'] for task in response['tasks'] if task['lastStatus'] != 'STOPPED')
+            return running
+        except ClientError as e:
+            log.error(e)
+            raise e
+
     @staticmethod
     def is_task_running(cluster_name, started_by=None):
         try:
@@ -27,6 +27,8 @@ class Stack(Base):
     events = Column(postgresql.JSON)
     lastSeen = Column(DateTime, default=lambda: datetime.datetime(year=1900, month=1, day=1))
     EcsTaskArn = Column(String, nullable=True)
+    # fingerprint of the templates and assets of the last successful deployment
+    templateHash = Column(String, nullable=True)
 
 
 class KeyValueTag(Base):
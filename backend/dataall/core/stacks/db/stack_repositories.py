@@ -29,6 +29,10 @@ class StackRepository:
             query = query.filter(models.Stack.status.in_(statuses))
         return query.first()
 
+    @staticmethod
+    def find_stacks_by_target_uris(session, target_uris):
+        return session.query(models.Stack).filter(models.Stack.targetUri.in_(target_uris)).all()
+
     @staticmethod
     def get_stack_by_uri(session, stack_uri):
         stack = StackRepository.find_stack_by_uri(session, stack_uri)
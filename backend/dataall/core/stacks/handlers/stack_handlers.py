@@ -32,9 +32,9 @@ class StackHandlers:
         return {'status': 200, 'stackDeleted': True}
 
     @staticmethod
-    @Worker.handler(path='cloudformation.stack.describe_resources')
-    def describe_stack_resources(engine, task: Task):
-        CloudFormation.describe_stack_resources(engine, task)
+    @Worker.handler(path='cloudformation.stack.describe_resources', batch=True)
+    def describe_stack_resources(engine, tasks: [Task]):
+        CloudFormation.refresh_stacks(engine, [task.payload for task in tasks])
 
     @staticmethod
     @Worker.handler(path='ecs.cdkproxy.deploy')
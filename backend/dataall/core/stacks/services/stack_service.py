@@ -3,6 +3,7 @@ import os
 import requests
 import logging
 
+from dataall.base.api.dataloader import DataLoader, get_dataloader
 from dataall.base.db import exceptions
 from dataall.base.feature_toggle_checker import is_feature_enabled_for_allowed_values
 from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
@@ -21,7 +22,7 @@ from dataall.base.db.exceptions import AWSResourceNotFound
 from dataall.base.db.exceptions import RequiredParameter
 from dataall.core.stacks.db.target_type_repositories import TargetType
 from dataall.core.environment.db.environment_models import Environment
-from dataall.core.environment.db.environment_repositories import EnvironmentRepository
+from dataall.core.environment.services.environment_service import EnvironmentService
 
 log = logging.getLogger(__name__)
 
@@ -64,6 +65,11 @@ def map_target_type_to_log_config_path(**kwargs):
 
 
 class StackService:
+    @staticmethod
+    def stack_loader() -> DataLoader:
+        """Batches the lookups of stacks by targetUri of the field resolvers of the current request"""
+        return get_dataloader('stack', StackRepository.find_stacks_by_target_uris, key=lambda stack: stack.targetUri)
+
     @staticmethod
     def resolve_parent_obj_stack(targetUri: str, targetType: str, environmentUri: str):
         context = get_context()
@@ -75,8 +81,8 @@ class StackService:
                 resource_uri=targetUri,
                 permission_name=TargetType.get_resource_read_permission_name(targetType),
             )
-            env: Environment = EnvironmentRepository.get_environment_by_uri(session, environmentUri)
-            stack: Stack = StackRepository.find_stack_by_target_uri(session, target_uri=targetUri)
+            env: Environment = EnvironmentService.find_environment_by_uri_simplified(environmentUri)
+            stack: Stack = StackService.stack_loader().load(targetUri)
             if not stack:
                 stack = Stack(
                     stack='environment',
@@ -1,13 +1,22 @@
 import logging
 import os
+import threading
 import time
-from functools import wraps
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial, wraps
 
+from sqlalchemy import update
+
+from dataall.base.db.connection import WORKER_MAX_THREADS
 from dataall.core.tasks.db.task_models import Task
 from dataall.base.utils.json_utils import to_json
 
 log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
+# number of tasks processed concurrently, the HANDLERS pool of connections is sized from it
+MAX_WORKERS = WORKER_MAX_THREADS
 
 
 class WorkerHandler:
@@ -21,59 +30,135 @@ class WorkerHandler:
 
     def __init__(self):
         self.handlers = {}
+        # action -> semaphore limiting the number of concurrent tasks of the action
+        self.limits = {}
+        # actions whose handler processes all the tasks of a batch in a single call
+        self.batch_actions = set()
         self.enabled = True
 
     def queue(self, engine, task_ids: [str]):
         log.info(f'Queuing Task Ids: {task_ids}')
 
-    def handler(self, path):
+    def handler(self, path, max_concurrency=None, batch=False):
+        """
+        Registers the handler of the tasks of an action, called with the engine and a task.
+        Handlers of batch actions are called once per processed batch with the engine and the list of its tasks.
+        """
+
         def decorator(fn):
             self.handlers[path] = fn
+            if max_concurrency:
+                self.limits[path] = threading.BoundedSemaphore(max_concurrency)
+            if batch:
+                self.batch_actions.add(path)
             return fn
 
         return decorator
 
     def process(self, engine, task_ids: [str], save_response=True):
-        tasks_responses = []
-        if self.enabled:
-            for taskid in task_ids:
-                try:
-                    log.info(f'Processing Task: {taskid}')
-                    handler, task = self.get_task_handler(engine, taskid)
-
-                    error, response, status = self.handle_task(engine, task, handler)
-                    if save_response:
-                        WorkerHandler.update_task(engine, taskid, error, to_json(response), status)
-
-                    else:
-                        WorkerHandler.update_task(engine, taskid, error, {}, status)
-                    tasks_responses.append(
-                        {
-                            'taskUri': taskid,
-                            'response': response,
-                            'error': error,
-                            'status': status,
-                        }
-                    )
-                    return tasks_responses
-                except Exception as e:
-                    log.exception('Error in process')
-                    log.error(f'Task processing failed {e} : {taskid}')
-        else:
+        """
+        Claims the pending tasks of task_ids, runs their handlers and saves their results.
+        Tasks of different targets run concurrently, up to MAX_WORKERS at a time and to the max_concurrency
+        of each action, the tasks of the same target run in order and the tasks of a batch action in a single call.
+        Errors of the handlers are saved in the tasks, errors claiming or saving the tasks are raised,
+        after the claimed tasks are made pending again.
+        :return: the responses of the processed tasks
+        """
+        if not self.enabled:
             log.info(f'Worker disabled, tasks {task_ids} wont be processed')
+            return []
 
-    def get_task_handler(self, engine, taskid):
+        tasks = self.claim_tasks(engine, task_ids)
+        if not tasks:
+            return []
+        try:
+            results = self.run_tasks_concurrently(engine, tasks)
+            WorkerHandler.update_tasks(
+                engine,
+                [
+                    {
+                        'taskUri': task.taskUri,
+                        'status': results[task.taskUri][2],
+                        'error': results[task.taskUri][0],
+                        'response': to_json(results[task.taskUri][1]) if save_response else {},
+                    }
+                    for task in tasks
+                ],
+            )
+        except Exception:
+            # the messages of the tasks are retried by SQS, which only processes pending tasks
+            WorkerHandler.reset_tasks(engine, [task.taskUri for task in tasks])
+            raise
+        return [
+            {
+                'taskUri': task.taskUri,
+                'response': results[task.taskUri][1],
+                'error': results[task.taskUri][0],
+                'status': results[task.taskUri][2],
+            }
+            for task in tasks
+        ]
+
+    def run_tasks_concurrently(self, engine, tasks: [Task]) -> dict:
+        """Runs the tasks grouped by target and by batch action in the thread pool and returns their results"""
+        # the tasks of the same target run one after another in the order they were queued,
+        # the tasks of a batch action all together
+        groups = defaultdict(list)
+        batches = defaultdict(list)
+        for task in tasks:
+            if task.action in self.batch_actions:
+                batches[task.action].append(task)
+            else:
+                groups[task.targetUri].append(task)
+        units = [partial(self.run_tasks, engine, group) for group in groups.values()]
+        units += [partial(self.run_batch, engine, action, batch) for action, batch in batches.items()]
+        if len(units) == 1:
+            return units[0]()
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(units))) as executor:
+            for unit_results in executor.map(lambda unit: unit(), units):
+                results.update(unit_results)
+        return results
+
+    def claim_tasks(self, engine, task_ids: [str]) -> [Task]:
+        """Marks the pending tasks of task_ids that have a handler as started, in a single statement"""
         with engine.scoped_session() as session:
-            task = session.query(Task).get(taskid)
-            handler = self.handlers.get(task.action)
-            log.info(f' found handler {handler} for task action {task.action}|{task.taskUri}')
-            if task.status != 'pending':
-                raise Exception(f'Could not start task {task.taskUri} as its status is {task.status}')
-            if not handler:
-                raise Exception(f'No handler defined for {task.action}')
-            task.status = 'started'
+            tasks = session.scalars(
+                update(Task)
+                .where(Task.taskUri.in_(task_ids), Task.status == 'pending', Task.action.in_(list(self.handlers)))
+                .values(status='started')
+                .returning(Task)
+            ).all()
             session.commit()
-        return handler, task
+        claimed = {task.taskUri for task in tasks}
+        for taskid in task_ids:
+            if taskid not in claimed:
+                log.error(f'Could not start task {taskid}: not found, not pending or no handler defined for its action')
+        return sorted(tasks, key=lambda task: task_ids.index(task.taskUri))
+
+    def run_tasks(self, engine, tasks: [Task]) -> dict:
+        results = {}
+        for task in tasks:
+            log.info(f'Processing Task: {task.taskUri} ({task.action})')
+            limit = self.limits.get(task.action)
+            if limit is None:
+                results[task.taskUri] = self.handle_task(engine, task, self.handlers[task.action])
+            else:
+                with limit:
+                    results[task.taskUri] = self.handle_task(engine, task, self.handlers[task.action])
+        return results
+
+    def run_batch(self, engine, action, tasks: [Task]) -> dict:
+        log.info(f'Processing {len(tasks)} Tasks of {action}: {[task.taskUri for task in tasks]}')
+        limit = self.limits.get(action) or nullcontext()
+        error, response, status = {}, {}, 'completed'
+        with limit:
+            try:
+                response = self.handlers[action](engine, tasks)
+            except Exception as e:
+                log.error(f'Failed to execute the Tasks of {action} due to {e}', exc_info=True)
+                error, status = {'message': str(e)}, 'failed'
+        return {task.taskUri: (error, response, status) for task in tasks}
 
     @staticmethod
     def handle_task(engine, task: Task, handler):
@@ -89,14 +174,23 @@ class WorkerHandler:
         return error, response, status
 
     @staticmethod
-    def update_task(engine, taskid, error, response, status):
+    def update_tasks(engine, results: [dict]):
+        """Saves the status, error and response of several tasks in a single bulk update"""
         with engine.scoped_session() as session:
-            task = session.query(Task).get(taskid)
-            task.status = status
-            task.error = error
-            task.response = response
+            session.execute(update(Task), results)
             session.commit()
-            return task
+
+    @staticmethod
+    def reset_tasks(engine, task_ids: [str]):
+        """Makes the started tasks of task_ids pending again so that they are claimed when their messages are retried"""
+        try:
+            with engine.scoped_session() as session:
+                session.execute(
+                    update(Task).where(Task.taskUri.in_(task_ids), Task.status == 'started').values(status='pending')
+                )
+                session.commit()
+        except Exception:
+            log.exception(f'Failed to reset the tasks {task_ids}, they stay started')
 
     @classmethod
     def retry(cls, exception, tries=4, delay=3, backoff=2, logger=None):
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+
+from dataall.base.db import Base
+
+
+class CatalogIndexerState(Base):
+    """High-water marks of the catalog indexer runs"""
+
+    __tablename__ = 'catalog_indexer_state'
+    name = Column(String, primary_key=True)
+    lastIndexed = Column(DateTime, nullable=True)
+    lastFullIndexed = Column(DateTime, nullable=True)
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional, Set
+
+from sqlalchemy import or_
+
+from dataall.modules.catalog.db.catalog_indexer_models import CatalogIndexerState
+from dataall.modules.catalog.db.glossary_models import GlossaryNode, TermLink
+
+
+class CatalogIndexerRepository:
+    _STATE_NAME = 'catalog'
+
+    @staticmethod
+    def get_state(session) -> Optional[CatalogIndexerState]:
+        return session.query(CatalogIndexerState).get(CatalogIndexerRepository._STATE_NAME)
+
+    @staticmethod
+    def save_state(session, last_indexed: datetime, full: bool) -> CatalogIndexerState:
+        state = CatalogIndexerRepository.get_state(session)
+        if not state:
+            state = CatalogIndexerState(name=CatalogIndexerRepository._STATE_NAME)
+            session.add(state)
+        state.lastIndexed = last_indexed
+        if full:
+            state.lastFullIndexed = last_indexed
+        session.commit()
+        return state
+
+    @staticmethod
+    def list_glossary_targets_changed_since(session, since: datetime) -> Set[str]:
+        """URIs of the objects whose term links or linked glossary terms changed since the given time"""
+        query = (
+            session.query(TermLink.targetUri)
+            .join(GlossaryNode, GlossaryNode.nodeUri == TermLink.nodeUri)
+            .filter(
+                or_(
+                    TermLink.created >= since,
+                    TermLink.updated >= since,
+                    GlossaryNode.updated >= since,
+                    GlossaryNode.deleted >= since,
+                )
+            )
+            .distinct()
+        )
+        return {uri for (uri,) in query}
@@ -1,8 +1,16 @@
+import json
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from operator import and_
+from typing import Callable, Dict, List, Optional, Tuple
+
+from opensearchpy.exceptions import ConnectionError, TransportError
 
 from sqlalchemy.orm import with_expression
 
@@ -12,12 +20,140 @@ from dataall.base.searchproxy import connect
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class BulkIndexStats:
+    """Counters of a bulk indexing run"""
+
+    indexed: int = 0
+    deleted: int = 0
+    failed: int = 0
+    retried: int = 0
+    requests: int = 0
+    bytes: int = 0
+    failed_ids: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def throughput(self) -> float:
+        """Documents written per second"""
+        elapsed = self.elapsed()
+        return (self.indexed + self.deleted) / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (
+            f'{self.indexed} indexed, {self.deleted} deleted, {self.failed} failed, {self.retried} retried '
+            f'in {self.requests} requests ({self.bytes} bytes), {self.elapsed():.1f}s, {self.throughput():.1f} docs/s'
+        )
+
+
+class BulkIndexer:
+    """
+    Buffers index and delete actions and sends them to OpenSearch with the _bulk API once the buffer reaches
+    batch_size actions or max_bytes bytes. Actions rejected with a transient status (e.g. 429 when the cluster
+    is overloaded) are retried with exponential backoff, other rejections are counted as failures.
+    """
+
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(
+        self,
+        connect: Callable,
+        index: str,
+        batch_size: int = 500,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        self._connect = connect
+        self._index = index
+        self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._actions: List[Tuple[dict, Optional[dict]]] = []
+        self._bytes = 0
+        self.stats = BulkIndexStats()
+
+    def index(self, doc_id: str, doc: dict) -> None:
+        self._add({'index': {'_index': self._index, '_id': doc_id}}, doc)
+
+    def delete(self, doc_id: str) -> None:
+        self._add({'delete': {'_index': self._index, '_id': doc_id}}, None)
+
+    def flush(self) -> None:
+        actions, self._actions, self._bytes = self._actions, [], 0
+        for attempt in range(self._max_retries + 1):
+            if not actions:
+                return
+            if attempt:
+                self.stats.retried += len(actions)
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+            actions = self._send(actions)
+
+        for action, _ in actions:
+            self._failed(action, 'retries exhausted')
+
+    def _add(self, action: dict, source: Optional[dict]) -> None:
+        size = self._size(action) + (self._size(source) if source is not None else 0)
+        if self._actions and self._bytes + size > self._max_bytes:
+            self.flush()
+        self._actions.append((action, source))
+        self._bytes += size
+        if len(self._actions) >= self._batch_size:
+            self.flush()
+
+    def _send(self, actions):
+        """Sends the actions in a single _bulk request and returns the ones to retry"""
+        body = []
+        for action, source in actions:
+            body.append(action)
+            if source is not None:
+                body.append(source)
+        self.stats.requests += 1
+        self.stats.bytes += sum(self._size(line) for line in body)
+        try:
+            response = self._connect().bulk(body=body)
+        except (ConnectionError, TransportError) as e:
+            if isinstance(e, ConnectionError) or e.status_code in self.RETRY_STATUSES:
+                log.warning(f'Bulk request of {len(actions)} actions failed with {e}, retrying')
+                return actions
+            raise
+
+        retry = []
+        for (action, source), item in zip(actions, response['items']):
+            operation, result = next(iter(item.items()))
+            status = result.get('status', 500)
+            if status < 300 or (operation == 'delete' and status == 404):
+                if operation == 'delete':
+                    self.stats.deleted += 1
+                else:
+                    self.stats.indexed += 1
+            elif status in self.RETRY_STATUSES:
+                retry.append((action, source))
+            else:
+                self._failed(action, result.get('error'))
+        return retry
+
+    def _failed(self, action, error) -> None:
+        operation, meta = next(iter(action.items()))
+        log.error(f'Failed to {operation} doc {meta["_id"]}: {error}')
+        self.stats.failed += 1
+        self.stats.failed_ids.append(meta['_id'])
+
+    @staticmethod
+    def _size(line: dict) -> int:
+        return len(json.dumps(line, default=str)) + 1
+
+
 class BaseIndexer(ABC):
     """API to work with OpenSearch"""
 
     _INDEX = 'dataall-index'
     _es = None
     _QUERY_SIZE = 1000
+    _bulk_indexer: Optional[BulkIndexer] = None
 
     @classmethod
     def es(cls):
@@ -35,16 +171,37 @@ class BaseIndexer(ABC):
     def upsert(session, target_id):
         raise NotImplementedError('Method upsert is not implemented')
 
+    @classmethod
+    @contextmanager
+    def bulk(cls, **kwargs):
+        """
+        Within the context, documents indexed or deleted by any indexer are buffered and written with _bulk
+        requests instead of one request per document. Accepts the parameters of BulkIndexer.
+        """
+        bulk_indexer = BulkIndexer(connect=BaseIndexer.es, index=cls._INDEX, **kwargs)
+        BaseIndexer._bulk_indexer = bulk_indexer
+        try:
+            yield bulk_indexer
+            bulk_indexer.flush()
+        finally:
+            BaseIndexer._bulk_indexer = None
+
     @classmethod
     def delete_doc(cls, doc_id):
+        if BaseIndexer._bulk_indexer:
+            BaseIndexer._bulk_indexer.delete(doc_id)
+            return True
         es = cls.es()
         es.delete(index=cls._INDEX, id=doc_id, ignore=[400, 404])
         return True
 
     @classmethod
     def _index(cls, doc_id, doc):
-        es = cls.es()
         doc['_indexed'] = datetime.now()
+        if BaseIndexer._bulk_indexer:
+            BaseIndexer._bulk_indexer.index(doc_id, doc)
+            return True
+        es = cls.es()
         if es:
             res = es.index(index=cls._INDEX, id=doc_id, body=doc)
             log.info(f'doc {doc} for id {doc_id} indexed with response {res}')
@@ -84,6 +241,24 @@ class BaseIndexer(ABC):
             log.error(f'ES config is missing, search query {query} failed')
             return {}
 
+    @staticmethod
+    def _get_targets_glossary_terms(session, target_uris) -> Dict[str, List[str]]:
+        """Returns the paths of the approved glossary terms linked to each of the targets with one query"""
+        q = (
+            session.query(TermLink.targetUri, GlossaryNode.path)
+            .join(GlossaryNode, GlossaryNode.nodeUri == TermLink.nodeUri)
+            .filter(
+                and_(
+                    TermLink.targetUri.in_(target_uris),
+                    TermLink.approvedBySteward.is_(True),
+                )
+            )
+        )
+        terms = defaultdict(list)
+        for target_uri, path in q:
+            terms[target_uri].append(path)
+        return terms
+
     @staticmethod
     def _get_target_glossary_terms(session, target_uri):
         q = (
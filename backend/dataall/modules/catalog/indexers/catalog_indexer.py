@@ -1,4 +1,5 @@
 from abc import ABC
+from datetime import datetime
 from typing import List
 
 
@@ -14,3 +15,10 @@ class CatalogIndexer(ABC):
 
     def index(self, session) -> List[str]:
         raise NotImplementedError('index is not implemented')
+
+    def index_changes(self, session, since: datetime) -> List[str]:
+        """
+        Indexes only the objects that changed since the given time (and the objects that embed them).
+        Indexers that don't track changes reindex everything.
+        """
+        return self.index(session)
@@ -1,8 +1,10 @@
 import logging
 import os
 import sys
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional
 
+from dataall.modules.catalog.db.catalog_indexer_repositories import CatalogIndexerRepository
 from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
 from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 from dataall.base.db import get_engine
@@ -11,6 +13,9 @@ from dataall.base.utils.alarm_service import AlarmService
 
 log = logging.getLogger(__name__)
 
+FULL_SWEEP_INTERVAL = timedelta(hours=24)
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+
 
 class CatalogIndexerTask:
     """
@@ -18,27 +23,63 @@ class CatalogIndexerTask:
     """
 
     @classmethod
-    def index_objects(cls, engine, with_deletes='False'):
+    def index_objects(
+        cls, engine, with_deletes='False', batch_size=500, max_bytes=5 * 1024 * 1024, incremental='False'
+    ):
+        """
+        Indexes the catalog objects. With incremental='True' only the objects changed since the previous run
+        are reindexed, unless the last full run is older than FULL_SWEEP_INTERVAL.
+        Stale documents are only deleted (with_deletes='True') by full runs.
+        """
         try:
+            started = datetime.now()
             indexed_object_uris = []
             with engine.scoped_session() as session:
-                for indexer in CatalogIndexer.all():
-                    indexed_object_uris += indexer.index(session)
+                since = cls._changes_since(session, started) if incremental == 'True' else None
+                with BaseIndexer.bulk(batch_size=batch_size, max_bytes=max_bytes) as bulk_indexer:
+                    for indexer in CatalogIndexer.all():
+                        if since:
+                            indexed_object_uris += indexer.index_changes(session, since)
+                        else:
+                            indexed_object_uris += indexer.index(session)
+                    bulk_indexer.flush()
+                    cls._check_failures(bulk_indexer.stats)
+                    log.info(f'Successfully indexed {len(indexed_object_uris)} objects')
 
-                log.info(f'Successfully indexed {len(indexed_object_uris)} objects')
+                    if with_deletes == 'True' and not since:
+                        CatalogIndexerTask._delete_old_objects(indexed_object_uris)
+                cls._check_failures(bulk_indexer.stats)
+                log.info(f'Bulk indexing stats: {bulk_indexer.stats}')
 
-                if with_deletes == 'True':
-                    CatalogIndexerTask._delete_old_objects(indexed_object_uris)
+                CatalogIndexerRepository.save_state(session, last_indexed=started, full=not since)
                 return len(indexed_object_uris)
         except Exception as e:
             AlarmService().trigger_catalog_indexing_failure_alarm(error=str(e))
             raise e
 
+    @classmethod
+    def _changes_since(cls, session, started: datetime) -> Optional[datetime]:
+        """Returns the time to reindex the changes from, None if a full run is needed"""
+        state = CatalogIndexerRepository.get_state(session)
+        if not state or not state.lastIndexed or not state.lastFullIndexed:
+            log.info('No previous catalog indexing run found, running a full reindex')
+            return None
+        if started - state.lastFullIndexed > FULL_SWEEP_INTERVAL:
+            log.info(f'Last full reindex ran at {state.lastFullIndexed}, running a full reindex')
+            return None
+        # overlap with the previous run to catch the changes committed while it was running
+        return state.lastIndexed - INCREMENTAL_OVERLAP
+
+    @staticmethod
+    def _check_failures(stats) -> None:
+        if stats.failed:
+            raise Exception(f'Failed to index {stats.failed} objects: {stats.failed_ids[:10]}')
+
     @classmethod
     def _delete_old_objects(cls, indexed_object_uris: List[str]) -> None:
         # Search for documents in opensearch without an ID in the indexed_object_uris list
-        query = {'query': {'bool': {'must_not': {'terms': {'_id': indexed_object_uris}}}}}
-        # Delete All "Outdated" Objects from Index
+        query = {'query': {'bool': {'must_not': {'terms': {'_id': indexed_object_uris}}}}, '_source': False}
+        # Delete All "Outdated" Objects from Index, buffered in _bulk requests when running within BaseIndexer.bulk
         docs = BaseIndexer.search_all(query, sort='_id')
         for doc in docs:
             BaseIndexer.delete_doc(doc_id=doc['_id'])
@@ -50,4 +91,9 @@ if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
     with_deletes = os.environ.get('with_deletes', 'False')
-    CatalogIndexerTask.index_objects(engine=ENGINE, with_deletes=with_deletes)
+    batch_size = int(os.environ.get('bulk_batch_size', 500))
+    max_bytes = int(os.environ.get('bulk_max_bytes', 5 * 1024 * 1024))
+    incremental = os.environ.get('incremental', 'False')
+    CatalogIndexerTask.index_objects(
+        engine=ENGINE, with_deletes=with_deletes, batch_size=batch_size, max_bytes=max_bytes, incremental=incremental
+    )
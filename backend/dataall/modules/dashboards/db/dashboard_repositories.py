@@ -3,7 +3,9 @@ import logging
 from sqlalchemy import or_, and_
 from sqlalchemy.orm import Query
 
+from dataall.core.environment.db.environment_models import Environment
 from dataall.core.environment.services.environment_resource_manager import EnvironmentResource
+from dataall.core.organizations.db.organization_models import Organization
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.base.db import exceptions, paginate
 from dataall.modules.dashboards.db.dashboard_models import DashboardShare, DashboardShareStatus, Dashboard
@@ -49,6 +51,25 @@ class DashboardRepository(EnvironmentResource):
             raise exceptions.ObjectNotFound('Dashboard', uri)
         return dashboard
 
+    @staticmethod
+    def list_dashboards_changed_since(session, since, uris=()) -> [Dashboard]:
+        """Dashboards updated since the given time, directly or through their environment or organization"""
+        return (
+            session.query(Dashboard)
+            .join(Environment, Environment.environmentUri == Dashboard.environmentUri)
+            .join(Organization, Organization.organizationUri == Environment.organizationUri)
+            .filter(
+                or_(
+                    Dashboard.created >= since,
+                    Dashboard.updated >= since,
+                    Environment.updated >= since,
+                    Organization.updated >= since,
+                    Dashboard.dashboardUri.in_(uris),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def _query_user_dashboards(session, username, groups, filter) -> Query:
         query = (
@@ -1,9 +1,13 @@
 import logging
 
+from datetime import datetime
 from typing import List
 
+from dataall.modules.catalog.db.catalog_indexer_repositories import CatalogIndexerRepository
 from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
 from dataall.modules.dashboards.db.dashboard_models import Dashboard
+from dataall.modules.dashboards.db.dashboard_repositories import DashboardRepository
+from dataall.modules.vote.db.vote_repositories import VoteRepository
 from dataall.modules.dashboards.indexers.dashboard_indexer import DashboardIndexer
 
 log = logging.getLogger(__name__)
@@ -21,3 +25,13 @@ class DashboardCatalogIndexer(CatalogIndexer):
             DashboardIndexer.upsert(session=session, dashboard_uri=dashboard.dashboardUri)
 
         return all_dashboard_uris
+
+    def index_changes(self, session, since: datetime) -> List[str]:
+        changed_uris = CatalogIndexerRepository.list_glossary_targets_changed_since(session, since)
+        changed_uris |= VoteRepository.list_targets_voted_since(session, since, target_type='dashboard')
+        dashboards = DashboardRepository.list_dashboards_changed_since(session, since, changed_uris)
+
+        log.info(f'Found {len(dashboards)} dashboards changed since {since}')
+        for dashboard in dashboards:
+            DashboardIndexer.upsert(session=session, dashboard_uri=dashboard.dashboardUri)
+        return [dashboard.dashboardUri for dashboard in dashboards]
@@ -70,5 +70,6 @@ DatasetBaseSearchResult = gql.ObjectType(
         gql.Field(name='previousPage', type=gql.Integer),
         gql.Field(name='hasNext', type=gql.Boolean),
         gql.Field(name='hasPrevious', type=gql.Boolean),
+        gql.Field(name='nextCursor', type=gql.String),
     ],
 )
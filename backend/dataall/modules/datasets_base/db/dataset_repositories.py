@@ -3,6 +3,7 @@ from typing import List
 from sqlalchemy import and_, or_
 from sqlalchemy.orm import Query
 from dataall.base.db import paginate
+from dataall.base.db.paginator import paginate_keyset
 from dataall.base.db.exceptions import ObjectNotFound
 from dataall.core.activity.db.activity_models import Activity
 from dataall.modules.datasets_base.db.dataset_models import DatasetBase
@@ -37,17 +38,31 @@ class DatasetBaseRepository:
             raise ObjectNotFound('Dataset', dataset_uri)
         return dataset
 
+    @staticmethod
+    def find_datasets_by_uris(session, dataset_uris: List[str]) -> List[DatasetBase]:
+        return session.query(DatasetBase).filter(DatasetBase.datasetUri.in_(dataset_uris)).all()
+
 
 class DatasetListRepository:
     """DAO layer for Listing Datasets in Environments"""
 
+    @staticmethod
+    def paginate_datasets(query, data, dataset_model=DatasetBase) -> dict:
+        """Pages of datasets, with keyset pagination on (label, datasetUri) when the filter contains a cursor"""
+        if data and 'cursor' in data:
+            return paginate_keyset(
+                query,
+                order_by=[dataset_model.label, dataset_model.datasetUri],
+                page_size=data.get('pageSize', 10),
+                cursor=data['cursor'],
+            ).to_dict()
+        return paginate(query=query, page=data.get('page', 1), page_size=data.get('pageSize', 10)).to_dict()
+
     @staticmethod
     def paginated_all_user_datasets(session, username, groups, all_subqueries: List[Query], data=None) -> dict:
-        return paginate(
-            query=DatasetListRepository._query_all_user_datasets(session, username, groups, all_subqueries, data),
-            page=data.get('page', 1),
-            page_size=data.get('pageSize', 10),
-        ).to_dict()
+        return DatasetListRepository.paginate_datasets(
+            DatasetListRepository._query_all_user_datasets(session, username, groups, all_subqueries, data), data
+        )
 
     @staticmethod
     def _query_all_user_datasets(session, username, groups, all_subqueries: List[Query], filter: dict = None) -> Query:
@@ -80,11 +95,9 @@ class DatasetListRepository:
 
     @staticmethod
     def paginated_user_datasets(session, username, groups, data=None) -> dict:
-        return paginate(
-            query=DatasetListRepository._query_user_datasets(session, username, groups, data),
-            page=data.get('page', 1),
-            page_size=data.get('pageSize', 10),
-        ).to_dict()
+        return DatasetListRepository.paginate_datasets(
+            DatasetListRepository._query_user_datasets(session, username, groups, data), data
+        )
 
     @staticmethod
     def _query_user_datasets(session, username, groups, filter) -> Query:
@@ -114,11 +127,9 @@ class DatasetListRepository:
         uri,
         data=None,
     ) -> dict:
-        return paginate(
-            query=DatasetListRepository.query_datasets(session, data, environmentUri=uri),
-            page=data.get('page', 1),
-            page_size=data.get('pageSize', 10),
-        ).to_dict()
+        return DatasetListRepository.paginate_datasets(
+            DatasetListRepository.query_datasets(session, data, environmentUri=uri), data
+        )
 
     @staticmethod
     def query_datasets(session, filter=None, organizationUri=None, environmentUri=None) -> Query:
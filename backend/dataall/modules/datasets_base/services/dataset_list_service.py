@@ -1,10 +1,14 @@
 import logging
 from sqlalchemy.orm import Query
 from typing import List
+from dataall.base.api.dataloader import DataLoader, get_dataloader
 from dataall.base.context import get_context
+from dataall.core.environment.services.environment_service import EnvironmentService
+from dataall.core.organizations.services.organization_service import OrganizationService
 from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
+from dataall.core.stacks.services.stack_service import StackService
 from dataall.modules.datasets_base.services.dataset_service_interface import DatasetServiceInterface
-from dataall.modules.datasets_base.db.dataset_repositories import DatasetListRepository
+from dataall.modules.datasets_base.db.dataset_repositories import DatasetBaseRepository, DatasetListRepository
 from dataall.modules.datasets_base.services.dataset_list_permissions import LIST_ENVIRONMENT_DATASETS
 
 log = logging.getLogger(__name__)
@@ -43,22 +47,46 @@ class DatasetListService:
             all_subqueries = DatasetListService._list_all_user_interface_datasets(
                 session, context.username, context.groups
             )
-            return DatasetListRepository.paginated_all_user_datasets(
+            page = DatasetListRepository.paginated_all_user_datasets(
                 session, context.username, context.groups, all_subqueries, data=data
             )
+            return DatasetListService.prefetch_nested_fields(session, context.groups, page)
 
     @staticmethod
     def list_owned_datasets(data: dict):
         context = get_context()
         with context.db_engine.scoped_session() as session:
-            return DatasetListRepository.paginated_user_datasets(session, context.username, context.groups, data=data)
+            page = DatasetListRepository.paginated_user_datasets(session, context.username, context.groups, data=data)
+            return DatasetListService.prefetch_nested_fields(session, context.groups, page)
+
+    @staticmethod
+    def dataset_loader() -> DataLoader:
+        """Batches the dataset lookups of the field resolvers of the current request"""
+        return get_dataloader(
+            'dataset', DatasetBaseRepository.find_datasets_by_uris, key=lambda dataset: dataset.datasetUri
+        )
+
+    @staticmethod
+    def prefetch_nested_fields(session, groups, page: dict) -> dict:
+        """
+        Loads the permissions of the listed datasets in one query for the permission checks of their nested fields
+        and primes the loaders of their environment, organization and stack
+        """
+        datasets = page['nodes']
+        ResourcePolicyService.get_user_resources_permissions(session, groups, [d.datasetUri for d in datasets])
+        EnvironmentService.environment_loader().prime(d.environmentUri for d in datasets)
+        OrganizationService.organization_loader().prime(d.organizationUri for d in datasets)
+        StackService.stack_loader().prime(d.datasetUri for d in datasets)
+        return page
 
     @staticmethod
     @ResourcePolicyService.has_resource_permission(LIST_ENVIRONMENT_DATASETS)
     def list_datasets_created_in_environment(uri: str, data: dict):
-        with get_context().db_engine.scoped_session() as session:
-            return DatasetListRepository.paginated_environment_datasets(
+        context = get_context()
+        with context.db_engine.scoped_session() as session:
+            page = DatasetListRepository.paginated_environment_datasets(
                 session=session,
                 uri=uri,
                 data=data,
             )
+            return DatasetListService.prefetch_nested_fields(session, context.groups, page)
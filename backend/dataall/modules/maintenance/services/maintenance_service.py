@@ -18,6 +18,9 @@ logger = logging.getLogger(__name__)
 
 
 class MaintenanceService:
+    # incremented when this process changes the maintenance window, so that cached maintenance states are reloaded
+    state_version = 0
+
     @staticmethod
     def start_maintenance_window(mode: str = None):
         """
@@ -48,6 +51,7 @@ class MaintenanceService:
                 MaintenanceRepository(session).save_maintenance_status_and_mode(
                     maintenance_status=MaintenanceStatus.PENDING.value, maintenance_mode=mode
                 )
+                MaintenanceService.state_version += 1
             # Disable scheduled ECS tasks
             # Get all the SSM Params related to the scheduled tasks
             ecs_scheduled_rules_list = MaintenanceService._get_ecs_rules()
@@ -83,6 +87,7 @@ class MaintenanceService:
                 MaintenanceRepository(session).save_maintenance_status_and_mode(
                     maintenance_status=MaintenanceStatus.INACTIVE.value, maintenance_mode=''
                 )
+                MaintenanceService.state_version += 1
             # Enable scheduled ECS tasks
             ecs_scheduled_rules_list = MaintenanceService._get_ecs_rules()
             event_bridge = EventBridge(region=os.getenv('AWS_REGION', 'eu-west-1'))
@@ -118,6 +123,7 @@ class MaintenanceService:
                         )
                         maintenance_record.status = MaintenanceStatus.ACTIVE.value
                         session.commit()
+                        MaintenanceService.state_version += 1
                         return maintenance_record
                 else:
                     logger.info(f'Current maintenance window status - {maintenance_record.status}')
@@ -6,7 +6,7 @@ from dataall.base.utils.expiration_util import Expiration
 from dataall.core.stacks.services.stack_service import StackService
 from dataall.modules.catalog.db.glossary_repositories import GlossaryRepository
 from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
+from dataall.core.organizations.services.organization_service import OrganizationService
 from dataall.base.db.exceptions import RequiredParameter, InvalidInput
 from dataall.modules.s3_datasets.db.dataset_models import S3Dataset
 from dataall.modules.datasets_base.services.datasets_enums import DatasetRole, ConfidentialityClassification
@@ -81,8 +81,7 @@ def list_tables(context, source: S3Dataset, filter: dict = None):
 def get_dataset_organization(context, source: S3Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return OrganizationRepository.get_organization_by_uri(session, source.organizationUri)
+    return OrganizationService.get_organization_simplified(source.organizationUri)
 
 
 def get_dataset_environment_simplified(context, source: S3Dataset, **kwargs):
@@ -81,6 +81,7 @@ DatasetTableSearchResult = gql.ObjectType(
         gql.Field(name='page', type=gql.Integer),
         gql.Field(name='hasNext', type=gql.Boolean),
         gql.Field(name='hasPrevious', type=gql.Boolean),
+        gql.Field(name='nextCursor', type=gql.String),
     ],
 )
 
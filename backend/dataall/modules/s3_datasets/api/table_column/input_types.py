@@ -6,6 +6,7 @@ DatasetTableColumnFilter = gql.InputType(
         gql.Argument('term', gql.String),
         gql.Argument('page', gql.Integer),
         gql.Argument('pageSize', gql.Integer),
+        gql.Argument('cursor', gql.String),
     ],
 )
 
@@ -1,5 +1,9 @@
 import json
 import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
 from pyathena import connect
 
 from botocore.exceptions import ClientError
@@ -11,38 +15,78 @@ from dataall.base.utils import json_utils, sql_utils
 
 log = logging.getLogger(__name__)
 
+PREVIEW_LIMIT = 50
+PREVIEW_CACHE_TTL = timedelta(hours=1)
+
 
 class AthenaTableClient:
+    """
+    Previews tables with Athena. Previews read a sample of the latest partition (or the first rows of
+    unpartitioned tables) instead of sorting the whole table, and can be cached in the environment bucket
+    for PREVIEW_CACHE_TTL, keyed by the schema version of the table.
+    """
+
+    # pyathena connections and resolved work groups, reused across previews of the same process
+    _connections = {}
+    _work_groups = {}
+    _MAX_CONNECTIONS = 32
+    _lock = threading.Lock()
+
     def __init__(self, env: Environment, table: DatasetTable):
         session = SessionHelper.remote_session(accountid=table.AWSAccountId, region=table.region)
 
         self._client = session.client('athena', region_name=env.region)
+        self._s3 = session.client('s3', region_name=env.region)
         self._creds = session.get_credentials()
         self._env = env
         self._table = table
 
-    def get_table(self):
+    def get_table(self, partitions: Optional[List[str]] = None, cache_version: Optional[str] = None):
+        """
+        Returns a sample of the rows of the table
+        :param partitions: the partition keys of the table, the rows are read from its latest partition
+        :param cache_version: version of the table schema the cached preview must match, no caching if None
+        """
+        if cache_version:
+            preview = self._read_cached_preview(cache_version)
+            if preview:
+                return preview
+
+        preview = self._run_preview(partitions or [])
+        if cache_version:
+            self._write_cached_preview(cache_version, preview)
+        return preview
+
+    def delete_cached_previews(self):
+        """Deletes the cached previews of the table, e.g. after its schema changed"""
+        prefix = f'{self._preview_prefix()}/cache/'
         try:
-            env_workgroup = self._client.get_work_group(WorkGroup=self._env.EnvironmentDefaultAthenaWorkGroup)
+            response = self._s3.list_objects_v2(Bucket=self._env.EnvironmentDefaultBucketName, Prefix=prefix)
+            keys = [{'Key': item['Key']} for item in response.get('Contents', [])]
+            if keys:
+                self._s3.delete_objects(Bucket=self._env.EnvironmentDefaultBucketName, Delete={'Objects': keys})
         except ClientError as e:
-            log.info(f'Workgroup {self._env.EnvironmentDefaultAthenaWorkGroup} can not be found due to: {e}')
-
-        connection = connect(
-            aws_access_key_id=self._creds.access_key,
-            aws_secret_access_key=self._creds.secret_key,
-            aws_session_token=self._creds.token,
-            work_group=env_workgroup.get('WorkGroup', {}).get('Name', 'primary'),
-            s3_staging_dir=f's3://{self._env.EnvironmentDefaultBucketName}/preview/{self._table.datasetUri}/{self._table.tableUri}',
-            region_name=self._table.region,
-        )
-        cursor = connection.cursor()
+            log.warning(f'Failed to delete cached previews of table {self._table.tableUri}: {e}')
 
-        sql = 'select * from {table_identifier} order by rand() limit 50'.format(
-            table_identifier=sql_utils.Identifier(self._table.GlueDatabaseName, self._table.GlueTableName)
+    def _run_preview(self, partitions: List[str]):
+        cursor = self._connection().cursor(
+            s3_staging_dir=f's3://{self._env.EnvironmentDefaultBucketName}/{self._preview_prefix()}'
+        )
+        table_identifier = sql_utils.Identifier(self._table.GlueDatabaseName, self._table.GlueTableName)
+        sql = 'select * from {table_identifier} limit {limit}'.format(
+            table_identifier=table_identifier, limit=PREVIEW_LIMIT
         )
-        cursor.execute(sql)  # nosemgrep
         # it is not possible to build the query string with the table.X parameters using Pyathena connect
         # to remediate sql injections we built the Identifier class that removes any malicious code from the string
+        if partitions:
+            try:
+                cursor.execute(self._latest_partition_sql(table_identifier, partitions))  # nosemgrep
+            except Exception as e:
+                log.info(f'Failed to preview the latest partition of {table_identifier}, reading any rows: {e}')
+                cursor.execute(sql)  # nosemgrep
+        else:
+            cursor.execute(sql)  # nosemgrep
+
         fields = []
         for f in cursor.description:
             fields.append(json.dumps({'name': f[0]}))
@@ -51,3 +95,72 @@ class AthenaTableClient:
             rows.append(json.dumps(json_utils.to_json(list(row))))
 
         return {'rows': rows, 'fields': fields}
+
+    def _latest_partition_sql(self, table_identifier, partitions: List[str]) -> str:
+        # the identifiers are validated by sql_utils.Identifier, $partitions is the Athena partitions metadata table
+        columns = sql_utils.Identifier(*partitions).identifiers
+        partitions_table = f'{self._table.GlueDatabaseName}."{self._table.GlueTableName}$partitions"'
+        return (
+            f'select t.* from {table_identifier} t join ('
+            f'select {", ".join(columns)} from {partitions_table} '
+            f'order by {", ".join(f"{c} desc" for c in columns)} limit 1'
+            f') latest on {" and ".join(f"t.{c} = latest.{c}" for c in columns)} '
+            f'limit {PREVIEW_LIMIT}'
+        )
+
+    def _connection(self):
+        work_group = self._work_group()
+        key = (self._creds.access_key, self._creds.token, work_group, self._table.region)
+        with AthenaTableClient._lock:
+            connection = AthenaTableClient._connections.get(key)
+            if connection is None:
+                if len(AthenaTableClient._connections) >= AthenaTableClient._MAX_CONNECTIONS:
+                    AthenaTableClient._connections.clear()
+                connection = connect(
+                    aws_access_key_id=self._creds.access_key,
+                    aws_secret_access_key=self._creds.secret_key,
+                    aws_session_token=self._creds.token,
+                    work_group=work_group,
+                    region_name=self._table.region,
+                )
+                AthenaTableClient._connections[key] = connection
+            return connection
+
+    def _work_group(self) -> str:
+        key = (self._table.AWSAccountId, self._env.region, self._env.EnvironmentDefaultAthenaWorkGroup)
+        if key not in AthenaTableClient._work_groups:
+            try:
+                env_workgroup = self._client.get_work_group(WorkGroup=self._env.EnvironmentDefaultAthenaWorkGroup)
+                AthenaTableClient._work_groups[key] = env_workgroup.get('WorkGroup', {}).get('Name', 'primary')
+            except ClientError as e:
+                log.info(f'Workgroup {self._env.EnvironmentDefaultAthenaWorkGroup} can not be found due to: {e}')
+                return 'primary'
+        return AthenaTableClient._work_groups[key]
+
+    def _preview_prefix(self) -> str:
+        return f'preview/{self._table.datasetUri}/{self._table.tableUri}'
+
+    def _cache_key(self, version) -> str:
+        return f'{self._preview_prefix()}/cache/{version}.json'
+
+    def _read_cached_preview(self, version):
+        try:
+            response = self._s3.get_object(Bucket=self._env.EnvironmentDefaultBucketName, Key=self._cache_key(version))
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                log.warning(f'Failed to read the cached preview of table {self._table.tableUri}: {e}')
+            return None
+        if response['LastModified'] < datetime.now(timezone.utc) - PREVIEW_CACHE_TTL:
+            return None
+        return json.loads(response['Body'].read())
+
+    def _write_cached_preview(self, version, preview):
+        try:
+            self._s3.put_object(
+                Bucket=self._env.EnvironmentDefaultBucketName,
+                Key=self._cache_key(version),
+                Body=json.dumps(preview),
+                ContentType='application/json',
+            )
+        except ClientError as e:
+            log.warning(f'Failed to cache the preview of table {self._table.tableUri}: {e}')
@@ -3,10 +3,7 @@ import os
 
 from dataall.base.aws.sts import SessionHelper
 from typing import List, Optional
-from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel
-from langchain_aws import ChatBedrockConverse
-from langchain_core.output_parsers import JsonOutputParser
 
 log = logging.getLogger(__name__)
 
@@ -29,7 +26,14 @@ class MetadataOutput(BaseModel):
 
 
 class BedrockClient:
+    """
+    Generates metadata with Bedrock models.
+    langchain takes seconds to import, it is imported on first use rather than when the API Lambda starts
+    """
+
     def __init__(self):
+        from langchain_aws import ChatBedrockConverse
+
         session = SessionHelper.get_session()
         self._client = session.client('bedrock-runtime', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
         model_id = 'eu.anthropic.claude-3-5-sonnet-20240620-v1:0'
@@ -43,9 +47,7 @@ class BedrockClient:
 
     def invoke_model_dataset_metadata(self, metadata_types, dataset, tables, folders):
         try:
-            prompt_template = PromptTemplate.from_file(METADATA_GENERATION_DATASET_TEMPLATE_PATH)
-            parser = JsonOutputParser(pydantic_object=MetadataOutput)
-            chain = prompt_template | self._model | parser
+            chain = self._chain(METADATA_GENERATION_DATASET_TEMPLATE_PATH)
             context = {
                 'metadata_types': metadata_types,
                 'dataset_label': dataset.label,
@@ -62,9 +64,7 @@ class BedrockClient:
 
     def invoke_model_table_metadata(self, metadata_types, table, columns, sample_data):
         try:
-            prompt_template = PromptTemplate.from_file(METADATA_GENERATION_TABLE_TEMPLATE_PATH)
-            parser = JsonOutputParser(pydantic_object=MetadataOutput)
-            chain = prompt_template | self._model | parser
+            chain = self._chain(METADATA_GENERATION_TABLE_TEMPLATE_PATH)
 
             context = {
                 'metadata_types': metadata_types,
@@ -81,9 +81,7 @@ class BedrockClient:
 
     def invoke_model_folder_metadata(self, metadata_types, folder, files):
         try:
-            prompt_template = PromptTemplate.from_file(METADATA_GENERATION_FOLDER_TEMPLATE_PATH)
-            parser = JsonOutputParser(pydantic_object=MetadataOutput)
-            chain = prompt_template | self._model | parser
+            chain = self._chain(METADATA_GENERATION_FOLDER_TEMPLATE_PATH)
             context = {
                 'metadata_types': metadata_types,
                 'label': folder.label,
@@ -94,3 +92,11 @@ class BedrockClient:
             return chain.invoke(context)
         except Exception as e:
             raise e
+
+    def _chain(self, template_path):
+        from langchain_core.output_parsers import JsonOutputParser
+        from langchain_core.prompts import PromptTemplate
+
+        prompt_template = PromptTemplate.from_file(template_path)
+        parser = JsonOutputParser(pydantic_object=MetadataOutput)
+        return prompt_template | self._model | parser
@@ -6,6 +6,9 @@ from dataall.modules.s3_datasets.db.dataset_models import DatasetTable
 
 log = logging.getLogger(__name__)
 
+# maximum number of entries of a BatchGrantPermissions request
+BATCH_GRANT_SIZE = 20
+
 
 class LakeFormationTableClient:
     """Requests to AWS LakeFormation"""
@@ -39,6 +42,51 @@ class LakeFormationTableClient:
             except ClientError:
                 pass  # ignore the error to continue with other requests
 
+    @staticmethod
+    def grant_principals_all_tables_permissions(tables: [DatasetTable], principals: [str], aws_session=None):
+        """
+        Same as grant_principals_all_table_permissions for several tables of the same Glue database,
+        using BatchGrantPermissions requests of up to BATCH_GRANT_SIZE entries
+        :param tables: tables of the same AWS account and region
+        :param principals:
+        :return: the number of failed grants
+        """
+        if not tables:
+            return 0
+        first = tables[0]
+        if not aws_session:
+            aws_session = SessionHelper.remote_session(first.AWSAccountId, first.region)
+        client = aws_session.client('lakeformation', region_name=first.region)
+
+        entries = [
+            {
+                'Id': str(index),
+                'Principal': {'DataLakePrincipalIdentifier': principal},
+                'Resource': {'Table': {'DatabaseName': table.GlueDatabaseName, 'Name': table.name}},
+                'Permissions': ['ALL'],
+            }
+            for index, (table, principal) in enumerate((t, p) for t in tables for p in principals)
+        ]
+        failed = 0
+        for start in range(0, len(entries), BATCH_GRANT_SIZE):
+            batch = entries[start : start + BATCH_GRANT_SIZE]
+            try:
+                failures = client.batch_grant_permissions(Entries=batch).get('Failures', [])
+            except ClientError as e:
+                log.error(
+                    f'Failed to grant table permissions on aws://{first.AWSAccountId}/{first.GlueDatabaseName}: {e}'
+                )
+                failed += len(batch)
+                continue
+            for failure in failures:
+                entry = failure.get('RequestEntry', {})
+                log.error(
+                    f'Failed to grant all table permissions on {entry.get("Resource")} '
+                    f'to {entry.get("Principal")}: {failure.get("Error")}'
+                )
+            failed += len(failures)
+        return failed
+
     def _grant_permissions_to_table(self, principal, permissions):
         table = self._table
         try:
@@ -1,6 +1,7 @@
 from operator import or_
 from sqlalchemy.orm import Query
 from dataall.base.db import paginate
+from dataall.base.db.paginator import paginate_keyset
 from dataall.base.db.exceptions import ObjectNotFound
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTableColumn
 
@@ -45,6 +46,13 @@ class DatasetColumnRepository:
                 )
             ).order_by(DatasetTableColumn.columnType.asc())
 
+        if 'cursor' in filter:
+            return paginate_keyset(
+                query=q,
+                order_by=[DatasetTableColumn.columnType.asc(), DatasetTableColumn.columnUri.asc()],
+                page_size=filter.get('pageSize', 10),
+                cursor=filter['cursor'],
+            ).to_dict()
         return paginate(query=q, page=filter.get('page', 1), page_size=filter.get('pageSize', 10)).to_dict()
 
     @staticmethod
@@ -1,6 +1,6 @@
 import logging
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 
 from dataall.base.db import paginate, exceptions
 from dataall.modules.s3_datasets.db.dataset_models import DatasetStorageLocation, S3Dataset
@@ -89,6 +89,15 @@ class DatasetLocationRepository:
     def count_dataset_locations(session, dataset_uri):
         return session.query(DatasetStorageLocation).filter(DatasetStorageLocation.datasetUri == dataset_uri).count()
 
+    @staticmethod
+    def count_locations_by_dataset(session, dataset_uris) -> dict:
+        query = (
+            session.query(DatasetStorageLocation.datasetUri, func.count(DatasetStorageLocation.locationUri))
+            .filter(DatasetStorageLocation.datasetUri.in_(dataset_uris))
+            .group_by(DatasetStorageLocation.datasetUri)
+        )
+        return dict(query.all())
+
     @staticmethod
     def delete_dataset_locations(session, dataset_uri) -> bool:
         locations = session.query(DatasetStorageLocation).filter(DatasetStorageLocation.datasetUri == dataset_uri).all()
@@ -104,6 +113,20 @@ class DatasetLocationRepository:
             query = query.limit(limit)
         return query.all()
 
+    @staticmethod
+    def get_folders_changed_since(session, since, uris=()):
+        return (
+            session.query(DatasetStorageLocation)
+            .filter(
+                or_(
+                    DatasetStorageLocation.created >= since,
+                    DatasetStorageLocation.updated >= since,
+                    DatasetStorageLocation.locationUri.in_(uris),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def paginated_dataset_locations(session, uri, data=None) -> dict:
         query = session.query(DatasetStorageLocation).filter(DatasetStorageLocation.datasetUri == uri)
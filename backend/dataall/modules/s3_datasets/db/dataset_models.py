@@ -84,6 +84,8 @@ class DatasetTable(Resource, Base):
     GlueTableConfig = Column(Text)
     GlueTableProperties = Column(JSON, default={})
     LastGlueTableStatus = Column(String, default='InSync')
+    # VersionId and UpdateTime of the Glue table at the last columns sync
+    GlueTableVersion = Column(String, nullable=True)
     region = Column(String, default='eu-west-1')
     # LastGeneratedPreviewDate= Column(DateTime, default=None)
     confidentiality = Column(String, nullable=True)
@@ -136,6 +138,8 @@ class S3Dataset(DatasetBase):
     importedGlueDatabase = Column(Boolean, default=False)
     importedKmsKey = Column(Boolean, default=False)
     importedAdminRole = Column(Boolean, default=False)
+    # version of the Glue database tables at the last tables sync, see tables_syncer
+    GlueTablesVersion = Column(String, nullable=True)
 
     __mapper_args__ = {
         'polymorphic_identity': DatasetTypes.S3,
@@ -5,10 +5,13 @@ from sqlalchemy import and_, or_, literal
 from sqlalchemy.orm import Query
 from dataall.core.activity.db.activity_models import Activity
 from dataall.core.environment.db.environment_models import Environment
+from dataall.core.organizations.db.organization_models import Organization
 from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.base.db import paginate
+from dataall.base.db.paginator import paginate_keyset
 from dataall.base.db.exceptions import ObjectNotFound
 from dataall.modules.datasets_base.services.datasets_enums import ConfidentialityClassification, Language
+from dataall.modules.datasets_base.db.dataset_repositories import DatasetListRepository
 from dataall.core.environment.services.environment_resource_manager import EnvironmentResource
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTable, S3Dataset, DatasetStorageLocation
 from dataall.base.utils.naming_convention import (
@@ -166,6 +169,13 @@ class DatasetRepository(EnvironmentResource):
                     ]
                 )
             )
+        if 'cursor' in data:
+            return paginate_keyset(
+                query=query,
+                order_by=[DatasetTable.created.desc(), DatasetTable.tableUri.desc()],
+                page_size=data.get('pageSize', 10),
+                cursor=data['cursor'],
+            ).to_dict()
         return paginate(query=query, page_size=data.get('pageSize', 10), page=data.get('page', 1)).to_dict()
 
     @staticmethod
@@ -206,6 +216,28 @@ class DatasetRepository(EnvironmentResource):
     def list_all_active_datasets(session) -> [S3Dataset]:
         return session.query(S3Dataset).filter(S3Dataset.deleted.is_(None)).all()
 
+    @staticmethod
+    def list_active_datasets_changed_since(session, since, uris=()) -> [S3Dataset]:
+        """Active datasets updated since the given time, directly or through their environment or organization"""
+        return (
+            session.query(S3Dataset)
+            .join(Environment, Environment.environmentUri == S3Dataset.environmentUri)
+            .join(Organization, Organization.organizationUri == S3Dataset.organizationUri)
+            .filter(
+                and_(
+                    S3Dataset.deleted.is_(None),
+                    or_(
+                        S3Dataset.created >= since,
+                        S3Dataset.updated >= since,
+                        Environment.updated >= since,
+                        Organization.updated >= since,
+                        S3Dataset.datasetUri.in_(uris),
+                    ),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def list_all_active_datasets_with_glue_db(session, glue_db_name: str) -> [S3Dataset]:
         # List all the S3 datasets which have the same glue db name ( irrespective of the environment )
@@ -226,6 +258,26 @@ class DatasetRepository(EnvironmentResource):
     def count_dataset_tables(session, dataset_uri):
         return session.query(DatasetTable).filter(DatasetTable.datasetUri == dataset_uri).count()
 
+    @staticmethod
+    def count_tables_by_dataset(session, dataset_uris) -> dict:
+        query = (
+            session.query(DatasetTable.datasetUri, sqlalchemy.func.count(DatasetTable.tableUri))
+            .filter(DatasetTable.datasetUri.in_(dataset_uris))
+            .group_by(DatasetTable.datasetUri)
+        )
+        return dict(query.all())
+
+    @staticmethod
+    def list_datasets_with_environment_and_organization(session, dataset_uris):
+        """Returns (dataset, environment, organization) rows of the datasets with one query"""
+        return (
+            session.query(S3Dataset, Environment, Organization)
+            .join(Environment, Environment.environmentUri == S3Dataset.environmentUri)
+            .join(Organization, Organization.organizationUri == S3Dataset.organizationUri)
+            .filter(S3Dataset.datasetUri.in_(dataset_uris))
+            .all()
+        )
+
     @staticmethod
     def query_environment_group_datasets(session, env_uri, group_uri, filter) -> Query:
         query = session.query(S3Dataset).filter(
@@ -270,11 +322,9 @@ class DatasetRepository(EnvironmentResource):
 
     @staticmethod
     def paginated_environment_group_datasets(session, env_uri, group_uri, data=None) -> dict:
-        return paginate(
-            query=DatasetRepository.query_environment_group_datasets(session, env_uri, group_uri, data),
-            page=data.get('page', 1),
-            page_size=data.get('pageSize', 10),
-        ).to_dict()
+        return DatasetListRepository.paginate_datasets(
+            DatasetRepository.query_environment_group_datasets(session, env_uri, group_uri, data), data, S3Dataset
+        )
 
     @staticmethod
     def list_group_datasets(session, environment_id, group_uri):
@@ -2,7 +2,8 @@ import logging
 from datetime import datetime
 from typing import List
 
-from sqlalchemy.sql import and_
+from sqlalchemy import insert, update
+from sqlalchemy.sql import and_, or_
 
 from dataall.base.db import exceptions
 from dataall.core.activity.db.activity_models import Activity
@@ -26,24 +27,30 @@ class DatasetTableRepository:
         session.add(table)
 
     @staticmethod
-    def create_synced_table(session, dataset: S3Dataset, table: dict):
-        updated_table = DatasetTable(
-            datasetUri=dataset.datasetUri,
-            label=table['Name'],
-            name=table['Name'],
-            region=dataset.region,
-            owner=dataset.owner,
-            GlueDatabaseName=dataset.GlueDatabaseName,
-            AWSAccountId=dataset.AwsAccountId,
-            S3BucketName=dataset.S3BucketName,
-            S3Prefix=table.get('StorageDescriptor', {}).get('Location'),
-            GlueTableName=table['Name'],
-            LastGlueTableStatus='InSync',
-            GlueTableProperties=json_utils.to_json(table.get('Parameters', {})),
-        )
-        session.add(updated_table)
-        session.commit()
-        return updated_table
+    def create_synced_tables(session, dataset: S3Dataset, tables: List[dict]) -> List[DatasetTable]:
+        """Inserts the tables of the Glue tables with a single multi-row insert"""
+        if not tables:
+            return []
+        return session.scalars(
+            insert(DatasetTable).returning(DatasetTable),
+            [
+                {
+                    'datasetUri': dataset.datasetUri,
+                    'label': table['Name'],
+                    'name': table['Name'],
+                    'region': dataset.region,
+                    'owner': dataset.owner,
+                    'GlueDatabaseName': dataset.GlueDatabaseName,
+                    'AWSAccountId': dataset.AwsAccountId,
+                    'S3BucketName': dataset.S3BucketName,
+                    'S3Prefix': table.get('StorageDescriptor', {}).get('Location'),
+                    'GlueTableName': table['Name'],
+                    'LastGlueTableStatus': 'InSync',
+                    'GlueTableProperties': json_utils.to_json(table.get('Parameters', {})),
+                }
+                for table in tables
+            ],
+        ).all()
 
     @staticmethod
     def delete(session, table: DatasetTable):
@@ -102,6 +109,23 @@ class DatasetTableRepository:
                     f'Updating Existing Table {existing_table.GlueTableName} status set to InSync from Deleted after found in Glue'
                 )
 
+    @staticmethod
+    def find_active_tables_changed_since(session, since, uris=()):
+        return (
+            session.query(DatasetTable)
+            .filter(
+                and_(
+                    DatasetTable.LastGlueTableStatus != 'Deleted',
+                    or_(
+                        DatasetTable.created >= since,
+                        DatasetTable.updated >= since,
+                        DatasetTable.tableUri.in_(uris),
+                    ),
+                )
+            )
+            .all()
+        )
+
     @staticmethod
     def find_all_active_tables(session, dataset_uri):
         return (
@@ -129,46 +153,96 @@ class DatasetTableRepository:
         )
 
     @staticmethod
-    def sync_table_columns(session, dataset_table, glue_table):
-        DatasetTableRepository.delete_all_table_columns(session, dataset_table)
-
-        columns = [
-            {**item, **{'columnType': 'column'}} for item in glue_table.get('StorageDescriptor', {}).get('Columns', [])
-        ]
+    def glue_table_columns(glue_table):
+        """Returns the (name, type, column type) of the columns and partitions of a Glue table"""
+        columns = [(c['Name'], c['Type'], 'column') for c in glue_table.get('StorageDescriptor', {}).get('Columns', [])]
         partitions = [
-            {**item, **{'columnType': f'partition_{index}'}}
-            for index, item in enumerate(glue_table.get('PartitionKeys', []))
+            (c['Name'], c['Type'], f'partition_{index}') for index, c in enumerate(glue_table.get('PartitionKeys', []))
         ]
+        return columns + partitions
 
-        logger.debug(f'Found columns {columns} for table {dataset_table}')
-        logger.debug(f'Found partitions {partitions} for table {dataset_table}')
-
-        for col in columns + partitions:
-            table_col = DatasetTableColumn(
-                name=col['Name'],
-                description=col.get('Comment', 'No description provided'),
-                label=col['Name'],
-                owner=dataset_table.owner,
-                datasetUri=dataset_table.datasetUri,
-                tableUri=dataset_table.tableUri,
-                AWSAccountId=dataset_table.AWSAccountId,
-                GlueDatabaseName=dataset_table.GlueDatabaseName,
-                GlueTableName=dataset_table.GlueTableName,
-                region=dataset_table.region,
-                typeName=col['Type'],
-                columnType=col['columnType'],
-            )
-            session.add(table_col)
+    @staticmethod
+    def glue_table_version(glue_table):
+        """Returns the version of a Glue table, which changes whenever the table is updated, or None if unknown"""
+        if not glue_table.get('VersionId') and not glue_table.get('UpdateTime'):
+            return None
+        return f'{glue_table.get("VersionId")}:{glue_table.get("UpdateTime")}'
 
     @staticmethod
-    def delete_all_table_columns(session, dataset_table):
-        session.query(DatasetTableColumn).filter(
-            and_(
-                DatasetTableColumn.GlueDatabaseName == dataset_table.GlueDatabaseName,
-                DatasetTableColumn.GlueTableName == dataset_table.GlueTableName,
+    def sync_table_columns(session, dataset_table, glue_table):
+        """
+        Reconciles the columns of the table with the columns and partitions of the Glue table, keyed by
+        (name, columnType): new columns are inserted, changed columns updated and missing columns soft-deleted,
+        so that the uris and descriptions of the unchanged columns are preserved.
+        Tables whose Glue version did not change since the last sync are skipped.
+        """
+        version = DatasetTableRepository.glue_table_version(glue_table)
+        if version is not None and version == dataset_table.GlueTableVersion:
+            logger.debug(f'Glue table {dataset_table.GlueTableName} has not changed, skipping its columns')
+            return
+
+        glue_columns = {}
+        for item in glue_table.get('StorageDescriptor', {}).get('Columns', []):
+            glue_columns[(item['Name'], 'column')] = item
+        for index, item in enumerate(glue_table.get('PartitionKeys', [])):
+            glue_columns[(item['Name'], f'partition_{index}')] = item
+        logger.debug(f'Found columns and partitions {list(glue_columns)} for table {dataset_table}')
+
+        existing_columns = {
+            (column.name, column.columnType): column
+            for column in session.query(DatasetTableColumn).filter(
+                DatasetTableColumn.tableUri == dataset_table.tableUri
             )
-        ).delete()
-        session.commit()
+        }
+        now = datetime.now()
+        inserts, updates = [], []
+        for (name, column_type), item in glue_columns.items():
+            column = existing_columns.get((name, column_type))
+            if column is None:
+                inserts.append(
+                    {
+                        'name': name,
+                        'label': name,
+                        'description': item.get('Comment', 'No description provided'),
+                        'owner': dataset_table.owner,
+                        'datasetUri': dataset_table.datasetUri,
+                        'tableUri': dataset_table.tableUri,
+                        'AWSAccountId': dataset_table.AWSAccountId,
+                        'GlueDatabaseName': dataset_table.GlueDatabaseName,
+                        'GlueTableName': dataset_table.GlueTableName,
+                        'region': dataset_table.region,
+                        'typeName': item['Type'],
+                        'columnType': column_type,
+                    }
+                )
+                continue
+            changes = {}
+            if column.typeName != item['Type']:
+                changes['typeName'] = item['Type']
+            if item.get('Comment') and column.description != item['Comment']:
+                changes['description'] = item['Comment']
+            if column.deleted:
+                changes['deleted'] = None
+            if changes:
+                updates.append({'columnUri': column.columnUri, 'updated': now, **changes})
+        updates.extend(
+            {'columnUri': column.columnUri, 'deleted': now}
+            for key, column in existing_columns.items()
+            if key not in glue_columns and not column.deleted
+        )
+
+        if inserts:
+            session.execute(insert(DatasetTableColumn), inserts)
+        if updates:
+            session.execute(update(DatasetTableColumn), updates)
+            # bulk updates by primary key do not refresh the columns already loaded in the session
+            for column in existing_columns.values():
+                session.expire(column)
+        dataset_table.GlueTableVersion = version
+        logger.info(
+            f'Synchronized columns of table {dataset_table.GlueTableName}: '
+            f'{len(inserts)} inserted, {len(updates)} updated or deleted'
+        )
 
     @staticmethod
     def get_table_by_s3_prefix(session, s3_prefix, accountid, region):
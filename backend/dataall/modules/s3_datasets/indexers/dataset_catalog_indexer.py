@@ -1,15 +1,22 @@
 import logging
 
+from datetime import datetime
 from typing import List
 from dataall.modules.s3_datasets.indexers.dataset_indexer import DatasetIndexer
 from dataall.modules.s3_datasets.indexers.location_indexer import DatasetLocationIndexer
 from dataall.modules.s3_datasets.indexers.table_indexer import DatasetTableIndexer
+from dataall.modules.s3_datasets.db.dataset_location_repositories import DatasetLocationRepository
 from dataall.modules.s3_datasets.db.dataset_repositories import DatasetRepository
+from dataall.modules.s3_datasets.db.dataset_table_repositories import DatasetTableRepository
 from dataall.modules.s3_datasets.db.dataset_models import S3Dataset
+from dataall.modules.catalog.db.catalog_indexer_repositories import CatalogIndexerRepository
 from dataall.modules.catalog.indexers.catalog_indexer import CatalogIndexer
+from dataall.modules.vote.db.vote_repositories import VoteRepository
 
 log = logging.getLogger(__name__)
 
+DATASETS_BATCH_SIZE = 500
+
 
 class DatasetCatalogIndexer(CatalogIndexer):
     """
@@ -19,16 +26,53 @@ class DatasetCatalogIndexer(CatalogIndexer):
 
     def index(self, session) -> List[str]:
         all_datasets: List[S3Dataset] = DatasetRepository.list_all_active_datasets(session)
-        all_dataset_uris = []
         log.info(f'Found {len(all_datasets)} datasets')
-        for dataset in all_datasets:
+        return self._index_datasets(session, all_datasets)
+
+    @staticmethod
+    def _index_datasets(session, datasets: List[S3Dataset]) -> List[str]:
+        all_dataset_uris = []
+        for dataset in datasets:
             tables = DatasetTableIndexer.upsert_all(session, dataset.datasetUri)
             all_dataset_uris += [table.tableUri for table in tables]
 
             folders = DatasetLocationIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
             all_dataset_uris += [folder.locationUri for folder in folders]
 
-            DatasetIndexer.upsert(session=session, dataset_uri=dataset.datasetUri)
-            all_dataset_uris.append(dataset.datasetUri)
+        dataset_uris = [dataset.datasetUri for dataset in datasets]
+        for i in range(0, len(dataset_uris), DATASETS_BATCH_SIZE):
+            DatasetIndexer.upsert_many(session, dataset_uris[i : i + DATASETS_BATCH_SIZE])
+        all_dataset_uris += dataset_uris
 
         return all_dataset_uris
+
+    def index_changes(self, session, since: datetime) -> List[str]:
+        changed_uris = CatalogIndexerRepository.list_glossary_targets_changed_since(session, since)
+        changed_uris |= VoteRepository.list_targets_voted_since(session, since, target_type='dataset')
+
+        # tables and folders embed the dataset, environment and organization attributes
+        datasets = DatasetRepository.list_active_datasets_changed_since(session, since, changed_uris)
+        log.info(f'Found {len(datasets)} datasets changed since {since}')
+        reindexed_dataset_uris = {dataset.datasetUri for dataset in datasets}
+        indexed_uris = self._index_datasets(session, datasets)
+
+        tables = [
+            table
+            for table in DatasetTableRepository.find_active_tables_changed_since(session, since, changed_uris)
+            if table.datasetUri not in reindexed_dataset_uris
+        ]
+        DatasetTableIndexer.upsert_many(session, tables)
+        folders = [
+            folder
+            for folder in DatasetLocationRepository.get_folders_changed_since(session, since, changed_uris)
+            if folder.datasetUri not in reindexed_dataset_uris
+        ]
+        DatasetLocationIndexer.upsert_many(session, folders)
+        indexed_uris += [table.tableUri for table in tables] + [folder.locationUri for folder in folders]
+
+        # datasets embed the number of their tables and folders
+        dataset_uris_to_refresh = list({item.datasetUri for item in tables + folders})
+        refreshed = DatasetIndexer.upsert_many(session, dataset_uris_to_refresh) if dataset_uris_to_refresh else []
+        indexed_uris += [dataset.datasetUri for dataset in refreshed]
+
+        return indexed_uris
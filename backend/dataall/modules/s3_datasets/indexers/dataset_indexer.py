@@ -1,10 +1,10 @@
 """Indexes Datasets in OpenSearch"""
 
 import re
+from typing import List
 
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
 from dataall.modules.vote.db.vote_repositories import VoteRepository
+from dataall.modules.s3_datasets.db.dataset_models import S3Dataset
 from dataall.modules.s3_datasets.db.dataset_repositories import DatasetRepository
 from dataall.modules.s3_datasets.db.dataset_location_repositories import DatasetLocationRepository
 from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
@@ -13,19 +13,25 @@ from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 class DatasetIndexer(BaseIndexer):
     @classmethod
     def upsert(cls, session, dataset_uri: str):
-        dataset = DatasetRepository.get_dataset_by_uri(session, dataset_uri)
+        datasets = cls.upsert_many(session, [dataset_uri])
+        return datasets[0] if datasets else None
 
-        if dataset:
-            env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
+    @classmethod
+    def upsert_many(cls, session, dataset_uris: List[str]) -> List[S3Dataset]:
+        """Indexes the datasets with a constant number of queries whatever the number of datasets"""
+        rows = DatasetRepository.list_datasets_with_environment_and_organization(session, dataset_uris)
+        if not rows:
+            return []
 
-            count_tables = DatasetRepository.count_dataset_tables(session, dataset_uri)
-            count_folders = DatasetLocationRepository.count_dataset_locations(session, dataset_uri)
-            count_upvotes = VoteRepository.count_upvotes(session, dataset_uri, target_type='dataset')
+        uris = [dataset.datasetUri for dataset, _, _ in rows]
+        count_tables = DatasetRepository.count_tables_by_dataset(session, uris)
+        count_folders = DatasetLocationRepository.count_locations_by_dataset(session, uris)
+        count_upvotes = VoteRepository.count_upvotes_by_target(session, uris, target_type='dataset')
+        glossaries = BaseIndexer._get_targets_glossary_terms(session, uris)
 
-            glossary = BaseIndexer._get_target_glossary_terms(session, dataset_uri)
+        for dataset, env, org in rows:
             BaseIndexer._index(
-                doc_id=dataset_uri,
+                doc_id=dataset.datasetUri,
                 doc={
                     'name': dataset.name,
                     'owner': dataset.owner,
@@ -46,10 +52,10 @@ class DatasetIndexer(BaseIndexer):
                     'created': dataset.created,
                     'updated': dataset.updated,
                     'deleted': dataset.deleted,
-                    'glossary': glossary,
-                    'tables': count_tables,
-                    'folders': count_folders,
-                    'upvotes': count_upvotes,
+                    'glossary': glossaries.get(dataset.datasetUri, []),
+                    'tables': count_tables.get(dataset.datasetUri, 0),
+                    'folders': count_folders.get(dataset.datasetUri, 0),
+                    'upvotes': count_upvotes.get(dataset.datasetUri, 0),
                 },
             )
-        return dataset
+        return [dataset for dataset, _, _ in rows]
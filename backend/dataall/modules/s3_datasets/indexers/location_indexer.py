@@ -1,9 +1,9 @@
 """Indexes DatasetStorageLocation in OpenSearch"""
 
 import re
+from typing import List
 
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
+from dataall.modules.s3_datasets.db.dataset_models import DatasetStorageLocation
 from dataall.modules.s3_datasets.db.dataset_location_repositories import DatasetLocationRepository
 from dataall.modules.s3_datasets.db.dataset_repositories import DatasetRepository
 from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
@@ -11,17 +11,35 @@ from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 
 class DatasetLocationIndexer(BaseIndexer):
     @classmethod
-    def upsert(cls, session, folder_uri: str, dataset=None, env=None, org=None):
+    def upsert(cls, session, folder_uri: str):
         folder = DatasetLocationRepository.get_location_by_uri(session, folder_uri)
-
         if folder:
-            dataset = DatasetRepository.get_dataset_by_uri(session, folder.datasetUri) if not dataset else dataset
-            env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri) if not env else env
-            org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri) if not org else org
-            glossary = BaseIndexer._get_target_glossary_terms(session, folder_uri)
+            cls.upsert_many(session, [folder])
+        return folder
+
+    @classmethod
+    def upsert_all(cls, session, dataset_uri: str):
+        folders = DatasetLocationRepository.get_dataset_folders(session, dataset_uri)
+        cls.upsert_many(session, folders)
+        return folders
+
+    @classmethod
+    def upsert_many(cls, session, folders: List[DatasetStorageLocation]) -> None:
+        """Indexes the folders with a constant number of queries whatever the number of folders"""
+        if not folders:
+            return
+        parents = {
+            dataset.datasetUri: (dataset, env, org)
+            for dataset, env, org in DatasetRepository.list_datasets_with_environment_and_organization(
+                session, {folder.datasetUri for folder in folders}
+            )
+        }
+        glossaries = BaseIndexer._get_targets_glossary_terms(session, [folder.locationUri for folder in folders])
 
+        for folder in folders:
+            dataset, env, org = parents[folder.datasetUri]
             BaseIndexer._index(
-                doc_id=folder_uri,
+                doc_id=folder.locationUri,
                 doc={
                     'name': folder.name,
                     'admins': dataset.SamlAdminGroupName,
@@ -42,19 +60,6 @@ class DatasetLocationIndexer(BaseIndexer):
                     'created': folder.created,
                     'updated': folder.updated,
                     'deleted': folder.deleted,
-                    'glossary': glossary,
+                    'glossary': glossaries.get(folder.locationUri, []),
                 },
             )
-        return folder
-
-    @classmethod
-    def upsert_all(cls, session, dataset_uri: str):
-        folders = DatasetLocationRepository.get_dataset_folders(session, dataset_uri)
-        dataset = DatasetRepository.get_dataset_by_uri(session, dataset_uri)
-        env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-        org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
-        for folder in folders:
-            DatasetLocationIndexer.upsert(
-                session=session, folder_uri=folder.locationUri, dataset=dataset, env=env, org=org
-            )
-        return folders
@@ -1,29 +1,46 @@
 """Indexes DatasetTable in OpenSearch"""
 
 import re
+from typing import List
 
-from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.core.organizations.db.organization_repositories import OrganizationRepository
+from dataall.modules.s3_datasets.db.dataset_models import DatasetTable
 from dataall.modules.s3_datasets.db.dataset_table_repositories import DatasetTableRepository
 from dataall.modules.s3_datasets.db.dataset_repositories import DatasetRepository
-from dataall.modules.s3_datasets.indexers.dataset_indexer import DatasetIndexer
 from dataall.modules.catalog.indexers.base_indexer import BaseIndexer
 
 
 class DatasetTableIndexer(BaseIndexer):
     @classmethod
-    def upsert(cls, session, table_uri: str, dataset=None, env=None, org=None):
+    def upsert(cls, session, table_uri: str):
         table = DatasetTableRepository.get_dataset_table_by_uri(session, table_uri)
-
         if table:
-            dataset = DatasetRepository.get_dataset_by_uri(session, table.datasetUri) if not dataset else dataset
-            env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri) if not env else env
-            org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri) if not org else org
-            glossary = BaseIndexer._get_target_glossary_terms(session, table_uri)
+            cls.upsert_many(session, [table])
+        return table
+
+    @classmethod
+    def upsert_all(cls, session, dataset_uri: str):
+        tables = DatasetTableRepository.find_all_active_tables(session, dataset_uri)
+        cls.upsert_many(session, tables)
+        return tables
+
+    @classmethod
+    def upsert_many(cls, session, tables: List[DatasetTable]) -> None:
+        """Indexes the tables with a constant number of queries whatever the number of tables"""
+        if not tables:
+            return
+        parents = {
+            dataset.datasetUri: (dataset, env, org)
+            for dataset, env, org in DatasetRepository.list_datasets_with_environment_and_organization(
+                session, {table.datasetUri for table in tables}
+            )
+        }
+        glossaries = BaseIndexer._get_targets_glossary_terms(session, [table.tableUri for table in tables])
 
+        for table in tables:
+            dataset, env, org = parents[table.datasetUri]
             tags = table.tags if table.tags else []
             BaseIndexer._index(
-                doc_id=table_uri,
+                doc_id=table.tableUri,
                 doc={
                     'name': table.name,
                     'admins': dataset.SamlAdminGroupName,
@@ -45,20 +62,9 @@ class DatasetTableIndexer(BaseIndexer):
                     'created': table.created,
                     'updated': table.updated,
                     'deleted': table.deleted,
-                    'glossary': glossary,
+                    'glossary': glossaries.get(table.tableUri, []),
                 },
             )
-        return table
-
-    @classmethod
-    def upsert_all(cls, session, dataset_uri: str):
-        tables = DatasetTableRepository.find_all_active_tables(session, dataset_uri)
-        dataset = DatasetRepository.get_dataset_by_uri(session, dataset_uri)
-        env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-        org = OrganizationRepository.get_organization_by_uri(session, dataset.organizationUri)
-        for table in tables:
-            DatasetTableIndexer.upsert(session=session, table_uri=table.tableUri, dataset=dataset, env=env, org=org)
-        return tables
 
     @classmethod
     def remove_all_deleted(cls, session, dataset_uri: str):
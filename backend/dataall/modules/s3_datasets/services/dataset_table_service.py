@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 from dataall.base.context import get_context
 from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
@@ -115,7 +117,7 @@ class DatasetTableService:
                     message='User is not authorized to Preview Table for Confidential datasets',
                 )
             env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            return AthenaTableClient(env, table).get_table()
+            return DatasetTableService._preview_table(session, env, table)
 
     @staticmethod
     @TenantPolicyService.has_tenant_permission(MANAGE_DATASETS)
@@ -126,7 +128,7 @@ class DatasetTableService:
             table: DatasetTable = DatasetTableRepository.get_dataset_table_by_uri(session, uri)
             dataset = DatasetRepository.get_dataset_by_uri(session, table.datasetUri)
             env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
-            return AthenaTableClient(env, table).get_table()
+            return DatasetTableService._preview_table(session, env, table)
 
     @staticmethod
     @ResourcePolicyService.has_resource_permission(GET_DATASET_TABLE)
@@ -159,37 +161,76 @@ class DatasetTableService:
             existing_dataset_tables_map = {t.GlueTableName: t for t in existing_tables}
             DatasetTableRepository.update_existing_tables_status(existing_tables, glue_tables, session)
             log.info(f'existing_tables={glue_tables}')
+            new_glue_tables = [table for table in glue_tables if table['Name'] not in existing_table_names]
+            log.info(f'Storing {len(new_glue_tables)} new tables for dataset db {dataset.GlueDatabaseName}')
+            new_tables = DatasetTableRepository.create_synced_tables(session, dataset, new_glue_tables)
+            DatasetTableService._attach_dataset_tables_permission(
+                session, dataset, [table.tableUri for table in new_tables]
+            )
+            synced_tables_map = {**existing_dataset_tables_map, **{t.GlueTableName: t for t in new_tables}}
+            changed_schema_tables = []
             for table in glue_tables:
-                if table['Name'] not in existing_table_names:
-                    log.info(f'Storing new table: {table} for dataset db {dataset.GlueDatabaseName}')
-                    updated_table = DatasetTableRepository.create_synced_table(session, dataset, table)
-                    DatasetTableService._attach_dataset_table_permission(session, dataset, updated_table.tableUri)
-                else:
+                updated_table: DatasetTable = synced_tables_map.get(table['Name'])
+                if table['Name'] in existing_table_names:
                     log.info(f'Updating table: {table} for dataset db {dataset.GlueDatabaseName}')
-                    updated_table: DatasetTable = existing_dataset_tables_map.get(table['Name'])
                     updated_table.GlueTableProperties = json_utils.to_json(table.get('Parameters', {}))
+                    version = DatasetTableRepository.glue_table_version(table)
+                    if version is not None and version == updated_table.GlueTableVersion:
+                        continue
+                    existing_columns = DatasetColumnRepository.list_active_columns_for_table(
+                        session, updated_table.tableUri
+                    )
+                    if DatasetTableService._schema_version(
+                        [(c.name, c.typeName, c.columnType) for c in existing_columns]
+                    ) != DatasetTableService._schema_version(DatasetTableRepository.glue_table_columns(table)):
+                        changed_schema_tables.append(updated_table)
 
                 DatasetTableRepository.sync_table_columns(session, updated_table, table)
+            session.commit()
+
+            if changed_schema_tables:
+                env = EnvironmentService.get_environment_by_uri(session, dataset.environmentUri)
+                for changed_table in changed_schema_tables:
+                    try:
+                        AthenaTableClient(env, changed_table).delete_cached_previews()
+                    except Exception as e:
+                        log.warning(f'Failed to invalidate the previews of table {changed_table.tableUri}: {e}')
 
         return True
 
     @staticmethod
-    def _attach_dataset_table_permission(session, dataset: S3Dataset, table_uri):
+    def _schema_version(columns) -> str:
+        """Returns a version of the schema given as a list of (name, type, column type) tuples"""
+        signature = json.dumps(sorted(list(column) for column in columns))
+        return hashlib.sha256(signature.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _preview_table(session, env, table: DatasetTable):
+        columns = DatasetColumnRepository.list_active_columns_for_table(session, table.tableUri)
+        partitions = sorted(
+            (c for c in columns if c.columnType.startswith('partition_')), key=lambda c: int(c.columnType.split('_')[1])
+        )
+        return AthenaTableClient(env, table).get_table(
+            partitions=[c.name for c in partitions],
+            cache_version=DatasetTableService._schema_version([(c.name, c.typeName, c.columnType) for c in columns]),
+        )
+
+    @staticmethod
+    def _attach_dataset_tables_permission(session, dataset: S3Dataset, table_uris: [str]):
         """
-        Attach Table permissions to dataset groups
+        Attach Tables permissions to dataset groups
         """
         permission_group = {
             dataset.SamlAdminGroupName,
             dataset.stewards if dataset.stewards is not None else dataset.SamlAdminGroupName,
         }
-        for group in permission_group:
-            ResourcePolicyService.attach_resource_policy(
-                session=session,
-                group=group,
-                permissions=DATASET_TABLE_ALL,
-                resource_uri=table_uri,
-                resource_type=DatasetTable.__name__,
-            )
+        ResourcePolicyService.attach_resource_policies(
+            session=session,
+            groups=list(permission_group),
+            permissions=DATASET_TABLE_ALL,
+            resource_uris=table_uris,
+            resource_type=DatasetTable.__name__,
+        )
 
     @staticmethod
     def _delete_dataset_table_read_permission(session, table_uri):
@@ -1,12 +1,16 @@
+import hashlib
+import json
 import logging
 import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from operator import and_
 
 from dataall.base.aws.sts import SessionHelper
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.core.environment.services.environment_service import EnvironmentService
-from dataall.base.db import get_engine
+from dataall.base.db import PoolConfig, get_engine
 from dataall.modules.s3_datasets.aws.glue_dataset_client import DatasetCrawler
 from dataall.modules.s3_datasets.aws.lf_table_client import LakeFormationTableClient
 from dataall.modules.s3_datasets.services.dataset_table_service import DatasetTableService
@@ -18,60 +22,112 @@ from dataall.modules.s3_datasets.services.dataset_alarm_service import DatasetAl
 
 log = logging.getLogger(__name__)
 
+# number of AWS account/region partitions synchronized concurrently
+MAX_WORKERS = 8
+# attributes of the Glue tables the sync depends on
+GLUE_TABLE_VERSION_KEYS = ('Name', 'VersionId', 'UpdateTime', 'StorageDescriptor', 'PartitionKeys', 'Parameters')
 
-def sync_tables(engine):
+
+def sync_tables(engine, max_workers=MAX_WORKERS, full_sync=False):
+    """
+    Synchronizes the tables of all active datasets with their Glue databases.
+    Datasets are partitioned by AWS account and region: partitions are synchronized concurrently by up to
+    max_workers threads, the datasets of a partition one after another so that a single account
+    is never sent more than one sync at a time.
+    Datasets whose Glue tables have not changed since the last sync are skipped unless full_sync is set.
+    """
     with engine.scoped_session() as session:
-        processed_tables = []
         all_datasets: [S3Dataset] = DatasetRepository.list_all_active_datasets(session)
         log.info(f'Found {len(all_datasets)} datasets for tables sync')
-        dataset: S3Dataset
+        partitions = defaultdict(list)
         for dataset in all_datasets:
-            log.info(f'Synchronizing dataset {dataset.name}|{dataset.datasetUri} tables')
-            env: Environment = (
-                session.query(Environment)
-                .filter(
-                    and_(
-                        Environment.environmentUri == dataset.environmentUri,
-                        Environment.deleted.is_(None),
-                    )
-                )
-                .first()
-            )
-            env_group: EnvironmentGroup = EnvironmentService.get_environment_group(
-                session, dataset.SamlAdminGroupName, env.environmentUri
+            partitions[(dataset.AwsAccountId, dataset.region)].append(dataset.datasetUri)
+
+    processed_tables = []
+    if not partitions:
+        return processed_tables
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(partitions))) as executor:
+        futures = [
+            executor.submit(_sync_partition, engine, dataset_uris, full_sync) for dataset_uris in partitions.values()
+        ]
+        for future in as_completed(futures):
+            processed_tables.extend(future.result())
+    return processed_tables
+
+
+def _sync_partition(engine, dataset_uris, full_sync):
+    processed_tables = []
+    for dataset_uri in dataset_uris:
+        with engine.scoped_session() as session:
+            processed_tables.extend(_sync_dataset(session, dataset_uri, full_sync))
+    return processed_tables
+
+
+def _sync_dataset(session, dataset_uri, full_sync):
+    dataset: S3Dataset = DatasetRepository.get_dataset_by_uri(session, dataset_uri)
+    log.info(f'Synchronizing dataset {dataset.name}|{dataset.datasetUri} tables')
+    env: Environment = (
+        session.query(Environment)
+        .filter(
+            and_(
+                Environment.environmentUri == dataset.environmentUri,
+                Environment.deleted.is_(None),
             )
-            try:
-                if not env or not is_assumable_pivot_role(env):
-                    log.info(f'Dataset {dataset.GlueDatabaseName} has an invalid environment')
-                else:
-                    tables = DatasetCrawler(dataset).list_glue_database_tables(dataset.S3BucketName)
+        )
+        .first()
+    )
+    try:
+        if not env or not is_assumable_pivot_role(env):
+            log.info(f'Dataset {dataset.GlueDatabaseName} has an invalid environment')
+            return []
 
-                    log.info(f'Found {len(tables)} tables on Glue database {dataset.GlueDatabaseName}')
+        env_group: EnvironmentGroup = EnvironmentService.get_environment_group(
+            session, dataset.SamlAdminGroupName, env.environmentUri
+        )
+        tables = DatasetCrawler(dataset).list_glue_database_tables(dataset.S3BucketName)
+        log.info(f'Found {len(tables)} tables on Glue database {dataset.GlueDatabaseName}')
 
-                    DatasetTableService.sync_existing_tables(session, uri=dataset.datasetUri, glue_tables=tables)
+        version = glue_tables_version(tables)
+        if not full_sync and version == dataset.GlueTablesVersion:
+            log.info(f'Glue database {dataset.GlueDatabaseName} has not changed since the last sync, skipping')
+            return []
 
-                    tables = session.query(DatasetTable).filter(DatasetTable.datasetUri == dataset.datasetUri).all()
+        DatasetTableService.sync_existing_tables(session, uri=dataset.datasetUri, glue_tables=tables)
 
-                    log.info('Updating tables permissions on Lake Formation...')
+        tables = session.query(DatasetTable).filter(DatasetTable.datasetUri == dataset.datasetUri).all()
 
-                    for table in tables:
-                        LakeFormationTableClient(table).grant_principals_all_table_permissions(
-                            principals=[
-                                SessionHelper.get_delegation_role_arn(env.AwsAccountId, env.region),
-                                env_group.environmentIAMRoleArn,
-                            ],
-                        )
+        log.info('Updating tables permissions on Lake Formation...')
+        failed_grants = LakeFormationTableClient.grant_principals_all_tables_permissions(
+            tables,
+            principals=[
+                SessionHelper.get_delegation_role_arn(env.AwsAccountId, env.region),
+                env_group.environmentIAMRoleArn,
+            ],
+        )
 
-                    processed_tables.extend(tables)
+        DatasetTableIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
+        DatasetIndexer.upsert(session=session, dataset_uri=dataset.datasetUri)
+        if failed_grants:
+            # the version is cleared so that the next sync grants the permissions again
+            log.warning(f'{failed_grants} table permissions of {dataset.GlueDatabaseName} could not be granted')
+            version = None
+        dataset.GlueTablesVersion = version
+        return tables
+    except Exception as e:
+        session.rollback()
+        log.error(f'Failed to sync tables for dataset {dataset.AwsAccountId}/{dataset.GlueDatabaseName} due to: {e}')
+        DatasetAlarmService().trigger_dataset_sync_failure_alarm(dataset, str(e))
+        return []
 
-                    DatasetTableIndexer.upsert_all(session, dataset_uri=dataset.datasetUri)
-                    DatasetIndexer.upsert(session=session, dataset_uri=dataset.datasetUri)
-            except Exception as e:
-                log.error(
-                    f'Failed to sync tables for dataset {dataset.AwsAccountId}/{dataset.GlueDatabaseName} due to: {e}'
-                )
-                DatasetAlarmService().trigger_dataset_sync_failure_alarm(dataset, str(e))
-        return processed_tables
+
+def glue_tables_version(glue_tables) -> str:
+    """Returns a version of the Glue tables that changes whenever a table is created, updated or deleted"""
+    signature = json.dumps(
+        sorted(({key: table.get(key) for key in GLUE_TABLE_VERSION_KEYS} for table in glue_tables), key=str),
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(signature.encode()).hexdigest()[:32]
 
 
 def is_assumable_pivot_role(env: Environment):
@@ -84,5 +140,10 @@ def is_assumable_pivot_role(env: Environment):
 
 if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
-    ENGINE = get_engine(envname=ENVNAME)
-    sync_tables(engine=ENGINE)
+    WORKERS = int(os.environ.get('max_workers', MAX_WORKERS))
+    ENGINE = get_engine(envname=ENVNAME, pool_config=PoolConfig(pool_size=WORKERS + 1).with_env_overrides())
+    sync_tables(
+        engine=ENGINE,
+        max_workers=WORKERS,
+        full_sync=os.environ.get('full_sync', 'False') == 'True',
+    )
@@ -1,5 +1,6 @@
 import logging
-from typing import List
+import random
+from typing import Dict, List
 import time
 
 from botocore.exceptions import ClientError
@@ -9,11 +10,21 @@ from dataall.base.aws.sts import SessionHelper
 
 log = logging.getLogger('aws:lakeformation')
 
+# maximum number of entries of a BatchGrantPermissions request
+BATCH_GRANT_SIZE = 20
+BATCH_GRANT_MAX_ATTEMPTS = 5
+
 
 class LakeFormationClient:
     def __init__(self, account_id, region):
+        self._account_id = account_id
         self._session = SessionHelper.remote_session(accountid=account_id, region=region)
         self._client = self._session.client('lakeformation', region_name=region)
+        # permissions snapshot of the loaded principals on the loaded databases:
+        # (principal, resource key) -> (permissions, permissions with grant option)
+        self._snapshot: Dict[tuple, tuple] = {}
+        self._snapshot_principals = set()
+        self._snapshot_databases = set()
 
     def upgrade_lakeformation_data_catalog_settings(self, version_num=3):
         """
@@ -169,6 +180,7 @@ class LakeFormationClient:
                         wait_random_min=1000,
                         wait_random_max=3000,
                     ).call(self._client.grant_permissions, **grant_dict)
+                    self._record_grant(principal, check_resource if check_resource else resource, grant_dict)
 
                     log.info(
                         f'Successfully granted principal {principal} '
@@ -278,6 +290,7 @@ class LakeFormationClient:
                     revoke_dict['PermissionsWithGrantOption'] = permissions_with_grant_options
 
                 response = self._client.revoke_permissions(**revoke_dict)
+                self._record_revoke(principal, resource, permissions, permissions_with_grant_options)
                 log.info(
                     f'Successfully revoked principal {principal} '
                     f'permissions {permissions} '
@@ -304,6 +317,7 @@ class LakeFormationClient:
                         f'due to: {error}'
                     )
                     raise error
+                self._record_revoke(principal, resource, permissions, permissions_with_grant_options)
                 log.warning(
                     f'Principal {principal} already has revoked'
                     f'permissions {permissions} '
@@ -313,6 +327,138 @@ class LakeFormationClient:
                 )
         return True
 
+    @staticmethod
+    def build_table_grants(
+        principals, database_name, table_name, catalog_id, permissions, data_filters=None, with_columns=True
+    ) -> List[dict]:
+        """
+        Grants of grant_permissions_batch for a table: on the data filters of the table if data_filters are given,
+        on all the columns of the table if with_columns, else on the table
+        """
+        table = {'DatabaseName': database_name, 'Name': table_name, 'CatalogId': catalog_id}
+        if data_filters:
+            resources = [
+                {
+                    'DataCellsFilter': {
+                        'TableCatalogId': catalog_id,
+                        'DatabaseName': database_name,
+                        'TableName': table_name,
+                        'Name': f_name,
+                    }
+                }
+                for f_name in data_filters
+            ]
+            check_resource = None
+        elif with_columns:
+            resources = [{'TableWithColumns': {**table, 'ColumnWildcard': {}}}]
+            check_resource = {'Table': table}
+        else:
+            resources = [{'Table': table}]
+            check_resource = None
+        return [
+            dict(principal=principal, resource=resource, permissions=permissions, check_resource=check_resource)
+            for resource in resources
+            for principal in principals
+        ]
+
+    def load_permissions(self, principals: List[str], database_names: List[str]) -> None:
+        """
+        Takes a snapshot of the Lake Formation permissions of the principals on the databases and their tables.
+        list_permissions requires a resource when it is filtered by principal, so the permissions of the catalog are
+        paginated by resource type and filtered by principal and database here. The checks of these permissions are
+        then answered from the snapshot, which is kept up to date with the grants and revokes done by this client.
+        Permissions on data filters are not part of the snapshot.
+        """
+        databases = set(database_names)
+        snapshot_principals = set(principals)
+        snapshot = {}
+        try:
+            paginator = self._client.get_paginator('list_permissions')
+            for resource_type in ['DATABASE', 'TABLE']:
+                for page in paginator.paginate(CatalogId=self._account_id, ResourceType=resource_type):
+                    for permission in page['PrincipalResourcePermissions']:
+                        principal = permission['Principal']['DataLakePrincipalIdentifier']
+                        if principal not in snapshot_principals:
+                            continue
+                        key = self._resource_key(permission['Resource'])
+                        if key is None or key[1] not in databases:
+                            continue
+                        current, current_grant = snapshot.get((principal, key), (set(), set()))
+                        snapshot[(principal, key)] = (
+                            current | set(permission['Permissions']),
+                            current_grant | set(permission.get('PermissionsWithGrantOption', [])),
+                        )
+        except ClientError as e:
+            log.warning(f'Could not take a snapshot of the permissions of {principals} on {databases} due to: {e}')
+            return
+        self._snapshot.update(snapshot)
+        self._snapshot_principals.update(principals)
+        self._snapshot_databases.update(databases)
+        log.info(f'Loaded {len(snapshot)} permissions of {principals} on {databases}')
+
+    def grant_permissions_batch(self, grants: List[dict]) -> Dict[int, str]:
+        """
+        Grants permissions with BatchGrantPermissions requests of up to BATCH_GRANT_SIZE entries.
+        The grants that the permissions snapshot shows as already granted are skipped,
+        the entries failing with ConcurrentModificationException are retried.
+        :param grants: dicts with the principal, resource, permissions and optionally the
+        permissions_with_grant_options and check_resource of each grant
+        :return: the errors of the failed grants by their index in grants
+        """
+        entries = {}
+        for index, grant in enumerate(grants):
+            check_resource = grant.get('check_resource') or grant['resource']
+            snapshot = self._snapshot_permissions(grant['principal'], check_resource)
+            if snapshot is None or not self._is_granted(snapshot, grant):
+                entry = {
+                    'Id': str(index),
+                    'Principal': {'DataLakePrincipalIdentifier': grant['principal']},
+                    'Resource': grant['resource'],
+                    'Permissions': grant['permissions'],
+                }
+                if grant.get('permissions_with_grant_options'):
+                    entry['PermissionsWithGrantOption'] = grant['permissions_with_grant_options']
+                entries[index] = entry
+        log.info(f'Granting {len(entries)} of {len(grants)} permissions, the others are already granted')
+
+        errors = {}
+        pending = list(entries.values())
+        for attempt in range(1, BATCH_GRANT_MAX_ATTEMPTS + 1):
+            retries = []
+            for start in range(0, len(pending), BATCH_GRANT_SIZE):
+                batch = pending[start : start + BATCH_GRANT_SIZE]
+                try:
+                    failures = self._client.batch_grant_permissions(Entries=batch).get('Failures', [])
+                except ClientError as e:
+                    log.error(f'Could not grant {len(batch)} permissions due to: {e}')
+                    errors.update({int(entry['Id']): str(e) for entry in batch})
+                    continue
+                failed = {}
+                for failure in failures:
+                    failed[failure['RequestEntry']['Id']] = failure.get('Error', {})
+                for entry in batch:
+                    error = failed.get(entry['Id'])
+                    index = int(entry['Id'])
+                    if error is None:
+                        grant = grants[index]
+                        self._record_grant(grant['principal'], grant.get('check_resource') or grant['resource'], entry)
+                        errors.pop(index, None)
+                    elif error.get('ErrorCode') == 'ConcurrentModificationException':
+                        retries.append(entry)
+                        errors[index] = f'{error.get("ErrorCode")}: {error.get("ErrorMessage")}'
+                    else:
+                        log.error(f'Could not grant {entry} due to: {error}')
+                        errors[index] = f'{error.get("ErrorCode")}: {error.get("ErrorMessage")}'
+            if not retries or attempt == BATCH_GRANT_MAX_ATTEMPTS:
+                break
+            time.sleep(random.uniform(1, 3))
+            pending = retries
+
+        if len(errors) < len(entries):
+            # let the grants propagate before they are used, as after each single grant
+            time.sleep(2)
+        return errors
+
     def check_permissions_to_database(
         self,
         principals,
@@ -438,13 +584,18 @@ class LakeFormationClient:
             if 'DataCellsFilter' in check_dict['Resource']:
                 del check_dict['Principal']
 
-            existing = self._client.list_permissions(**check_dict)
-            current = []
-            current_grant = []
-            for permission in existing['PrincipalResourcePermissions']:
-                if permission['Principal']['DataLakePrincipalIdentifier'] == principal:
-                    current.extend(permission['Permissions'])
-                    current_grant.extend(permission['PermissionsWithGrantOption'])
+            snapshot = self._snapshot_permissions(principal, check_resource if check_resource else resource)
+            if snapshot is not None:
+                existing = 'permissions snapshot'
+                current, current_grant = snapshot
+            else:
+                existing = self._client.list_permissions(**check_dict)
+                current = []
+                current_grant = []
+                for permission in existing['PrincipalResourcePermissions']:
+                    if permission['Principal']['DataLakePrincipalIdentifier'] == principal:
+                        current.extend(permission['Permissions'])
+                        current_grant.extend(permission['PermissionsWithGrantOption'])
 
             missing_permissions = list(set(permissions) - set(current))
             missing_grant_permissions = (
@@ -465,3 +616,54 @@ class LakeFormationClient:
         except ClientError as e:
             log.error(f'Could not list principal {principal} permissions {permissions} to {str(resource)}  due to: {e}')
             raise e
+
+    def _snapshot_permissions(self, principal: str, resource: dict):
+        """Returns the (permissions, permissions with grant option) of the snapshot, None if they are not loaded"""
+        if principal not in self._snapshot_principals:
+            return None
+        key = self._resource_key(resource)
+        if key is None or key[1] not in self._snapshot_databases:
+            return None
+        return self._snapshot.get((principal, key), (set(), set()))
+
+    def _record_grant(self, principal: str, resource: dict, grant: dict) -> None:
+        snapshot = self._snapshot_permissions(principal, resource)
+        if snapshot is not None:
+            self._snapshot[(principal, self._resource_key(resource))] = (
+                snapshot[0] | set(grant['Permissions']),
+                snapshot[1] | set(grant.get('PermissionsWithGrantOption') or []),
+            )
+
+    def _record_revoke(self, principal: str, resource: dict, permissions, permissions_with_grant_options) -> None:
+        snapshot = self._snapshot_permissions(principal, resource)
+        if snapshot is not None:
+            self._snapshot[(principal, self._resource_key(resource))] = (
+                snapshot[0] - set(permissions),
+                snapshot[1] - set(permissions_with_grant_options or []),
+            )
+
+    @staticmethod
+    def _is_granted(snapshot, grant: dict) -> bool:
+        current, current_grant = snapshot
+        missing_grant_permissions = set(grant.get('permissions_with_grant_options') or []) - current_grant
+        return set(grant['permissions']) <= current and not missing_grant_permissions
+
+    def _resource_key(self, resource: dict):
+        """
+        Key of the snapshot of a database or table resource of the catalog of the client,
+        table permissions and permissions on all the columns of a table share the key of the table
+        """
+        if 'Database' in resource:
+            entry = resource['Database']
+            kind, database_name, name = 'Database', entry.get('Name'), None
+        elif 'Table' in resource and 'TableWildcard' not in resource['Table']:
+            entry = resource['Table']
+            kind, database_name, name = 'Table', entry.get('DatabaseName'), entry.get('Name')
+        elif 'TableWithColumns' in resource and resource['TableWithColumns'].get('ColumnWildcard') == {}:
+            entry = resource['TableWithColumns']
+            kind, database_name, name = 'Table', entry.get('DatabaseName'), entry.get('Name')
+        else:
+            return None
+        if entry.get('CatalogId') not in (None, self._account_id):
+            return None
+        return kind, database_name, name
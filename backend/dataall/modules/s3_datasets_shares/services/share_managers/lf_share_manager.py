@@ -2,7 +2,7 @@ import logging
 import time
 from datetime import datetime
 from enum import Enum, auto
-from typing import List
+from typing import Dict, List
 
 from dataall.base.aws.iam import IAM
 from dataall.base.aws.quicksight import QuicksightClient
@@ -288,6 +288,15 @@ class LFShareManager:
         )
         return True
 
+    def load_principals_lf_permissions(self) -> None:
+        """
+        Takes a snapshot of the Lake Formation permissions of the share principals on the source database
+        and on the shared database, so that the permissions of all the tables of the share are checked
+        without a request per table and principal
+        """
+        self.lf_client_in_source.load_permissions(self.principals, [self.source_database_name])
+        self.lf_client_in_target.load_permissions(self.principals, [self.shared_db_name])
+
     def check_pivot_role_permissions_to_source_database(self) -> None:
         """
         Checks 'ALL' Lake Formation permissions to data.all PivotRole to the source database in source account
@@ -440,6 +449,68 @@ class LFShareManager:
             time.sleep(2)
         return True
 
+    def grant_principals_permissions_to_source_tables(
+        self, tables: List[tuple[DatasetTable, ShareObjectItemDataFilter]]
+    ) -> Dict[str, Exception]:
+        """
+        Grants Lake Formation permissions to target principals to the original tables in source account
+        with batched requests
+        :param tables: (DatasetTable, ShareObjectItemDataFilter or None) of the shared tables
+        :return: the errors of the tables that could not be granted by tableUri
+        """
+        grants, table_uris = [], []
+        for table, share_item_filter in tables:
+            table_grants = LakeFormationClient.build_table_grants(
+                principals=self.principals,
+                database_name=self.source_database_name,
+                table_name=table.GlueTableName,
+                catalog_id=self.source_account_id,
+                permissions=perms_to_lfperms(
+                    self.share.permissions, LfPermType.Filters if share_item_filter else LfPermType.Table
+                ),
+                data_filters=share_item_filter.dataFilterNames if share_item_filter else None,
+            )
+            grants.extend(table_grants)
+            table_uris.extend([table.tableUri] * len(table_grants))
+        return self._batch_grant_errors(self.lf_client_in_source, grants, table_uris)
+
+    def grant_principals_permissions_to_resource_link_tables(
+        self, resource_link_names: List[str]
+    ) -> Dict[str, Exception]:
+        """
+        Grants Lake Formation permissions to share principals to the resource link tables in target account
+        with batched requests
+        :param resource_link_names: names of the resource link tables
+        :return: the errors of the resource link tables that could not be granted by name
+        """
+        grants, names = [], []
+        for resource_link_name in resource_link_names:
+            table_grants = LakeFormationClient.build_table_grants(
+                principals=self.principals,
+                database_name=self.shared_db_name,
+                table_name=resource_link_name,
+                catalog_id=self.target_environment.AwsAccountId,
+                permissions=perms_to_lfperms(self.share.permissions, LfPermType.ResourceLink),
+                with_columns=False,
+            )
+            grants.extend(table_grants)
+            names.extend([resource_link_name] * len(table_grants))
+        return self._batch_grant_errors(self.lf_client_in_target, grants, names)
+
+    @staticmethod
+    def _batch_grant_errors(lf_client, grants: List[dict], owners: List[str]) -> Dict[str, Exception]:
+        errors = {}
+        for index, error in lf_client.grant_permissions_batch(grants).items():
+            grant = grants[index]
+            errors.setdefault(
+                owners[index],
+                Exception(
+                    f'Could not grant principal {grant["principal"]} permissions {grant["permissions"]} '
+                    f'to {grant["resource"]} due to: {error}'
+                ),
+            )
+        return errors
+
     def check_if_exists_and_create_resource_link_table_in_shared_database(
         self, table: DatasetTable, resource_link_name: str
     ) -> True:
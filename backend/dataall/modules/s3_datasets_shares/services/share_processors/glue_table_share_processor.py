@@ -99,6 +99,7 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                 manager.grant_pivot_role_all_database_permissions_to_source_database()
                 manager.check_if_exists_and_create_shared_database_in_target()
                 manager.grant_pivot_role_all_database_permissions_to_shared_database()
+                manager.load_principals_lf_permissions()
                 manager.grant_principals_database_permissions_to_shared_database()
             except Exception as e:
                 log.error(f'Failed to process approved tables due to {e}')
@@ -110,6 +111,8 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                 )
                 return False
 
+            # tables whose source table permissions are granted with the next batch
+            pending = []
             for table in self.tables:
                 log.info(f'Sharing table {table.tableUri}/{table.GlueTableName}...')
 
@@ -123,6 +126,7 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                         f'and Dataset Table {table.GlueTableName} continuing loop...'
                     )
                     continue
+                shared_item_SM = None
                 if not self.reapply:
                     shared_item_SM = ShareItemSM(ShareItemStatus.Share_Approved.value)
                     new_state = shared_item_SM.run_transition(ShareObjectActions.Start.value)
@@ -155,8 +159,20 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                         log.info(f'Processing cross-account permissions for table {table.GlueTableName}...')
                         manager.revoke_iam_allowed_principals_from_table(table)
                         manager.upgrade_lakeformation_settings_in_source()
+                    pending.append((table, share_item, share_item_filter, shared_item_SM))
+                except Exception as e:
+                    success = False
+                    self._handle_share_item_failure(manager, table, share_item, shared_item_SM, e)
 
-                    manager.grant_principals_permissions_to_source_table(table, share_item, share_item_filter)
+            errors = manager.grant_principals_permissions_to_source_tables(
+                [(table, share_item_filter) for table, _, share_item_filter, _ in pending]
+            )
+            # tables whose resource link permissions are granted with the next batch
+            linked = []
+            for table, share_item, share_item_filter, shared_item_SM in pending:
+                try:
+                    if table.tableUri in errors:
+                        raise errors[table.tableUri]
                     if manager.cross_account:
                         retries = 0
                         retry_share_table = True
@@ -175,7 +191,18 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
 
                     resource_link_name = self._build_resource_link_name(table.GlueTableName, share_item_filter)
                     manager.check_if_exists_and_create_resource_link_table_in_shared_database(table, resource_link_name)
-                    manager.grant_principals_permissions_to_resource_link_table(resource_link_name)
+                    linked.append((table, share_item, shared_item_SM, resource_link_name))
+                except Exception as e:
+                    success = False
+                    self._handle_share_item_failure(manager, table, share_item, shared_item_SM, e)
+
+            errors = manager.grant_principals_permissions_to_resource_link_tables(
+                [resource_link_name for *_, resource_link_name in linked]
+            )
+            for table, share_item, shared_item_SM, resource_link_name in linked:
+                try:
+                    if resource_link_name in errors:
+                        raise errors[resource_link_name]
 
                     log.info('Attaching TABLE READ permissions...')
                     S3ShareService.attach_dataset_table_read_permission(
@@ -189,21 +216,24 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                         self.session, share_item, ShareItemHealthStatus.Healthy.value, None, datetime.now()
                     )
                 except Exception as e:
-                    if not self.reapply:
-                        new_state = shared_item_SM.run_transition(ShareItemActions.Failure.value)
-                        shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-                    else:
-                        ShareStatusRepository.update_share_item_health_status(
-                            self.session,
-                            share_item,
-                            ShareItemHealthStatus.Unhealthy.value,
-                            str(e),
-                            datetime.now(),
-                        )
                     success = False
-                    manager.handle_share_failure(table=table, error=e)
+                    self._handle_share_item_failure(manager, table, share_item, shared_item_SM, e)
         return success
 
+    def _handle_share_item_failure(self, manager, table, share_item, shared_item_SM, error):
+        if not self.reapply:
+            new_state = shared_item_SM.run_transition(ShareItemActions.Failure.value)
+            shared_item_SM.update_state_single_item(self.session, share_item, new_state)
+        else:
+            ShareStatusRepository.update_share_item_health_status(
+                self.session,
+                share_item,
+                ShareItemHealthStatus.Unhealthy.value,
+                str(error),
+                datetime.now(),
+            )
+        manager.handle_share_failure(table=table, error=error)
+
     def process_revoked_shares(self) -> bool:
         """
         0) Check if source account details are properly initialized and initialize the Glue and LF clients
@@ -438,6 +468,7 @@ class ProcessLakeFormationShare(SharesProcessorInterface):
                         'Source account details not initialized properly. Please check if the catalog account is properly onboarded on data.all'
                     )
                 manager.initialize_clients()
+                manager.load_principals_lf_permissions()
                 if not manager.check_pivot_role_permissions_to_source_database():
                     manager.grant_pivot_role_all_database_permissions_to_source_database()
                 shared_database_exists = manager.check_shared_database_in_target()
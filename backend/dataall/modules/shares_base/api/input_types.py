@@ -55,6 +55,7 @@ ShareObjectFilter = gql.InputType(
         gql.Argument('datasets_uris', gql.ArrayType(gql.String)),
         gql.Argument('share_requesters', gql.ArrayType(gql.String)),
         gql.Argument('share_iam_principals', gql.ArrayType(gql.String)),
+        gql.Argument('cursor', gql.String),
     ],
 )
 
@@ -2,11 +2,11 @@ import logging
 import re
 
 from dataall.base.api.context import Context
-from dataall.base.db.exceptions import RequiredParameter
+from dataall.base.db.exceptions import ObjectNotFound, RequiredParameter
 from dataall.core.environment.db.environment_models import Environment
 from dataall.core.environment.services.environment_service import EnvironmentService
 from dataall.modules.datasets_base.db.dataset_models import DatasetBase
-from dataall.modules.datasets_base.db.dataset_repositories import DatasetBaseRepository
+from dataall.modules.datasets_base.services.dataset_list_service import DatasetListService
 from dataall.modules.shares_base.services.shares_enums import ShareObjectPermission, PrincipalType
 from dataall.modules.shares_base.db.share_object_models import ShareObjectItem, ShareObject
 from dataall.modules.shares_base.services.share_item_service import ShareItemService
@@ -183,33 +183,34 @@ def get_share_logs(context, source, shareUri: str):
 def resolve_user_role(context: Context, source: ShareObject, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        dataset: DatasetBase = DatasetBaseRepository.get_dataset_by_uri(session, source.datasetUri)
-
-        can_approve = (
-            True
-            if (
-                dataset
-                and (
-                    dataset.stewards in context.groups
-                    or dataset.SamlAdminGroupName in context.groups
-                    or dataset.owner == context.username
-                )
+    dataset: DatasetBase = DatasetListService.dataset_loader().load(source.datasetUri)
+    if not dataset:
+        raise ObjectNotFound('Dataset', source.datasetUri)
+
+    can_approve = (
+        True
+        if (
+            dataset
+            and (
+                dataset.stewards in context.groups
+                or dataset.SamlAdminGroupName in context.groups
+                or dataset.owner == context.username
             )
-            else False
         )
+        else False
+    )
 
-        can_request = True if (source.owner == context.username or source.groupUri in context.groups) else False
+    can_request = True if (source.owner == context.username or source.groupUri in context.groups) else False
 
-        return (
-            ShareObjectPermission.ApproversAndRequesters.value
-            if can_approve and can_request
-            else ShareObjectPermission.Approvers.value
-            if can_approve
-            else ShareObjectPermission.Requesters.value
-            if can_request
-            else ShareObjectPermission.NoPermission.value
-        )
+    return (
+        ShareObjectPermission.ApproversAndRequesters.value
+        if can_approve and can_request
+        else ShareObjectPermission.Approvers.value
+        if can_approve
+        else ShareObjectPermission.Requesters.value
+        if can_request
+        else ShareObjectPermission.NoPermission.value
+    )
 
 
 def resolve_can_view_logs(context: Context, source: ShareObject):
@@ -223,23 +224,23 @@ def resolve_can_view_logs(context: Context, source: ShareObject):
 def resolve_dataset(context: Context, source: ShareObject, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        ds: DatasetBase = DatasetBaseRepository.get_dataset_by_uri(session, source.datasetUri)
-        if ds:
-            env: Environment = EnvironmentService.get_environment_by_uri(session, ds.environmentUri)
-            return {
-                'datasetUri': source.datasetUri,
-                'datasetName': ds.name if ds else 'NotFound',
-                'SamlAdminGroupName': ds.SamlAdminGroupName if ds else 'NotFound',
-                'environmentName': env.label if env else 'NotFound',
-                'AwsAccountId': env.AwsAccountId if env else 'NotFound',
-                'region': env.region if env else 'NotFound',
-                'exists': True if ds else False,
-                'description': ds.description,
-                'datasetType': ds.datasetType,
-                'enableExpiration': ds.enableExpiration,
-                'expirySetting': ds.expirySetting,
-            }
+    ds: DatasetBase = DatasetListService.dataset_loader().load(source.datasetUri)
+    if not ds:
+        raise ObjectNotFound('Dataset', source.datasetUri)
+    env: Environment = EnvironmentService.find_environment_by_uri_simplified(ds.environmentUri)
+    return {
+        'datasetUri': source.datasetUri,
+        'datasetName': ds.name if ds else 'NotFound',
+        'SamlAdminGroupName': ds.SamlAdminGroupName if ds else 'NotFound',
+        'environmentName': env.label if env else 'NotFound',
+        'AwsAccountId': env.AwsAccountId if env else 'NotFound',
+        'region': env.region if env else 'NotFound',
+        'exists': True if ds else False,
+        'description': ds.description,
+        'datasetType': ds.datasetType,
+        'enableExpiration': ds.enableExpiration,
+        'expirySetting': ds.expirySetting,
+    }
 
 
 def resolve_principal(context: Context, source: ShareObject, **kwargs):
@@ -248,7 +249,7 @@ def resolve_principal(context: Context, source: ShareObject, **kwargs):
 
     with context.engine.scoped_session() as session:
         if source.principalType in set(item.value for item in PrincipalType):
-            environment = EnvironmentService.get_environment_by_uri(session, source.environmentUri)
+            environment = EnvironmentService.find_environment_by_uri_simplified(source.environmentUri)
             if source.principalType == PrincipalType.ConsumptionRole.value:
                 principal = EnvironmentService.get_environment_consumption_principal(
                     session, source.principalId, source.environmentUri
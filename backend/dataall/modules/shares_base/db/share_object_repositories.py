@@ -4,7 +4,7 @@ from sqlalchemy.orm import Query
 from typing import List
 
 from dataall.base.db import exceptions, paginate
-from dataall.base.db.paginator import Page
+from dataall.base.db.paginator import Page, paginate_keyset
 from dataall.core.organizations.db.organization_models import Organization
 from dataall.core.environment.db.environment_models import Environment, EnvironmentGroup
 from dataall.modules.datasets_base.db.dataset_models import DatasetBase
@@ -220,6 +220,19 @@ class ShareObjectRepository:
     def list_all_active_share_objects(session) -> [ShareObject]:
         return session.query(ShareObject).filter(ShareObject.deleted.is_(None)).all()
 
+    @staticmethod
+    def get_share_objects_target_accounts(session, share_uris: List[str]) -> dict:
+        """Returns the AWS account of the target environment of the share objects by shareUri"""
+        if not share_uris:
+            return {}
+        rows = (
+            session.query(ShareObject.shareUri, Environment.AwsAccountId)
+            .join(Environment, Environment.environmentUri == ShareObject.environmentUri)
+            .filter(ShareObject.shareUri.in_(share_uris))
+            .all()
+        )
+        return {share_uri: account_id for share_uri, account_id in rows}
+
     @staticmethod
     def list_user_received_share_requests(session, username, groups, data=None):
         query = (
@@ -253,7 +266,7 @@ class ShareObjectRepository:
         if data and data.get('share_iam_principals'):
             if len(data.get('share_iam_principals')) > 0:
                 query = query.filter(ShareObject.principalName.in_(data.get('share_iam_principals')))
-        return paginate(query.order_by(ShareObject.shareUri), data.get('page', 1), data.get('pageSize', 10)).to_dict()
+        return ShareObjectRepository._paginate_share_requests(query, data)
 
     @staticmethod
     def list_user_sent_share_requests(session, username, groups, data=None):
@@ -292,6 +305,14 @@ class ShareObjectRepository:
         if data and data.get('share_iam_principals'):
             if len(data.get('share_iam_principals')) > 0:
                 query = query.filter(ShareObject.principalName.in_(data.get('share_iam_principals')))
+        return ShareObjectRepository._paginate_share_requests(query, data)
+
+    @staticmethod
+    def _paginate_share_requests(query, data):
+        if data and 'cursor' in data:
+            return paginate_keyset(
+                query, order_by=[ShareObject.shareUri], page_size=data.get('pageSize', 10), cursor=data['cursor']
+            ).to_dict()
         return paginate(query.order_by(ShareObject.shareUri), data.get('page', 1), data.get('pageSize', 10)).to_dict()
 
     @staticmethod
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from dataall.modules.shares_base.db.share_object_models import ShareObject
+from dataall.modules.shares_base.db.share_object_repositories import ShareObjectRepository
+from dataall.modules.shares_base.services.shares_enums import PrincipalType
+
+log = logging.getLogger(__name__)
+
+# number of shares processed concurrently
+MAX_WORKERS = 8
+# number of shares processed concurrently for the same target AWS account
+MAX_WORKERS_PER_ACCOUNT = 2
+
+
+@dataclass
+class ShareRunResult:
+    shareUri: str
+    datasetUri: str
+    principalId: str
+    success: bool
+    duration: float
+    error: str = None
+
+
+class ConcurrentShareRunner:
+    """
+    Runs a share action (verify, reapply...) for many share objects with a bounded pool of workers.
+    Shares are grouped by the dataset and principal locks they take: shares of the same dataset or of the same
+    principal, directly or through other shares, are processed by a single worker, ordered by dataset and principal,
+    so that the shares competing for the same locks do not block each other and consecutive shares
+    reuse the same AWS clients. At most max_workers_per_account shares of the same target account run
+    at the same time. Each worker thread gets its own DB session from engine.scoped_session.
+    """
+
+    def __init__(
+        self,
+        engine,
+        action: Callable[[object, str], bool],
+        max_workers: int = MAX_WORKERS,
+        max_workers_per_account: int = MAX_WORKERS_PER_ACCOUNT,
+    ):
+        self.engine = engine
+        self.action = action
+        self.max_workers = max_workers
+        self.max_workers_per_account = max_workers_per_account
+        self._account_semaphores: Dict[str, threading.Semaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.max_workers_per_account)
+        )
+        self._lock = threading.Lock()
+
+    def run(self, share_objects: List[ShareObject]) -> List[ShareRunResult]:
+        with self.engine.scoped_session() as session:
+            target_accounts = ShareObjectRepository.get_share_objects_target_accounts(
+                session, [share.shareUri for share in share_objects]
+            )
+            parents = {}
+
+            def find(node):
+                while parents.setdefault(node, node) != node:
+                    parents[node] = parents[parents[node]]
+                    node = parents[node]
+                return node
+
+            # union-find of the locks of the shares: the shares of a connected component share their locks
+            for share in share_objects:
+                parents[find(('dataset', share.datasetUri))] = find(('principal', self._principal_lock(share)))
+            groups = defaultdict(list)
+            for share in sorted(share_objects, key=lambda s: (s.datasetUri, s.principalId or '', s.shareUri)):
+                groups[find(('dataset', share.datasetUri))].append(
+                    (share.shareUri, share.datasetUri, share.principalId, target_accounts.get(share.shareUri))
+                )
+
+        results = []
+        if not groups:
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as executor:
+            futures = [executor.submit(self._run_group, group) for group in groups.values()]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+        failed = [result for result in results if not result.success]
+        slowest = sorted(results, key=lambda r: r.duration, reverse=True)[:10]
+        log.info(
+            f'Processed {len(results)} shares in {len(groups)} groups, {len(failed)} failed. '
+            f'Slowest shares: {[(r.shareUri, round(r.duration, 1)) for r in slowest]}'
+        )
+        return results
+
+    def _run_group(self, group) -> List[ShareRunResult]:
+        results = []
+        for share_uri, dataset_uri, principal_id, account in group:
+            with self._semaphore(account):
+                start = time.monotonic()
+                error = None
+                try:
+                    success = self.action(self.engine, share_uri) is not False
+                except Exception as e:
+                    log.exception(f'Failed to process share {share_uri}')
+                    success, error = False, str(e)
+                duration = time.monotonic() - start
+            log.info(f'Processed share {share_uri} of target account {account} in {duration:.1f}s')
+            results.append(ShareRunResult(share_uri, dataset_uri, principal_id, success, duration, error))
+        return results
+
+    @staticmethod
+    def _principal_lock(share) -> str:
+        """Uri of the principal resource locked by SharingService while it processes the share"""
+        if share.principalType in (PrincipalType.ConsumptionRole.value, PrincipalType.ConsumptionUser.value):
+            return share.principalId
+        return f'{share.principalId}-{share.environmentUri}'
+
+    def _semaphore(self, account) -> threading.Semaphore:
+        with self._lock:
+            return self._account_semaphores[account]
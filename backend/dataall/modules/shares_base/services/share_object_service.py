@@ -17,6 +17,7 @@ from dataall.core.tasks.service_handlers import Worker
 from dataall.modules.datasets_base.db.dataset_models import DatasetBase
 from dataall.modules.datasets_base.db.dataset_repositories import DatasetBaseRepository
 from dataall.modules.datasets_base.services.datasets_enums import DatasetTypes
+from dataall.modules.datasets_base.services.dataset_list_service import DatasetListService
 from dataall.modules.shares_base.db.share_object_models import ShareObjectItem, ShareObject
 from dataall.modules.shares_base.db.share_object_repositories import ShareObjectRepository
 from dataall.modules.shares_base.db.share_object_state_machines import (
@@ -704,23 +705,33 @@ class ShareObjectService:
     def list_shares_in_my_inbox(filter: dict):
         context = get_context()
         with context.db_engine.scoped_session() as session:
-            return ShareObjectRepository.list_user_received_share_requests(
+            page = ShareObjectRepository.list_user_received_share_requests(
                 session=session,
                 username=context.username,
                 groups=context.groups,
                 data=filter,
             )
+            ShareObjectService._prime_nested_fields(page['nodes'])
+            return page
 
     @staticmethod
     def list_shares_in_my_outbox(filter):
         context = get_context()
         with context.db_engine.scoped_session() as session:
-            return ShareObjectRepository.list_user_sent_share_requests(
+            page = ShareObjectRepository.list_user_sent_share_requests(
                 session=session,
                 username=context.username,
                 groups=context.groups,
                 data=filter,
             )
+            ShareObjectService._prime_nested_fields(page['nodes'])
+            return page
+
+    @staticmethod
+    def _prime_nested_fields(shares):
+        """Lets the dataset and principal resolvers of the listed shares load them with one query each"""
+        DatasetListService.dataset_loader().prime(share.datasetUri for share in shares)
+        EnvironmentService.environment_loader().prime(share.environmentUri for share in shares)
 
     @staticmethod
     def _run_transitions(session, share, share_items_states, action):
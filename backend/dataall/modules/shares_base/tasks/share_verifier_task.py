@@ -5,6 +5,11 @@ from dataall.modules.shares_base.db.share_object_repositories import ShareObject
 from dataall.modules.shares_base.db.share_object_models import ShareObject
 from dataall.modules.shares_base.services.shares_enums import ShareItemStatus
 from dataall.modules.shares_base.services.sharing_service import SharingService
+from dataall.modules.shares_base.services.concurrent_share_runner import (
+    ConcurrentShareRunner,
+    MAX_WORKERS,
+    MAX_WORKERS_PER_ACCOUNT,
+)
 from dataall.core.stacks.aws.ecs import Ecs
 
 from dataall.base.db import get_engine
@@ -14,25 +19,27 @@ from dataall.base.loader import load_modules, ImportMode
 log = logging.getLogger(__name__)
 
 
-def verify_shares(engine):
+def verify_shares(engine, max_workers=MAX_WORKERS, max_workers_per_account=MAX_WORKERS_PER_ACCOUNT):
     """
     A method used by the scheduled ECS Task to run verify_shares() process against ALL shared items in ALL
     active share objects within data.all and update the health status of those shared items.
+    Share objects are verified concurrently, see ConcurrentShareRunner.
     """
     with engine.scoped_session() as session:
-        processed_share_objects = []
         all_share_objects: [ShareObject] = ShareObjectRepository.list_all_active_share_objects(session)
         log.info(f'Found {len(all_share_objects)} share objects  verify ')
-        share_object: ShareObject
-        for share_object in all_share_objects:
-            log.info(
-                f'Verifying Share Items for Share Object with Requestor: {share_object.principalId} on Target Dataset: {share_object.datasetUri}'
-            )
-            processed_share_objects.append(share_object.shareUri)
-            SharingService.verify_share(
-                engine, share_uri=share_object.shareUri, status=ShareItemStatus.Share_Succeeded.value, healthStatus=None
-            )
-        return processed_share_objects
+
+    results = ConcurrentShareRunner(
+        engine, action=_verify_share, max_workers=max_workers, max_workers_per_account=max_workers_per_account
+    ).run(all_share_objects)
+    return [result.shareUri for result in results]
+
+
+def _verify_share(engine, share_uri):
+    log.info(f'Verifying Share Items for Share Object {share_uri}')
+    return SharingService.verify_share(
+        engine, share_uri=share_uri, status=ShareItemStatus.Share_Succeeded.value, healthStatus=None
+    )
 
 
 def trigger_reapply_task():
@@ -47,6 +54,10 @@ if __name__ == '__main__':
     load_modules(modes={ImportMode.SHARES_TASK})
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
-    processed_shares = verify_shares(engine=ENGINE)
+    processed_shares = verify_shares(
+        engine=ENGINE,
+        max_workers=int(os.environ.get('max_workers', MAX_WORKERS)),
+        max_workers_per_account=int(os.environ.get('max_workers_per_account', MAX_WORKERS_PER_ACCOUNT)),
+    )
     log.info(f'Finished verifying {len(processed_shares)} shares, triggering reapply...')
     trigger_reapply_task()
@@ -1,6 +1,8 @@
 import logging
 from datetime import datetime
 
+from sqlalchemy import func, or_
+
 from dataall.modules.vote.db import vote_models as models
 from dataall.base.context import get_context
 
@@ -59,6 +61,27 @@ class VoteRepository:
             .count()
         )
 
+    @staticmethod
+    def count_upvotes_by_target(session, target_uris, target_type) -> dict:
+        query = (
+            session.query(models.Vote.targetUri, func.count(models.Vote.voteUri))
+            .filter(
+                models.Vote.targetUri.in_(target_uris),
+                models.Vote.targetType == target_type,
+                models.Vote.upvote == True,
+            )
+            .group_by(models.Vote.targetUri)
+        )
+        return dict(query.all())
+
+    @staticmethod
+    def list_targets_voted_since(session, since: datetime, target_type) -> set:
+        query = session.query(models.Vote.targetUri).filter(
+            models.Vote.targetType == target_type,
+            or_(models.Vote.created >= since, models.Vote.updated >= since),
+        )
+        return {uri for (uri,) in query.distinct()}
+
     @staticmethod
     def delete_votes(session, target_uri, target_type) -> [models.Vote]:
         return (
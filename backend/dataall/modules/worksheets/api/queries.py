@@ -1,5 +1,11 @@
 from dataall.base.api import gql
-from dataall.modules.worksheets.api.resolvers import get_worksheet, list_worksheets, run_sql_query
+from dataall.modules.worksheets.api.resolvers import (
+    get_sql_query_results,
+    get_worksheet,
+    list_worksheets,
+    run_sql_query,
+    start_sql_query,
+)
 
 
 getWorksheet = gql.QueryField(
@@ -28,3 +34,29 @@ runAthenaSqlQuery = gql.QueryField(
     ],
     resolver=run_sql_query,
 )
+
+
+startAthenaSqlQuery = gql.QueryField(
+    name='startAthenaSqlQuery',
+    type=gql.Ref('AthenaQueryResultPage'),
+    args=[
+        gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='sqlQuery', type=gql.NonNullableType(gql.String)),
+    ],
+    resolver=start_sql_query,
+)
+
+
+getAthenaSqlQueryResults = gql.QueryField(
+    name='getAthenaSqlQueryResults',
+    type=gql.Ref('AthenaQueryResultPage'),
+    args=[
+        gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='athenaQueryId', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='nextToken', type=gql.String),
+        gql.Argument(name='pageSize', type=gql.Integer),
+    ],
+    resolver=get_sql_query_results,
+)
@@ -43,5 +43,29 @@ def run_sql_query(context: Context, source, environmentUri: str = None, workshee
     return WorksheetService.run_sql_query(uri=environmentUri, worksheetUri=worksheetUri, sqlQuery=sqlQuery)
 
 
+def start_sql_query(
+    context: Context, source, environmentUri: str = None, worksheetUri: str = None, sqlQuery: str = None
+):
+    return WorksheetService.start_sql_query(uri=environmentUri, worksheetUri=worksheetUri, sqlQuery=sqlQuery)
+
+
+def get_sql_query_results(
+    context: Context,
+    source,
+    environmentUri: str = None,
+    worksheetUri: str = None,
+    athenaQueryId: str = None,
+    nextToken: str = None,
+    pageSize: int = None,
+):
+    return WorksheetService.get_sql_query_results(
+        uri=environmentUri,
+        worksheetUri=worksheetUri,
+        athenaQueryId=athenaQueryId,
+        nextToken=nextToken,
+        pageSize=pageSize,
+    )
+
+
 def delete_worksheet(context, source, worksheetUri: str = None):
     return WorksheetService.delete_worksheet(uri=worksheetUri)
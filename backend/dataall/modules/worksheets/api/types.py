@@ -42,6 +42,21 @@ AthenaQueryResult = gql.ObjectType(
 )
 
 
+AthenaQueryResultPage = gql.ObjectType(
+    name='AthenaQueryResultPage',
+    fields=[
+        gql.Field(name='AthenaQueryId', type=gql.String),
+        gql.Field(name='Status', type=gql.String),
+        gql.Field(name='Error', type=gql.String),
+        gql.Field(name='ElapsedTimeInMs', type=gql.Integer),
+        gql.Field(name='DataScannedInBytes', type=gql.Integer),
+        gql.Field(name='columns', type=gql.ArrayType(gql.Ref('AthenaResultColumnDescriptor'))),
+        gql.Field(name='records', type=gql.ArrayType(gql.ArrayType(gql.String))),
+        gql.Field(name='nextToken', type=gql.String),
+    ],
+)
+
+
 Worksheet = gql.ObjectType(
     name='Worksheet',
     fields=[
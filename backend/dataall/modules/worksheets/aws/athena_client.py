@@ -1,14 +1,28 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+
 from pyathena import connect
 from dataall.base.aws.sts import SessionHelper
 
 
+class UnknownQueryError(Exception):
+    """The query was not run by the team the results are requested for"""
+
+
 class AthenaClient:
     """Makes requests to AWS Athena"""
 
     @staticmethod
-    def run_athena_query(aws_account_id, env_group, s3_staging_dir, region, sql=None):
+    def _get_session(aws_account_id, env_group, region):
         base_session = SessionHelper.remote_session(accountid=aws_account_id, region=region)
-        boto3_session = SessionHelper.get_session(base_session=base_session, role_arn=env_group.environmentIAMRoleArn)
+        return SessionHelper.get_session(base_session=base_session, role_arn=env_group.environmentIAMRoleArn)
+
+    @staticmethod
+    def run_athena_query(aws_account_id, env_group, s3_staging_dir, region, sql=None):
+        boto3_session = AthenaClient._get_session(aws_account_id, env_group, region)
         creds = boto3_session.get_credentials()
         connection = connect(
             aws_access_key_id=creds.access_key,
@@ -24,13 +38,13 @@ class AthenaClient:
         return cursor
 
     @staticmethod
-    def convert_query_output(cursor):
+    def convert_query_output(cursor, max_rows=None):
         columns = []
         for f in cursor.description:
             columns.append({'columnName': f[0], 'typeName': 'String'})
 
         rows = []
-        for row in cursor:
+        for row in cursor.fetchmany(max_rows) if max_rows else cursor:
             record = {'cells': []}
             for col_position, column in enumerate(columns):
                 cell = {}
@@ -46,3 +60,101 @@ class AthenaClient:
             'rows': rows,
             'columns': columns,
         }
+
+    @staticmethod
+    def start_athena_query(aws_account_id, env_group, s3_staging_dir, region, sql) -> str:
+        """Starts the query without waiting for it to complete and returns its execution id"""
+        client = AthenaClient._get_session(aws_account_id, env_group, region).client('athena', region_name=region)
+        response = client.start_query_execution(
+            QueryString=sql,
+            WorkGroup=env_group.environmentAthenaWorkGroup,
+            ResultConfiguration={'OutputLocation': s3_staging_dir},
+        )
+        return response['QueryExecutionId']
+
+    @staticmethod
+    def get_athena_query_results(
+        aws_account_id, env_group, region, query_id, token_key: bytes, next_token=None, page_size=100, max_rows=None
+    ):
+        """
+        Returns the status of the query and, once it succeeded, a page of its results: the columns once and the rows
+        as arrays of values. next_token is the nextToken of the previous page, None for the first page.
+        No more pages are returned once max_rows rows have been returned.
+        The tokens are signed with token_key, a ValueError is raised for tokens that were not returned for the query.
+        An UnknownQueryError is raised for queries that were not run in the work group of env_group.
+        """
+        client = AthenaClient._get_session(aws_account_id, env_group, region).client('athena', region_name=region)
+        execution = client.get_query_execution(QueryExecutionId=query_id)['QueryExecution']
+        if execution.get('WorkGroup') != env_group.environmentAthenaWorkGroup:
+            # the queries of the worksheets of the team are all run in its work group
+            raise UnknownQueryError(f'Query {query_id} was not run in {env_group.environmentAthenaWorkGroup}')
+        status = execution['Status']
+        statistics = execution.get('Statistics', {})
+        result = {
+            'AthenaQueryId': query_id,
+            'Status': status['State'],
+            'Error': status.get('StateChangeReason') if status['State'] in ('FAILED', 'CANCELLED') else None,
+            'ElapsedTimeInMs': statistics.get('TotalExecutionTimeInMillis'),
+            'DataScannedInBytes': statistics.get('DataScannedInBytes'),
+            'columns': [],
+            'records': [],
+            'nextToken': None,
+        }
+        if status['State'] != 'SUCCEEDED':
+            return result
+
+        athena_token, returned_rows = AthenaClient._decode_token(next_token, query_id, token_key, max_rows)
+        if max_rows:
+            page_size = min(page_size, max_rows - returned_rows)
+        kwargs = {'QueryExecutionId': query_id, 'MaxResults': page_size}
+        if athena_token:
+            kwargs['NextToken'] = athena_token
+        # the first page of the results of a SELECT starts with a row of column names
+        header = not athena_token and execution.get('StatementType') == 'DML'
+        if header:
+            kwargs['MaxResults'] = min(page_size + 1, 1000)
+        response = client.get_query_results(**kwargs)
+
+        rows = response['ResultSet']['Rows'][1:] if header else response['ResultSet']['Rows']
+        result['columns'] = [
+            {'columnName': column['Name'], 'typeName': column['Type']}
+            for column in response['ResultSet']['ResultSetMetadata']['ColumnInfo']
+        ]
+        result['records'] = [[cell.get('VarCharValue') for cell in row['Data']] for row in rows]
+        returned_rows += len(rows)
+        if response.get('NextToken') and (not max_rows or returned_rows < max_rows):
+            result['nextToken'] = AthenaClient._encode_token(response['NextToken'], returned_rows, query_id, token_key)
+        return result
+
+    @staticmethod
+    def _token_signature(athena_token, returned_rows, query_id, token_key: bytes) -> str:
+        message = json.dumps([query_id, athena_token, returned_rows]).encode()
+        return hmac.new(token_key, message, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _encode_token(athena_token, returned_rows, query_id, token_key: bytes) -> str:
+        signature = AthenaClient._token_signature(athena_token, returned_rows, query_id, token_key)
+        return base64.urlsafe_b64encode(json.dumps([athena_token, returned_rows, signature]).encode()).decode()
+
+    @staticmethod
+    def _decode_token(token, query_id, token_key: bytes, max_rows=None):
+        """Returns the Athena token and the number of rows returned so far of a token returned by _encode_token"""
+        if not token:
+            return None, 0
+        try:
+            athena_token, returned_rows, signature = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except (TypeError, ValueError, binascii.Error) as e:
+            raise ValueError(f'Malformed token: {e}')
+        if (
+            not isinstance(athena_token, str)
+            or not isinstance(returned_rows, int)
+            or isinstance(returned_rows, bool)
+            or not isinstance(signature, str)
+        ):
+            raise ValueError('Malformed token')
+        expected = AthenaClient._token_signature(athena_token, returned_rows, query_id, token_key)
+        if not hmac.compare_digest(signature, expected):
+            raise ValueError('Invalid token signature')
+        if returned_rows < 0 or (max_rows and returned_rows >= max_rows):
+            raise ValueError(f'Invalid number of returned rows {returned_rows}')
+        return athena_token, returned_rows
@@ -1,12 +1,14 @@
+import hashlib
 import logging
 
 from dataall.core.activity.db.activity_models import Activity
 from dataall.core.environment.services.environment_service import EnvironmentService
+from dataall.base.config import config
 from dataall.base.db import exceptions
 from dataall.base.context import get_context
 from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
 from dataall.core.permissions.services.tenant_policy_service import TenantPolicyService
-from dataall.modules.worksheets.aws.athena_client import AthenaClient
+from dataall.modules.worksheets.aws.athena_client import AthenaClient, UnknownQueryError
 from dataall.modules.worksheets.db.worksheet_models import Worksheet
 from dataall.modules.worksheets.db.worksheet_repositories import WorksheetRepository
 from dataall.modules.worksheets.services.worksheet_permissions import (
@@ -21,6 +23,10 @@ from dataall.modules.worksheets.services.worksheet_permissions import (
 
 logger = logging.getLogger(__name__)
 
+RESULTS_PAGE_SIZE = 100
+MAX_RESULTS_PAGE_SIZE = 999  # GetQueryResults returns at most 1000 rows, including the header row
+MAX_RESULT_ROWS = 10000
+
 
 class WorksheetService:
     @staticmethod
@@ -135,19 +141,76 @@ class WorksheetService:
     @ResourcePolicyService.has_resource_permission(GET_WORKSHEET, param_name='worksheetUri')
     def run_sql_query(uri, worksheetUri, sqlQuery):
         with get_context().db_engine.scoped_session() as session:
-            environment = EnvironmentService.get_environment_by_uri(session, uri)
-            worksheet = WorksheetService._get_worksheet_by_uri(session, worksheetUri)
-
-            env_group = EnvironmentService.get_environment_group(
-                session, worksheet.SamlAdminGroupName, environment.environmentUri
+            environment, env_group = WorksheetService._get_query_environment(session, uri, worksheetUri)
+            cursor = AthenaClient.run_athena_query(
+                aws_account_id=environment.AwsAccountId,
+                env_group=env_group,
+                s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{env_group.environmentAthenaWorkGroup}/',
+                region=environment.region,
+                sql=sqlQuery,
             )
 
-            cursor = AthenaClient.run_athena_query(
+            return AthenaClient.convert_query_output(cursor, max_rows=WorksheetService._max_result_rows())
+
+    @staticmethod
+    @TenantPolicyService.has_tenant_permission(MANAGE_WORKSHEETS)
+    @ResourcePolicyService.has_resource_permission(RUN_ATHENA_QUERY)
+    @ResourcePolicyService.has_resource_permission(GET_WORKSHEET, param_name='worksheetUri')
+    def start_sql_query(uri, worksheetUri, sqlQuery):
+        """Starts the query and returns its execution id right away, results are fetched with get_sql_query_results"""
+        with get_context().db_engine.scoped_session() as session:
+            environment, env_group = WorksheetService._get_query_environment(session, uri, worksheetUri)
+            query_id = AthenaClient.start_athena_query(
                 aws_account_id=environment.AwsAccountId,
                 env_group=env_group,
                 s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{env_group.environmentAthenaWorkGroup}/',
                 region=environment.region,
                 sql=sqlQuery,
             )
+            return {'AthenaQueryId': query_id, 'Status': 'QUEUED'}
 
-            return AthenaClient.convert_query_output(cursor)
+    @staticmethod
+    @TenantPolicyService.has_tenant_permission(MANAGE_WORKSHEETS)
+    @ResourcePolicyService.has_resource_permission(RUN_ATHENA_QUERY)
+    @ResourcePolicyService.has_resource_permission(GET_WORKSHEET, param_name='worksheetUri')
+    def get_sql_query_results(uri, worksheetUri, athenaQueryId, nextToken=None, pageSize=None):
+        """Returns the status of the query and a page of its results once it succeeded"""
+        page_size = pageSize or RESULTS_PAGE_SIZE
+        if not 0 < page_size <= MAX_RESULTS_PAGE_SIZE:
+            raise exceptions.InvalidInput('pageSize', page_size, f'between 1 and {MAX_RESULTS_PAGE_SIZE}')
+        with get_context().db_engine.scoped_session() as session:
+            environment, env_group = WorksheetService._get_query_environment(session, uri, worksheetUri)
+            try:
+                return AthenaClient.get_athena_query_results(
+                    aws_account_id=environment.AwsAccountId,
+                    env_group=env_group,
+                    region=environment.region,
+                    query_id=athenaQueryId,
+                    token_key=WorksheetService._results_token_key(),
+                    next_token=nextToken,
+                    page_size=page_size,
+                    max_rows=WorksheetService._max_result_rows(),
+                )
+            except UnknownQueryError:
+                raise exceptions.InvalidInput('athenaQueryId', athenaQueryId, 'a query started from the worksheet')
+            except ValueError:
+                raise exceptions.InvalidInput('nextToken', nextToken, 'a token returned with the previous page')
+
+    @staticmethod
+    def _get_query_environment(session, uri, worksheet_uri):
+        environment = EnvironmentService.get_environment_by_uri(session, uri)
+        worksheet = WorksheetService._get_worksheet_by_uri(session, worksheet_uri)
+        env_group = EnvironmentService.get_environment_group(
+            session, worksheet.SamlAdminGroupName, environment.environmentUri
+        )
+        return environment, env_group
+
+    @staticmethod
+    def _results_token_key() -> bytes:
+        """Key of the results page tokens, derived from the database credentials that only the backend knows"""
+        url = get_context().db_engine.engine.url
+        return hashlib.sha256(f'worksheet-results-token:{url.username}:{url.password}'.encode()).digest()
+
+    @staticmethod
+    def _max_result_rows():
+        return config.get_property('modules.worksheets.features.max_result_rows', MAX_RESULT_ROWS)
@@ -0,0 +1,31 @@
+"""catalog_indexer_state
+
+Revision ID: 5a1c9d3e7f21
+Revises: 2258cd8d6e9f
+Create Date: 2026-10-17 10:12:41.118250
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a1c9d3e7f21'
+down_revision = '2258cd8d6e9f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'catalog_indexer_state',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('lastIndexed', sa.DateTime(), nullable=True),
+        sa.Column('lastFullIndexed', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_indexer_state')
@@ -0,0 +1,25 @@
+"""s3_dataset_glue_tables_version
+
+Revision ID: 7d2e4b9c1a06
+Revises: 5a1c9d3e7f21
+Create Date: 2026-10-17 14:03:27.502114
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e4b9c1a06'
+down_revision = '5a1c9d3e7f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('s3_dataset', sa.Column('GlueTablesVersion', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('s3_dataset', 'GlueTablesVersion')
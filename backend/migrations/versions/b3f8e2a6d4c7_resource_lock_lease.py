@@ -0,0 +1,40 @@
+"""resource_lock_lease
+
+Revision ID: b3f8e2a6d4c7
+Revises: 7d2e4b9c1a06
+Create Date: 2026-10-17 16:21:48.930115
+
+"""
+
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f8e2a6d4c7'
+down_revision = '7d2e4b9c1a06'
+branch_labels = None
+depends_on = None
+
+# seconds of lease given to the locks existing before the migration, as the LOCK_LEASE of resource_lock_repositories
+LOCK_LEASE = 300
+
+
+def upgrade():
+    op.add_column('resource_lock', sa.Column('acquiredAt', sa.DateTime(), nullable=True))
+    op.add_column('resource_lock', sa.Column('expiresAt', sa.DateTime(), nullable=True))
+    # the existing locks get a lease too, otherwise the locks left by dead tasks would never expire
+    resource_lock = sa.table('resource_lock', sa.column('acquiredAt', sa.DateTime), sa.column('expiresAt', sa.DateTime))
+    now = datetime.utcnow()
+    op.execute(
+        resource_lock.update()
+        .where(resource_lock.c.expiresAt.is_(None))
+        .values(acquiredAt=now, expiresAt=now + timedelta(seconds=LOCK_LEASE))
+    )
+
+
+def downgrade():
+    op.drop_column('resource_lock', 'expiresAt')
+    op.drop_column('resource_lock', 'acquiredAt')
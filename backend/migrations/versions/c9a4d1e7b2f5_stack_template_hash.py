@@ -0,0 +1,25 @@
+"""stack_template_hash
+
+Revision ID: c9a4d1e7b2f5
+Revises: b3f8e2a6d4c7
+Create Date: 2026-10-17 17:05:12.348671
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9a4d1e7b2f5'
+down_revision = 'b3f8e2a6d4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('stack', sa.Column('templateHash', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('stack', 'templateHash')
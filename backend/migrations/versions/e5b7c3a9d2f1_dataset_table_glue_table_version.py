@@ -0,0 +1,25 @@
+"""dataset_table_glue_table_version
+
+Revision ID: e5b7c3a9d2f1
+Revises: c9a4d1e7b2f5
+Create Date: 2026-10-17 19:42:08.615203
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c3a9d2f1'
+down_revision = 'c9a4d1e7b2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('dataset_table', sa.Column('GlueTableVersion', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('dataset_table', 'GlueTableVersion')
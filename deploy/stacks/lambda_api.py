@@ -226,7 +226,8 @@ class LambdaApiStack(pyNestedClass):
         self.aws_handler.add_event_source(
             lambda_event_sources.SqsEventSource(
                 queue=sqs_queue,
-                batch_size=1,
+                batch_size=10,
+                report_batch_item_failures=True,
             )
         )
 
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.api.dataloader import get_dataloader
+from dataall.base.context import RequestContext, _request_storage, set_context
+
+
+@pytest.fixture
+def request_context():
+    previous = getattr(_request_storage, 'context', None)
+    set_context(RequestContext(db_engine=MagicMock(), username='alice', groups=['admins'], user_id='alice'))
+    yield
+    set_context(previous)
+
+
+@pytest.fixture
+def batch_load():
+    rows = {uri: SimpleNamespace(uri=uri) for uri in ('uri1', 'uri2', 'uri3')}
+    return MagicMock(side_effect=lambda session, keys: [rows[key] for key in keys if key in rows])
+
+
+def test_primed_keys_are_loaded_with_one_query(request_context, batch_load):
+    loader = get_dataloader('test', batch_load, key=lambda item: item.uri)
+    loader.prime(['uri1', 'uri2', 'uri3'])
+    assert loader.load('uri1').uri == 'uri1'
+    assert loader.load('uri2').uri == 'uri2'
+    assert loader.load('uri3').uri == 'uri3'
+    assert batch_load.call_count == 1
+
+
+def test_missing_keys_are_cached_as_none(request_context, batch_load):
+    loader = get_dataloader('test', batch_load, key=lambda item: item.uri)
+    assert loader.load_many(['uri1', 'unknown']) == [loader.load('uri1'), None]
+    assert loader.load('unknown') is None
+    assert batch_load.call_count == 1
+
+
+def test_loaders_are_shared_within_a_request(request_context, batch_load):
+    get_dataloader('test', batch_load, key=lambda item: item.uri).load('uri1')
+    get_dataloader('test', batch_load, key=lambda item: item.uri).load('uri1')
+    assert batch_load.call_count == 1
+
+    set_context(RequestContext(db_engine=MagicMock(), username='bob', groups=['admins'], user_id='bob'))
+    get_dataloader('test', batch_load, key=lambda item: item.uri).load('uri1')
+    assert batch_load.call_count == 2
@@ -0,0 +1,71 @@
+import pytest
+from ariadne import QueryType, graphql_sync, make_executable_schema
+from graphql import GraphQLError, GraphQLSyntaxError
+
+from dataall.base.api import document_cache as document_cache_module
+from dataall.base.api.document_cache import DocumentCache, PersistedQueryNotFound
+
+QUERY = 'query hello { hello }'
+
+
+@pytest.fixture
+def schema():
+    query = QueryType()
+    query.set_field('hello', lambda *_: 'world')
+    return make_executable_schema('type Query { hello: String }', query)
+
+
+def _execute(cache, schema, data):
+    return graphql_sync(
+        schema, data, query_parser=cache.query_parser, query_validator=cache.query_validator, introspection=False
+    )
+
+
+def test_documents_are_parsed_and_validated_once(schema, mocker):
+    validate = mocker.spy(document_cache_module, 'validate')
+    cache = DocumentCache()
+    for _ in range(3):
+        success, result = _execute(cache, schema, {'query': QUERY})
+        assert success
+        assert result['data'] == {'hello': 'world'}
+
+    assert cache.misses == 1
+    assert cache.hits == 2
+    assert validate.call_count == 1
+
+
+def test_invalid_documents_are_validated_again(schema):
+    cache = DocumentCache()
+    for _ in range(2):
+        success, result = _execute(cache, schema, {'query': '{ unknown }'})
+        assert not success
+    assert cache.hits == 1
+
+    with pytest.raises(GraphQLSyntaxError):
+        cache.parse('{ hello')
+
+
+def test_least_recently_used_documents_are_evicted():
+    cache = DocumentCache(max_size=2)
+    first = cache.parse('{ a }')
+    cache.parse('{ b }')
+    assert cache.parse('{ a }') is first
+    cache.parse('{ c }')
+    assert cache.parse('{ a }') is first
+    assert cache.misses == 3
+    cache.parse('{ b }')
+    assert cache.misses == 4
+
+
+def test_persisted_queries(schema):
+    cache = DocumentCache()
+    extensions = {'persistedQuery': {'version': 1, 'sha256Hash': DocumentCache.query_hash(QUERY)}}
+    with pytest.raises(PersistedQueryNotFound):
+        cache.resolve_persisted_query({'extensions': extensions})
+
+    _execute(cache, schema, cache.resolve_persisted_query({'query': QUERY, 'extensions': extensions}))
+    data = cache.resolve_persisted_query({'extensions': extensions})
+    assert data['query'] == QUERY
+
+    with pytest.raises(GraphQLError):
+        cache.resolve_persisted_query({'query': '{ hello }', 'extensions': extensions})
@@ -0,0 +1,19 @@
+from graphql import print_schema
+
+from dataall.base.api import bootstrap, get_executable_schema, read_schema_sdl
+
+
+def test_executable_schema_from_precomputed_sdl(tmp_path):
+    schema = bootstrap()
+    path = tmp_path / 'schema.graphql'
+    path.write_text(schema.gql(with_directives=False))
+
+    executable_schema = get_executable_schema(schema, type_defs=read_schema_sdl(str(path)))
+
+    assert print_schema(executable_schema) == print_schema(get_executable_schema(schema))
+    assert executable_schema.query_type.fields['getEnvironment'].resolve is not None
+
+
+def test_missing_sdl_is_generated(tmp_path):
+    assert read_schema_sdl(str(tmp_path / 'missing.graphql')) is None
+    assert read_schema_sdl(None) is None
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from dataall.base.aws.sqs import SqsQueue
+from dataall.base.context import RequestContext, dispose_context, set_context
+from dataall.core.tasks.db.task_models import Task
+
+
+@pytest.fixture
+def sqs_client(mocker):
+    client = mocker.MagicMock()
+    client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+    mocker.patch.object(SqsQueue, 'queue_url', 'https://sqs/queue.fifo')
+    mocker.patch.object(SqsQueue, 'disabled', False)
+    mocker.patch.object(SqsQueue, '_client', client)
+    mocker.patch.object(SqsQueue, '_recently_sent', {})
+    yield client
+
+
+@pytest.fixture
+def request_context(db):
+    set_context(RequestContext(db, 'alice', ['g'], 'alice'))
+    yield
+    dispose_context()
+
+
+def _create_tasks(db, tasks):
+    with db.scoped_session() as session:
+        tasks = [Task(action=action, targetUri=target, payload={}) for action, target in tasks]
+        session.add_all(tasks)
+        session.commit()
+        return [task.taskUri for task in tasks]
+
+
+def test_tasks_of_a_request_are_sent_in_batches(db, sqs_client, request_context):
+    task_ids = _create_tasks(db, [('test.sqs.action', f'target{i % 3}') for i in range(12)])
+    for task_id in task_ids:
+        SqsQueue.send(db, [task_id])
+    sqs_client.send_message_batch.assert_not_called()
+
+    SqsQueue.flush()
+
+    batches = [call.kwargs['Entries'] for call in sqs_client.send_message_batch.call_args_list]
+    assert [len(batch) for batch in batches] == [10, 2]
+    entries = batches[0] + batches[1]
+    assert [json.loads(entry['MessageBody']) for entry in entries] == [[task_id] for task_id in task_ids]
+    assert [entry['MessageGroupId'] for entry in entries] == [f'target{i % 3}' for i in range(12)]
+    SqsQueue.flush()
+    assert sqs_client.send_message_batch.call_count == 2
+
+
+def test_duplicate_describe_tasks_are_coalesced(db, sqs_client):
+    action = 'cloudformation.stack.describe_resources'
+    task_ids = _create_tasks(db, [(action, 'stack1'), (action, 'stack1'), (action, 'stack2')])
+    SqsQueue.send(db, task_ids[:2])
+    SqsQueue.send(db, task_ids[2:])
+
+    sent = [
+        json.loads(entry['MessageBody'])[0]
+        for call in sqs_client.send_message_batch.call_args_list
+        for entry in call.kwargs['Entries']
+    ]
+    assert sent == [task_ids[0], task_ids[2]]
+    with db.scoped_session() as session:
+        task = session.query(Task).get(task_ids[1])
+        assert task.status == 'completed'
+        assert task.response == {'coalescedWith': task_ids[0]}
+
+
+def test_failed_tasks_are_retried_once_then_marked_failed(db, sqs_client):
+    action = 'cloudformation.stack.describe_resources'
+    task_ids = _create_tasks(db, [(action, 'stack3'), (action, 'stack3'), ('test.sqs.action', 'target')])
+    sqs_client.send_message_batch.side_effect = lambda QueueUrl, Entries: {
+        'Failed': [
+            {'Id': entry['Id'], 'Code': 'InternalError'} for entry in Entries if 'stack3' in entry['MessageGroupId']
+        ]
+    }
+
+    with pytest.raises(Exception):
+        SqsQueue.send(db, task_ids)
+
+    assert [len(call.kwargs['Entries']) for call in sqs_client.send_message_batch.call_args_list] == [2, 1]
+    with db.scoped_session() as session:
+        tasks = {task.taskUri: task for task in session.query(Task).filter(Task.taskUri.in_(task_ids))}
+        assert tasks[task_ids[0]].status == 'failed'
+        assert tasks[task_ids[1]].status == 'failed'
+        assert tasks[task_ids[2]].status == 'pending'
+
+    # the describe task that was not sent does not coalesce the next ones
+    sqs_client.send_message_batch.side_effect = None
+    retry_ids = _create_tasks(db, [(action, 'stack3')])
+    SqsQueue.send(db, retry_ids)
+    assert json.loads(sqs_client.send_message_batch.call_args.kwargs['Entries'][0]['MessageBody']) == retry_ids
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.base.aws.sts import SessionHelper
+
+ROLE_ARN = 'arn:aws:iam::111111111111:role/dataallPivotRole'
+
+
+def _credentials(expires_in):
+    return {
+        'AccessKeyId': 'AKIA',
+        'SecretAccessKey': 'secret',
+        'SessionToken': 'token',
+        'Expiration': datetime.now(timezone.utc) + expires_in,
+    }
+
+
+@pytest.fixture
+def base_session(mocker):
+    SessionHelper.clear_credential_cache()
+    mocker.patch.object(SessionHelper, '_get_parameter_value', return_value='external-id')
+    session = MagicMock()
+    session.client.return_value.assume_role.return_value = {'Credentials': _credentials(timedelta(hours=1))}
+    yield session
+    SessionHelper.clear_credential_cache()
+
+
+def test_get_session_reuses_cached_credentials(base_session):
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+
+    assert base_session.client.return_value.assume_role.call_count == 1
+    assert SessionHelper._get_parameter_value.call_count == 1
+    assert SessionHelper.get_credential_cache_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_get_session_refreshes_expiring_credentials(base_session):
+    base_session.client.return_value.assume_role.return_value = {'Credentials': _credentials(timedelta(minutes=2))}
+
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+
+    assert base_session.client.return_value.assume_role.call_count == 2
+    assert SessionHelper.get_credential_cache_stats()['misses'] == 2
+
+
+def test_get_session_caches_per_role(base_session):
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+    SessionHelper.get_session(base_session=base_session, role_arn='arn:aws:iam::222222222222:role/dataallPivotRole')
+
+    assert base_session.client.return_value.assume_role.call_count == 2
+    assert SessionHelper.get_credential_cache_stats()['size'] == 2
+
+
+def test_remote_session_clients_are_cached(base_session):
+    SessionHelper.clear_client_cache()
+    first = SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN).client(
+        'iam', region_name='eu-west-1'
+    )
+    second = SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN).client(
+        'iam', region_name='eu-west-1'
+    )
+    other_region = SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN).client(
+        'iam', region_name='us-east-1'
+    )
+
+    assert first is second
+    assert first is not other_region
+    assert first.meta.config.retries['mode'] == 'adaptive'
+    assert SessionHelper.get_client_cache_stats() == {'hits': 1, 'misses': 2, 'size': 2}
+    SessionHelper.clear_client_cache()
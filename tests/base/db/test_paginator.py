@@ -0,0 +1,87 @@
+import pytest
+
+from dataall.base.db.paginator import CountMode, count, paginate, paginate_keyset
+from dataall.core.organizations.db.organization_models import Organization, OrganizationGroup
+
+
+@pytest.fixture(scope='module')
+def organizations(db):
+    with db.scoped_session() as session:
+        for i in range(5):
+            org = Organization(label=f'org{i}', owner='alice', SamlGroupName='admins')
+            session.add(org)
+            session.flush()
+            # 2 groups per organization, joining them duplicates organization rows
+            session.add(OrganizationGroup(organizationUri=org.organizationUri, groupUri='admins'))
+            session.add(OrganizationGroup(organizationUri=org.organizationUri, groupUri='readers'))
+    yield
+
+
+def _orgs_with_groups(session):
+    return session.query(Organization).join(
+        OrganizationGroup, OrganizationGroup.organizationUri == Organization.organizationUri
+    )
+
+
+def test_count_deduplicates_entities(db, organizations):
+    with db.scoped_session() as session:
+        query = _orgs_with_groups(session)
+        assert len(query.all()) == 5
+        assert count(query) == 5
+        assert count(query.union(session.query(Organization))) == 5
+
+
+def test_count_columns(db, organizations):
+    with db.scoped_session() as session:
+        query = _orgs_with_groups(session).with_entities(Organization.label, OrganizationGroup.groupUri)
+        assert count(query) == len(query.all()) == 10
+        assert count(session.query(OrganizationGroup)) == 10
+
+
+def test_paginate(db, organizations):
+    with db.scoped_session() as session:
+        query = _orgs_with_groups(session).order_by(Organization.label).distinct()
+        page = paginate(query, page=2, page_size=2).to_dict()
+        assert [org.label for org in page['nodes']] == ['org2', 'org3']
+        assert page['count'] == 5
+        assert page['pages'] == 3
+        assert page['hasNext']
+
+
+@pytest.mark.parametrize('count_mode', [CountMode.NONE, CountMode.ESTIMATE])
+def test_paginate_without_count(db, organizations, count_mode):
+    with db.scoped_session() as session:
+        query = session.query(Organization).order_by(Organization.label)
+        page = paginate(query, page=2, page_size=2, count_mode=count_mode).to_dict()
+        assert [org.label for org in page['nodes']] == ['org2', 'org3']
+        assert page['hasNext']
+        assert page['count'] >= 5
+
+        last_page = paginate(query, page=3, page_size=2, count_mode=count_mode).to_dict()
+        assert not last_page['hasNext']
+
+
+def test_paginate_keyset(db, organizations):
+    with db.scoped_session() as session:
+        query = session.query(Organization)
+        order_by = [Organization.label.desc(), Organization.organizationUri]
+        labels = []
+        cursor = None
+        while True:
+            page = paginate_keyset(query, order_by, page_size=2, cursor=cursor).to_dict()
+            labels += [org.label for org in page['nodes']]
+            cursor = page['nextCursor']
+            if not page['hasNext']:
+                break
+        assert labels == ['org4', 'org3', 'org2', 'org1', 'org0']
+
+
+def test_paginate_keyset_datetime_cursor(db, organizations):
+    with db.scoped_session() as session:
+        query = session.query(Organization)
+        order_by = [Organization.created, Organization.organizationUri]
+        first = paginate_keyset(query, order_by, page_size=3).to_dict()
+        second = paginate_keyset(query, order_by, page_size=3, cursor=first['nextCursor']).to_dict()
+        assert len(first['nodes']) == 3
+        assert len(second['nodes']) == 2
+        assert not {org.organizationUri for org in first['nodes']} & {org.organizationUri for org in second['nodes']}
@@ -0,0 +1,43 @@
+import threading
+
+from sqlalchemy.pool import NullPool
+
+from dataall.base.db import Engine, PoolConfig
+from dataall.base.loader import ImportMode
+
+
+def test_pool_config_per_import_mode(monkeypatch):
+    monkeypatch.delenv('DB_POOL_MODE', raising=False)
+    monkeypatch.delenv('DB_POOL_POOL_SIZE', raising=False)
+    assert PoolConfig.for_import_modes(set()) == PoolConfig()
+    assert PoolConfig.for_import_modes({ImportMode.API}).pool_size == 1
+    assert PoolConfig.for_import_modes({ImportMode.API, ImportMode.SHARES_TASK}).pool_size == 8
+
+
+def test_pool_config_env_overrides(monkeypatch):
+    monkeypatch.setenv('DB_POOL_MODE', 'null')
+    monkeypatch.setenv('DB_POOL_POOL_SIZE', '3')
+    monkeypatch.setenv('DB_POOL_POOL_PRE_PING', 'false')
+    config = PoolConfig.for_import_modes({ImportMode.API})
+    assert config == PoolConfig(mode='null', pool_size=3, max_overflow=2, pool_pre_ping=False)
+    assert config.engine_kwargs() == {'poolclass': NullPool, 'pool_pre_ping': False}
+
+
+def test_sessions_are_scoped_per_thread(db):
+    engine = Engine(db.dbconfig, pool_config=PoolConfig(session_scope='thread'))
+    sessions = {}
+
+    def scoped(name):
+        with engine.scoped_session() as session:
+            with engine.scoped_session() as nested:
+                assert nested is session
+            sessions[name] = session
+
+    thread = threading.Thread(target=scoped, args=('thread',))
+    thread.start()
+    thread.join()
+    scoped('main')
+
+    assert sessions['thread'] is not sessions['main']
+    assert engine.pool_status()['mode'] == 'queue'
+    engine.dispose()
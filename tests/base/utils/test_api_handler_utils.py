@@ -0,0 +1,61 @@
+import pytest
+
+from dataall.base.utils import api_handler_utils
+from dataall.core.permissions.db.tenant.tenant_policy_repositories import TenantPolicyRepository
+from dataall.core.permissions.services.tenant_permissions import TENANT_ALL
+from dataall.core.permissions.services.tenant_policy_service import TenantPolicyService
+from dataall.modules.maintenance.services.maintenance_service import MaintenanceService
+
+MODULE = 'dataall.base.utils.api_handler_utils'
+
+
+@pytest.fixture(autouse=True)
+def preflight(mocker, db):
+    mocker.patch(f'{MODULE}.ENGINE', db)
+    api_handler_utils._preflight_cache.clear()
+    yield
+    api_handler_utils._preflight_cache.clear()
+
+
+def test_tenant_policy_is_attached_to_new_groups_once(db, tenant, mocker):
+    attach = mocker.spy(TenantPolicyService, 'attach_groups_tenant_policy')
+    api_handler_utils.attach_tenant_policy_for_groups(groups=['preflight-group1', 'preflight-group2'])
+    api_handler_utils.attach_tenant_policy_for_groups(groups=['preflight-group1', 'preflight-group2'])
+
+    assert attach.call_count == 1
+    with db.scoped_session() as session:
+        policy = TenantPolicyRepository.find_tenant_policy(session, 'preflight-group2', TenantPolicyService.TENANT_NAME)
+        assert sorted(p.permission.name for p in policy.permissions) == sorted(TENANT_ALL)
+        assert (
+            TenantPolicyService.attach_groups_tenant_policy(
+                session, ['preflight-group1', 'preflight-group2'], TENANT_ALL, TenantPolicyService.TENANT_NAME
+            )
+            == []
+        )
+
+
+def test_reauth_apis_are_cached(mocker):
+    get_parameter = mocker.patch(
+        f'{MODULE}.ParameterStoreManager.get_parameter_value', return_value='deleteDataset,deleteEnvironment'
+    )
+    query = {'operationName': 'deleteDataset'}
+    response = api_handler_utils.check_reauth(query=query, auth_time=0, username='alice')
+    assert response['statusCode'] == 401
+    api_handler_utils.check_reauth(query=query, auth_time=0, username='alice')
+    assert get_parameter.call_count == 1
+
+
+def test_maintenance_state_is_reloaded_when_it_changes(mocker):
+    mocker.patch(f'{MODULE}.config.get_property', return_value=True)
+    load = mocker.patch(f'{MODULE}._load_maintenance_state', return_value=('NO-ACCESS', 'ACTIVE'))
+    query = {'operationName': 'listDatasets'}
+
+    assert api_handler_utils.validate_and_block_if_maintenance_window(query=query, groups=['g'])['statusCode'] == 401
+    assert api_handler_utils.validate_and_block_if_maintenance_window(query=query, groups=['g'])['statusCode'] == 401
+    assert api_handler_utils.validate_and_block_if_maintenance_window(query=query, groups=['DAAdministrators']) is None
+    assert load.call_count == 1
+
+    load.return_value = ('', 'INACTIVE')
+    mocker.patch.object(MaintenanceService, 'state_version', MaintenanceService.state_version + 1)
+    assert api_handler_utils.validate_and_block_if_maintenance_window(query=query, groups=['g']) is None
+    assert load.call_count == 2
@@ -7,7 +7,7 @@ import pytest
 from starlette.testclient import TestClient
 
 from dataall.base.config import config
-from dataall.base.db import get_engine, create_schema_and_tables, Engine
+from dataall.base.db import get_engine, create_schema_and_tables, Engine, PoolConfig
 from dataall.base.loader import load_modules, ImportMode, list_loaded_modules
 from dataall.core.groups.db.group_models import Group
 from dataall.core.permissions.services.permission_service import PermissionService
@@ -58,7 +58,8 @@ class User:
 
 @pytest.fixture(scope='module')
 def db() -> Engine:
-    engine = get_engine(envname=ENVNAME)
+    # the fixtures' transactions are shared with the API handlers, which the TestClient runs in another thread
+    engine = get_engine(envname=ENVNAME, pool_config=PoolConfig(session_scope='process'))
     create_schema_and_tables(engine, envname=ENVNAME)
     yield engine
     engine.session().close()
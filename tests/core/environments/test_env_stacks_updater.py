@@ -1,4 +1,4 @@
-from dataall.core.environment.tasks.env_stacks_updater import update_stacks
+from dataall.core.environment.tasks.env_stacks_updater import update_stacks, update_stacks_and_wait
 
 
 def test_stacks_update(db, org_fixture, env_fixture, mocker):
@@ -6,6 +6,41 @@ def test_stacks_update(db, org_fixture, env_fixture, mocker):
         'dataall.core.environment.tasks.env_stacks_updater.update_stack',
         return_value=True,
     )
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.Parameter')
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.Ecs.get_running_tasks', return_value=set())
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.SLEEP_TIME', 0)
     envs, others = update_stacks(engine=db, envname='local')
     assert envs == 1
     assert others == 0
+
+
+def test_stacks_update_in_flight_limit(mocker):
+    started = []
+
+    def update_stack(session, envname, target_uri, cluster_name):
+        started.append(target_uri)
+        return f'arn:{target_uri}'
+
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.update_stack', side_effect=update_stack)
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.SLEEP_TIME', 0)
+    polls = []
+
+    def get_running_tasks(cluster_name, task_arns):
+        assert len(task_arns) <= 2
+        polls.append(sorted(task_arns))
+        # every task completes after one poll, except arn:env1 which never does
+        return {'arn:env1'} & set(task_arns)
+
+    mocker.patch(
+        'dataall.core.environment.tasks.env_stacks_updater.Ecs.get_running_tasks', side_effect=get_running_tasks
+    )
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.RETRIES', 3)
+
+    update_stacks_and_wait(None, 'local', ['env1', 'env2', 'env3', 'env4'], cluster_name='cluster', max_in_flight=2)
+
+    assert started == ['env1', 'env2', 'env3', 'env4']
+    assert polls == [
+        ['arn:env1', 'arn:env2'],
+        ['arn:env1', 'arn:env3'],
+        ['arn:env1', 'arn:env4'],
+    ]
@@ -3,8 +3,10 @@ import pytest
 from dataall.core.permissions.db.permission.permission_models import PermissionType
 from dataall.core.permissions.services.permission_service import PermissionService
 from dataall.base.db import exceptions
+from dataall.core.permissions.db.resource_policy.resource_policy_repositories import ResourcePolicyRepository
 from dataall.core.permissions.services.environment_permissions import ENVIRONMENT_ALL
 from dataall.core.permissions.services.organization_permissions import ORGANIZATION_ALL
+from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
 from dataall.core.permissions.services.tenant_permissions import MANAGE_GROUPS, TENANT_ALL
 from dataall.core.permissions.services.tenant_policy_service import TenantPolicyService
 
@@ -62,3 +64,28 @@ def test_unauthorized_tenant_policy(db, group):
                 permission_name='UNKNOW_PERMISSION',
                 tenant_name='dataall',
             )
+
+
+def test_attach_resource_policies(db, group):
+    with db.scoped_session() as session:
+        ResourcePolicyService.attach_resource_policy(
+            session, group.name, ENVIRONMENT_ALL[:1], 'bulk-uri1', resource_type='Environment'
+        )
+        ResourcePolicyService.attach_resource_policies(
+            session, [group.name, 'bulk-group2'], ENVIRONMENT_ALL, ['bulk-uri1', 'bulk-uri2'], 'Environment'
+        )
+        session.commit()
+
+        for group_uri in [group.name, 'bulk-group2']:
+            for resource_uri in ['bulk-uri1', 'bulk-uri2']:
+                policies = ResourcePolicyRepository.find_all_resource_policies(session, group_uri, resource_uri)
+                assert len(policies) == 1
+                assert sorted(
+                    p.name
+                    for p in ResourcePolicyService.get_resource_policy_permissions(session, group_uri, resource_uri)
+                ) == sorted(ENVIRONMENT_ALL)
+
+        with pytest.raises(exceptions.ObjectNotFound):
+            ResourcePolicyService.attach_resource_policies(
+                session, [group.name], ['UNKNOWN_PERMISSION'], ['bulk-uri1'], 'Environment'
+            )
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dataall.base.context import RequestContext, _request_storage, set_context
+from dataall.base.db import exceptions
+from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
+
+REPOSITORY = 'dataall.core.permissions.services.resource_policy_service.ResourcePolicyRepository'
+
+
+@pytest.fixture
+def request_context():
+    previous = getattr(_request_storage, 'context', None)
+    set_context(RequestContext(db_engine=MagicMock(), username='alice', groups=['admins'], user_id='alice'))
+    yield
+    set_context(previous)
+
+
+@pytest.fixture
+def grants():
+    with patch(f'{REPOSITORY}.list_groups_permissions_on_resources') as list_grants:
+        granted = [('uri1', 'GET_DATASET'), ('uri1', 'UPDATE_DATASET'), ('uri2', 'GET_DATASET')]
+        list_grants.side_effect = lambda session, groups, resource_uris: [
+            grant for grant in granted if grant[0] in resource_uris
+        ]
+        yield list_grants
+
+
+def test_permission_decisions_are_memoized_per_request(request_context, grants):
+    session = MagicMock()
+    assert ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri1', 'GET_DATASET')
+    assert ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri1', 'UPDATE_DATASET')
+    with pytest.raises(exceptions.ResourceUnauthorized):
+        ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri1', 'DELETE_DATASET')
+    assert grants.call_count == 1
+
+
+def test_bulk_permission_check(request_context, grants):
+    session = MagicMock()
+    allowed = ResourcePolicyService.filter_user_resources_with_permission(
+        session, ['admins'], ['uri1', 'uri2', 'uri3'], 'GET_DATASET'
+    )
+    assert allowed == ['uri1', 'uri2']
+    ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri2', 'GET_DATASET')
+    grants.assert_called_once_with(session, groups=['admins'], resource_uris=['uri1', 'uri2', 'uri3'])
+
+
+def test_cache_is_invalidated_when_policies_change(request_context, grants):
+    session = MagicMock()
+    ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri1', 'GET_DATASET')
+    with patch(f'{REPOSITORY}.find_all_resource_policies', return_value=[]):
+        ResourcePolicyService.delete_resource_policy(session, group='admins', resource_uri='uri1')
+    grants.side_effect = lambda session, groups, resource_uris: []
+    with pytest.raises(exceptions.ResourceUnauthorized):
+        ResourcePolicyService.check_user_resource_permission(session, 'alice', ['admins'], 'uri1', 'GET_DATASET')
+    assert grants.call_count == 2
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from dataall.base.db.exceptions import ResourceLockTimeout
+from dataall.core.resource_lock.db import resource_lock_repositories
+from dataall.core.resource_lock.db.resource_lock_models import ResourceLock
+from dataall.core.resource_lock.db.resource_lock_repositories import ResourceLockRepository
+
+RESOURCES = [('dataset-uri', 'dataset'), ('principal-uri', 'environment_group')]
+
+
+@pytest.fixture
+def fast_retries(mocker):
+    mocker.patch.object(resource_lock_repositories, 'MAX_WAIT', 0.2)
+    mocker.patch.object(resource_lock_repositories, 'RETRY_INTERVAL', 0.01)
+    return mocker.patch.object(
+        resource_lock_repositories, 'lock_metrics', resource_lock_repositories.ResourceLockMetrics()
+    )
+
+
+def test_lock_is_released_and_times_out_while_held(db, fast_retries):
+    with db.scoped_session() as session:
+        with ResourceLockRepository.acquire_lock_with_retry(RESOURCES, session, 'share1', 'share_object'):
+            lock = session.query(ResourceLock).filter(ResourceLock.acquiredByUri == 'share1').first()
+            assert lock.expiresAt > lock.acquiredAt
+            with pytest.raises(ResourceLockTimeout):
+                with ResourceLockRepository.acquire_lock_with_retry(RESOURCES[:1], session, 'share2', 'share_object'):
+                    pass
+        assert session.query(ResourceLock).count() == 0
+
+        with ResourceLockRepository.acquire_lock_with_retry(RESOURCES[:1], session, 'share2', 'share_object'):
+            pass
+
+    metrics = fast_retries.as_dict()
+    assert metrics['acquired'] == 2
+    assert metrics['timeouts'] == 1
+    assert metrics['max_wait'] >= 0.2
+
+
+def test_expired_lock_is_taken_over(db, fast_retries):
+    with db.scoped_session() as session:
+        session.add(
+            ResourceLock(
+                resourceUri=RESOURCES[0][0],
+                resourceType=RESOURCES[0][1],
+                acquiredByUri='dead-share',
+                acquiredByType='share_object',
+                acquiredAt=datetime.utcnow() - timedelta(hours=1),
+                expiresAt=datetime.utcnow() - timedelta(minutes=1),
+            )
+        )
+        session.commit()
+
+        with ResourceLockRepository.acquire_lock_with_retry(RESOURCES, session, 'share1', 'share_object'):
+            assert {lock.acquiredByUri for lock in session.query(ResourceLock).all()} == {'share1'}
+
+
+def test_heartbeat_renews_lease(db, mocker):
+    with db.scoped_session() as session:
+        with ResourceLockRepository.acquire_lock_with_retry(RESOURCES, session, 'share1', 'share_object'):
+            lock = session.query(ResourceLock).filter(ResourceLock.acquiredByUri == 'share1').first()
+            expires_at = lock.expiresAt
+            ResourceLockRepository._renew_locks(session.get_bind(), RESOURCES, 'share1')
+            session.refresh(lock)
+            assert lock.expiresAt > expires_at
+
+
+def test_takeover_is_committed_apart_from_the_caller_changes(db):
+    with db.scoped_session() as session:
+        session.add_all(
+            [
+                ResourceLock(
+                    resourceUri=RESOURCES[0][0],
+                    resourceType=RESOURCES[0][1],
+                    acquiredByUri='dead-share',
+                    acquiredByType='share_object',
+                    expiresAt=datetime.utcnow() - timedelta(minutes=1),
+                ),
+                ResourceLock(
+                    resourceUri=RESOURCES[1][0],
+                    resourceType=RESOURCES[1][1],
+                    acquiredByUri='live-share',
+                    acquiredByType='share_object',
+                    expiresAt=datetime.utcnow() + timedelta(minutes=5),
+                ),
+            ]
+        )
+        session.commit()
+        # pending change of the caller, e.g. the status of its share
+        session.add(ResourceLock(resourceUri='other-uri', resourceType='dataset', acquiredByUri='share1'))
+        session.flush()
+
+        assert not ResourceLockRepository._acquire_locks(RESOURCES, session, 'share1', 'share_object')
+
+        with Session(bind=session.get_bind()) as other:
+            assert {lock.acquiredByUri for lock in other.query(ResourceLock).all()} == {'live-share'}
+        session.rollback()
+        session.query(ResourceLock).delete()
+        session.commit()
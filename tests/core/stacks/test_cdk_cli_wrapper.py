@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from dataall.base.cdkproxy import cdk_cli_wrapper
+from dataall.core.stacks.db.stack_models import Stack
+
+MODULE = 'dataall.base.cdkproxy.cdk_cli_wrapper'
+
+
+@pytest.fixture
+def stack(db):
+    with db.scoped_session() as session:
+        stack = Stack(
+            name='dataall-env-stack',
+            targetUri='env-uri',
+            accountid='111111111111',
+            region='eu-west-1',
+            stack='environment',
+        )
+        session.add(stack)
+        session.commit()
+        yield stack
+        session.delete(stack)
+
+
+@pytest.fixture
+def synths():
+    return []
+
+
+@pytest.fixture
+def cdk(mocker, synths):
+    mocker.patch('dataall.base.loader.load_modules')
+    mocker.patch(f'{MODULE}.boto3')
+    mocker.patch(f'{MODULE}.update_stack_output')
+    mocker.patch(f'{MODULE}.describe_stack', return_value={'StackId': 'arn:stack', 'StackStatus': 'UPDATE_COMPLETE'})
+    deploys = []
+
+    def run(cmd, env=None, **kwargs):
+        if 'CDK_OUTDIR' in env:
+            # synthesis of the app
+            synths.append((cmd, env))
+            with open(os.path.join(env['CDK_OUTDIR'], 'manifest.json'), 'w') as f:
+                json.dump({'version': '36.0.0'}, f)
+            with open(os.path.join(env['CDK_OUTDIR'], 'stack.template.json'), 'w') as f:
+                json.dump({'Resources': json.loads(env['CDK_CONTEXT_JSON'])['data']}, f)
+        else:
+            deploys.append(cmd)
+        return mocker.MagicMock(returncode=0)
+
+    mocker.patch(f'{MODULE}.subprocess.run', side_effect=run)
+    return deploys
+
+
+def test_unchanged_stacks_are_not_deployed_again(db, stack, cdk):
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert len(cdk) == 1
+    # the synthesized cloud assembly is deployed
+    assert f'--app "{tempfile.gettempdir()}' in cdk[0]
+    with db.scoped_session() as session:
+        template_hash = session.query(Stack).get(stack.stackUri).templateHash
+    assert template_hash
+
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert len(cdk) == 1
+    with db.scoped_session() as session:
+        assert session.query(Stack).get(stack.stackUri).status == 'UPDATE_COMPLETE'
+
+
+def test_changed_stacks_are_deployed(db, stack, cdk):
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    with db.scoped_session() as session:
+        session.query(Stack).get(stack.stackUri).templateHash = 'previous'
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    assert len(cdk) == 2
+
+
+def test_apps_are_synthesized_with_node_and_the_cdk_cli_context(db, stack, cdk, synths):
+    cdk_cli_wrapper.deploy_cdk_stack(db, stack.stackUri)
+    cmd, env = synths[0]
+    # jsii starts node, which is on the PATH once nvm is sourced
+    assert cmd.startswith('. ~/.nvm/nvm.sh && ')
+    assert env['PATH'] and env['HOME']
+    context = json.loads(env['CDK_CONTEXT_JSON'])
+    assert context['aws:cdk:enable-path-metadata'] is True
+    assert context['aws:cdk:bundling-stacks'] == ['**']
+    assert context['account'] == stack.accountid
@@ -0,0 +1,65 @@
+import pytest
+
+from dataall.core.stacks.aws.cloudformation import CloudFormation
+from dataall.core.stacks.db.stack_models import Stack
+
+STACK_ARN = 'arn:aws:cloudformation:eu-west-1:111111111111:stack/stack1/1'
+
+
+@pytest.fixture
+def stack(db):
+    with db.scoped_session() as session:
+        stack = Stack(
+            name='stack1', targetUri='target1', accountid='111111111111', region='eu-west-1', stack='environment'
+        )
+        session.add(stack)
+        session.commit()
+        yield stack
+        session.delete(stack)
+        session.commit()
+
+
+@pytest.fixture
+def cfn_client(mocker):
+    client = mocker.MagicMock()
+    client.describe_stacks.return_value = {
+        'Stacks': [{'StackId': STACK_ARN, 'StackStatus': 'CREATE_COMPLETE', 'CreationTime': '2024-01-01'}]
+    }
+    client.describe_stack_resources.return_value = {'StackResources': [{'LogicalResourceId': 'Bucket'}]}
+    mocker.patch.object(CloudFormation, 'client', return_value=client)
+    yield client
+
+
+def _events(client, event_ids):
+    client.get_paginator.return_value.paginate.return_value = [
+        {'StackEvents': [{'EventId': event_id, 'StackId': STACK_ARN} for event_id in event_ids]}
+    ]
+
+
+def test_unchanged_stacks_only_fetch_new_events(db, stack, cfn_client):
+    payload = {'accountid': '111111111111', 'region': 'eu-west-1', 'stack_name': 'stack1', 'stackUri': stack.stackUri}
+    _events(cfn_client, ['e2', 'e1'])
+    CloudFormation.refresh_stacks(db, [payload])
+
+    _events(cfn_client, ['e4', 'e3', 'e2', 'e1'])
+    CloudFormation.refresh_stacks(db, [payload])
+
+    assert cfn_client.describe_stack_resources.call_count == 1
+    with db.scoped_session() as session:
+        stack = session.query(Stack).get(stack.stackUri)
+        assert stack.status == 'CREATE_COMPLETE'
+        assert stack.stackid == STACK_ARN
+        assert stack.resources['resources'][0]['LogicalResourceId'] == 'Bucket'
+        assert [event['EventId'] for event in stack.events['events']] == ['e4', 'e3', 'e2', 'e1']
+
+
+def test_stacks_of_the_same_account_and_region_share_a_client(db, stack, cfn_client):
+    _events(cfn_client, [])
+    payloads = [
+        {'accountid': account, 'region': 'eu-west-1', 'stack_name': 'stack1', 'stackUri': stack.stackUri}
+        for account in ['111111111111', '111111111111', '222222222222']
+    ]
+    CloudFormation.refresh_stacks(db, payloads)
+
+    assert [c.kwargs['AwsAccountId'] for c in CloudFormation.client.call_args_list] == ['111111111111', '222222222222']
+    assert cfn_client.describe_stacks.call_count == 3
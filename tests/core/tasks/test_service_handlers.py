@@ -0,0 +1,119 @@
+import threading
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import text
+
+from dataall.base.db import Engine, PoolConfig
+from dataall.base.loader import ImportMode
+from dataall.core.tasks.db.task_models import Task
+from dataall.core.tasks.service_handlers import MAX_WORKERS, WorkerHandler
+
+
+@pytest.fixture
+def worker():
+    worker = WorkerHandler()
+    calls = []
+    lock = threading.Lock()
+
+    @worker.handler(path='test.task.run')
+    def run(engine, task):
+        with lock:
+            calls.append(task.taskUri)
+        if task.payload.get('fail'):
+            raise Exception('task failed')
+        return {'target': task.targetUri}
+
+    worker.calls = calls
+    yield worker
+
+
+def _create_tasks(db, payloads, action='test.task.run'):
+    with db.scoped_session() as session:
+        tasks = [Task(action=action, targetUri=target, payload=payload) for target, payload in payloads]
+        session.add_all(tasks)
+        session.commit()
+        return [task.taskUri for task in tasks]
+
+
+def test_all_tasks_of_a_batch_are_processed(db, worker):
+    task_ids = _create_tasks(db, [('target1', {}), ('target2', {'fail': True}), ('target1', {})])
+
+    responses = worker.process(engine=db, task_ids=task_ids)
+
+    assert [r['taskUri'] for r in responses] == task_ids
+    assert [r['status'] for r in responses] == ['completed', 'failed', 'completed']
+    assert worker.calls.index(task_ids[0]) < worker.calls.index(task_ids[2])
+    with db.scoped_session() as session:
+        tasks = {task.taskUri: task for task in session.query(Task).filter(Task.taskUri.in_(task_ids))}
+        assert tasks[task_ids[0]].status == 'completed'
+        assert tasks[task_ids[0]].response == {'target': 'target1'}
+        assert tasks[task_ids[1]].status == 'failed'
+        assert tasks[task_ids[1]].error == {'message': 'task failed'}
+
+
+def test_tasks_are_only_processed_once(db, worker):
+    task_ids = _create_tasks(db, [('target1', {})])
+    task_ids += _create_tasks(db, [('target1', {})], action='test.task.unknown')
+
+    assert len(worker.process(engine=db, task_ids=task_ids)) == 1
+    assert worker.process(engine=db, task_ids=task_ids) == []
+    assert worker.calls == task_ids[:1]
+
+
+def test_tasks_are_pending_again_when_their_results_can_not_be_saved(db, worker, mocker):
+    task_ids = _create_tasks(db, [('target1', {}), ('target2', {})])
+    mocker.patch.object(WorkerHandler, 'update_tasks', side_effect=Exception('connection lost'))
+
+    with pytest.raises(Exception, match='connection lost'):
+        worker.process(engine=db, task_ids=task_ids)
+    with db.scoped_session() as session:
+        assert {task.status for task in session.query(Task).filter(Task.taskUri.in_(task_ids))} == {'pending'}
+
+    # the retry of the messages processes the tasks again
+    mocker.stopall()
+    assert [r['status'] for r in worker.process(engine=db, task_ids=task_ids)] == ['completed', 'completed']
+
+
+def test_handler_threads_get_their_own_connections(db):
+    pool_config = PoolConfig.for_import_modes({ImportMode.HANDLERS})
+    assert pool_config.session_scope == 'thread'
+    assert pool_config.pool_size + pool_config.max_overflow > MAX_WORKERS
+    engine = Engine(db.dbconfig, pool_config=replace(pool_config, pool_timeout=5))
+    worker = WorkerHandler()
+    # every handler holds its connection until all of them have one
+    barrier = threading.Barrier(MAX_WORKERS, timeout=10)
+
+    @worker.handler(path='test.task.connection')
+    def hold_connection(engine, task):
+        with engine.scoped_session() as session:
+            session.execute(text('select 1'))
+            barrier.wait()
+        return {}
+
+    task_ids = _create_tasks(
+        engine, [(f'connection-target{i}', {}) for i in range(MAX_WORKERS)], action='test.task.connection'
+    )
+    responses = worker.process(engine=engine, task_ids=task_ids)
+
+    assert [r['status'] for r in responses] == ['completed'] * MAX_WORKERS
+    engine.dispose()
+
+
+def test_tasks_of_batch_actions_are_handled_together(db, worker):
+    batches = []
+
+    @worker.handler(path='test.task.batch', batch=True)
+    def run_batch(engine, tasks):
+        batches.append([task.taskUri for task in tasks])
+        return {'processed': len(tasks)}
+
+    batch_ids = _create_tasks(db, [(f'batch-target{i}', {}) for i in range(3)], action='test.task.batch')
+    task_ids = _create_tasks(db, [('target1', {})])
+
+    responses = worker.process(engine=db, task_ids=batch_ids + task_ids)
+
+    assert batches == [batch_ids]
+    assert worker.calls == task_ids
+    assert [r['status'] for r in responses] == ['completed'] * 4
+    assert responses[0]['response'] == {'processed': 3}
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+from opensearchpy.exceptions import TransportError
+
+from dataall.modules.catalog.indexers.base_indexer import BulkIndexer
+
+
+def _response(*statuses, operation='index'):
+    return {
+        'errors': any(status >= 300 for status in statuses),
+        'items': [{operation: {'status': status}} for status in statuses],
+    }
+
+
+def test_bulk_indexer_batches_actions():
+    es = MagicMock()
+    es.bulk.return_value = _response(201, 201)
+    bulk_indexer = BulkIndexer(connect=lambda: es, index='dataall-index', batch_size=2, backoff=0)
+    for uri in ['uri1', 'uri2', 'uri3']:
+        bulk_indexer.index(uri, {'name': uri})
+    assert es.bulk.call_count == 1
+
+    es.bulk.return_value = _response(201)
+    bulk_indexer.flush()
+    assert es.bulk.call_count == 2
+    assert bulk_indexer.stats.indexed == 3
+    assert bulk_indexer.stats.failed == 0
+    body = es.bulk.call_args_list[0].kwargs['body']
+    assert body[0] == {'index': {'_index': 'dataall-index', '_id': 'uri1'}}
+    assert body[1] == {'name': 'uri1'}
+
+
+def test_bulk_indexer_flushes_on_max_bytes():
+    es = MagicMock()
+    es.bulk.return_value = _response(201)
+    bulk_indexer = BulkIndexer(connect=lambda: es, index='dataall-index', max_bytes=100, backoff=0)
+    bulk_indexer.index('uri1', {'description': 'x' * 60})
+    bulk_indexer.index('uri2', {'description': 'x' * 60})
+    assert es.bulk.call_count == 1
+
+
+def test_bulk_indexer_retries_rejected_actions():
+    es = MagicMock()
+    es.bulk.side_effect = [_response(201, 429, 400), _response(201)]
+    bulk_indexer = BulkIndexer(connect=lambda: es, index='dataall-index', backoff=0)
+    for uri in ['uri1', 'uri2', 'uri3']:
+        bulk_indexer.index(uri, {'name': uri})
+    bulk_indexer.flush()
+
+    assert es.bulk.call_count == 2
+    assert es.bulk.call_args_list[1].kwargs['body'][0]['index']['_id'] == 'uri2'
+    assert bulk_indexer.stats.indexed == 2
+    assert bulk_indexer.stats.retried == 1
+    assert bulk_indexer.stats.failed_ids == ['uri3']
+
+
+def test_bulk_indexer_gives_up_after_max_retries():
+    es = MagicMock()
+    es.bulk.side_effect = TransportError(429, 'too_many_requests')
+    bulk_indexer = BulkIndexer(connect=lambda: es, index='dataall-index', max_retries=2, backoff=0)
+    bulk_indexer.delete('uri1')
+    bulk_indexer.flush()
+
+    assert es.bulk.call_count == 3
+    assert bulk_indexer.stats.failed_ids == ['uri1']
+
+
+def test_bulk_indexer_ignores_missing_docs_on_delete():
+    es = MagicMock()
+    es.bulk.return_value = _response(200, 404, operation='delete')
+    bulk_indexer = BulkIndexer(connect=lambda: es, index='dataall-index', backoff=0)
+    bulk_indexer.delete('uri1')
+    bulk_indexer.delete('uri2')
+    bulk_indexer.flush()
+
+    assert bulk_indexer.stats.deleted == 2
+    assert bulk_indexer.stats.failed == 0
@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 import pytest
 
+from dataall.core.environment.db.environment_models import Environment
 from dataall.modules.catalog.tasks.catalog_indexer_task import CatalogIndexerTask
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTable, S3Dataset
 
@@ -81,3 +84,28 @@ def test_catalog_indexer_with_deletes(db, org, env, sync_dataset, table, mocker)
 
     # Count should be One Dataset = 1
     assert indexed_objects_counter == 1
+
+
+def test_catalog_indexer_incremental(db, org, env, sync_dataset, table, mocker):
+    mocker.patch('dataall.modules.catalog.tasks.catalog_indexer_task.INCREMENTAL_OVERLAP', timedelta(0))
+    CatalogIndexerTask.index_objects(engine=db)
+
+    # Nothing changed since the previous run
+    assert CatalogIndexerTask.index_objects(engine=db, incremental='True') == 0
+
+    # The table and the dataset that embeds its count are reindexed
+    with db.scoped_session() as session:
+        session.query(DatasetTable).get(table.tableUri).description = 'new description'
+    assert CatalogIndexerTask.index_objects(engine=db, incremental='True') == 2
+
+    # Renaming the environment reindexes its dataset with its tables
+    with db.scoped_session() as session:
+        session.query(Environment).get(sync_dataset.environmentUri).label = 'new label'
+    assert CatalogIndexerTask.index_objects(engine=db, incremental='True') == 2
+
+
+def test_catalog_indexer_incremental_runs_full_sweep(db, org, env, sync_dataset, table, mocker):
+    mocker.patch('dataall.modules.catalog.tasks.catalog_indexer_task.INCREMENTAL_OVERLAP', timedelta(0))
+    mocker.patch('dataall.modules.catalog.tasks.catalog_indexer_task.FULL_SWEEP_INTERVAL', timedelta(0))
+    CatalogIndexerTask.index_objects(engine=db)
+    assert CatalogIndexerTask.index_objects(engine=db, incremental='True') == 2
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock
 
 import pytest
+from dataall.modules.s3_datasets.aws.lf_table_client import LakeFormationTableClient
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTable
 from dataall.modules.s3_datasets.tasks.tables_syncer import sync_tables
 
@@ -32,6 +33,7 @@ def table_fixture(org, env, db, sync_dataset):
 def test_tables_sync(db, org, env, sync_dataset, table_fixture, mocker):
     mock_crawler = MagicMock()
     mocker.patch('dataall.modules.s3_datasets.tasks.tables_syncer.DatasetCrawler', mock_crawler)
+    mocker.patch('dataall.modules.s3_datasets.services.dataset_table_service.AthenaTableClient')
     mocker.patch(
         'dataall.base.aws.sts.SessionHelper.get_delegation_role_arn',
         return_value='arn:role',
@@ -92,7 +94,7 @@ def test_tables_sync(db, org, env, sync_dataset, table_fixture, mocker):
 
     mock_client = MagicMock()
     mocker.patch('dataall.modules.s3_datasets.tasks.tables_syncer.LakeFormationTableClient', mock_client)
-    mock_client.grant_principals_all_table_permissions = True
+    mock_client.grant_principals_all_tables_permissions.return_value = 0
 
     processed_tables = sync_tables(engine=db)
     assert len(processed_tables) == 2
@@ -100,3 +102,31 @@ def test_tables_sync(db, org, env, sync_dataset, table_fixture, mocker):
         saved_table: DatasetTable = session.query(DatasetTable).filter(DatasetTable.GlueTableName == 'table1').first()
         assert saved_table
         assert saved_table.GlueTableName == 'table1'
+
+    # the Glue database has not changed, the next sync skips the dataset
+    assert sync_tables(engine=db) == []
+    assert len(sync_tables(engine=db, full_sync=True)) == 2
+
+    # failed grants are retried by the next sync even if the Glue database has not changed
+    mock_client.grant_principals_all_tables_permissions.return_value = 1
+    assert len(sync_tables(engine=db, full_sync=True)) == 2
+    mock_client.grant_principals_all_tables_permissions.return_value = 0
+    assert len(sync_tables(engine=db)) == 2
+    assert sync_tables(engine=db) == []
+
+
+def test_tables_permissions_are_granted_in_batches():
+    tables = [
+        DatasetTable(AWSAccountId='12345678901', region='eu-west-1', GlueDatabaseName='db', name=f'table{i}')
+        for i in range(15)
+    ]
+    aws_session = MagicMock()
+    client = aws_session.client.return_value
+    client.batch_grant_permissions.return_value = {'Failures': []}
+
+    failed = LakeFormationTableClient.grant_principals_all_tables_permissions(
+        tables, principals=['arn:pivot', 'arn:env'], aws_session=aws_session
+    )
+
+    assert failed == 0
+    assert [len(c.kwargs['Entries']) for c in client.batch_grant_permissions.call_args_list] == [20, 10]
@@ -12,6 +12,9 @@ def test_stacks_update(db, org, env, sync_dataset, mocker):
         'dataall.core.environment.tasks.env_stacks_updater.update_stack',
         return_value=True,
     )
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.Parameter')
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.Ecs.get_running_tasks', return_value=set())
+    mocker.patch('dataall.core.environment.tasks.env_stacks_updater.SLEEP_TIME', 0)
     envs, datasets = update_stacks(engine=db, envname='local')
     assert envs == 1
     assert datasets == 1
@@ -0,0 +1,121 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from dataall.modules.s3_datasets.aws.athena_table_client import AthenaTableClient, PREVIEW_CACHE_TTL
+from dataall.modules.s3_datasets.services.dataset_table_service import DatasetTableService
+
+MODULE = 'dataall.modules.s3_datasets.aws.athena_table_client'
+
+
+@pytest.fixture
+def aws(mocker):
+    session = MagicMock()
+    session.get_credentials.return_value = MagicMock(access_key='key', secret_key='secret', token='token')
+    athena, s3 = MagicMock(), MagicMock()
+    session.client.side_effect = lambda service, **kwargs: {'athena': athena, 's3': s3}[service]
+    mocker.patch(f'{MODULE}.SessionHelper.remote_session', return_value=session)
+    athena.get_work_group.return_value = {'WorkGroup': {'Name': 'env-workgroup'}}
+    s3.get_object.side_effect = ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+
+    connect = mocker.patch(f'{MODULE}.connect')
+    cursor = connect.return_value.cursor.return_value
+    cursor.description = [('id',), ('dt',)]
+    cursor.__iter__.return_value = iter([(1, '2024-01-01')])
+    mocker.patch.object(AthenaTableClient, '_connections', {})
+    mocker.patch.object(AthenaTableClient, '_work_groups', {})
+    yield MagicMock(athena=athena, s3=s3, connect=connect, cursor=cursor)
+
+
+@pytest.fixture
+def env():
+    return MagicMock(
+        region='eu-west-1', EnvironmentDefaultBucketName='envbucket', EnvironmentDefaultAthenaWorkGroup='wg'
+    )
+
+
+@pytest.fixture
+def table():
+    return MagicMock(
+        AWSAccountId='111111111111',
+        region='eu-west-1',
+        datasetUri='dataset',
+        tableUri='table',
+        GlueDatabaseName='db',
+        GlueTableName='tbl',
+    )
+
+
+def test_preview_reads_latest_partition(aws, env, table):
+    preview = AthenaTableClient(env, table).get_table(partitions=['year', 'month'])
+
+    sql = aws.cursor.execute.call_args.args[0]
+    assert 'order by rand()' not in sql
+    assert 'db."tbl$partitions"' in sql
+    assert 'order by year desc, month desc limit 1' in sql
+    assert 't.year = latest.year and t.month = latest.month' in sql
+    assert len(preview['rows']) == 1
+    assert preview['fields'] == [json.dumps({'name': 'id'}), json.dumps({'name': 'dt'})]
+
+
+def test_preview_of_unpartitioned_table_reads_first_rows(aws, env, table):
+    AthenaTableClient(env, table).get_table()
+    assert aws.cursor.execute.call_args.args[0] == 'select * from db.tbl limit 50'
+
+
+def test_preview_reuses_connection_and_workgroup(aws, env, table):
+    AthenaTableClient(env, table).get_table()
+    AthenaTableClient(env, table).get_table()
+    assert aws.connect.call_count == 1
+    assert aws.athena.get_work_group.call_count == 1
+    assert aws.connect.call_args.kwargs['work_group'] == 'env-workgroup'
+
+
+def test_preview_is_cached(aws, env, table):
+    preview = AthenaTableClient(env, table).get_table(cache_version='v1')
+    put = aws.s3.put_object.call_args.kwargs
+    assert put['Bucket'] == 'envbucket'
+    assert put['Key'] == 'preview/dataset/table/cache/v1.json'
+
+    aws.s3.get_object.side_effect = None
+    aws.s3.get_object.return_value = {
+        'Body': io.BytesIO(put['Body'].encode()),
+        'LastModified': datetime.now(timezone.utc),
+    }
+    assert AthenaTableClient(env, table).get_table(cache_version='v1') == preview
+    assert aws.cursor.execute.call_count == 1
+
+
+def test_expired_preview_is_refreshed(aws, env, table):
+    aws.s3.get_object.side_effect = None
+    aws.s3.get_object.return_value = {
+        'Body': io.BytesIO(b'{}'),
+        'LastModified': datetime.now(timezone.utc) - PREVIEW_CACHE_TTL - timedelta(minutes=1),
+    }
+    AthenaTableClient(env, table).get_table(cache_version='v1')
+    assert aws.cursor.execute.call_count == 1
+    assert aws.s3.put_object.call_count == 1
+
+
+def test_preview_partitions_are_ordered_by_their_index(mocker, env, table):
+    columns = [MagicMock(columnType='column', typeName='string')]
+    columns += [
+        MagicMock(columnType=f'partition_{index}', typeName='string')
+        for index in [10, 2, 0, 1, 3, 4, 5, 6, 7, 8, 9, 11]
+    ]
+    for column in columns:
+        # name is an argument of the MagicMock constructor
+        column.name = column.columnType.replace('partition_', 'p')
+    mocker.patch(
+        'dataall.modules.s3_datasets.services.dataset_table_service.DatasetColumnRepository.list_active_columns_for_table',
+        return_value=columns,
+    )
+    client = mocker.patch('dataall.modules.s3_datasets.services.dataset_table_service.AthenaTableClient')
+
+    DatasetTableService._preview_table(MagicMock(), env, table)
+
+    assert client.return_value.get_table.call_args.kwargs['partitions'] == [f'p{index}' for index in range(12)]
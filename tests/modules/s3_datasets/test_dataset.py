@@ -9,6 +9,7 @@ from dataall.core.organizations.db.organization_models import Organization
 from dataall.modules.s3_datasets.db.dataset_repositories import DatasetRepository
 from dataall.modules.s3_datasets.db.dataset_models import DatasetStorageLocation, DatasetTable, S3Dataset, DatasetBucket
 from dataall.modules.datasets_base.db.dataset_models import DatasetBase
+from dataall.modules.datasets_base.db.dataset_repositories import DatasetListRepository
 from dataall.core.resource_lock.db.resource_lock_models import ResourceLock
 from tests.core.stacks.test_stack import update_stack_query
 from dataall.modules.s3_datasets.db.dataset_bucket_repositories import DatasetBucketRepository
@@ -132,6 +133,76 @@ def test_list_datasets(client, dataset1, group):
     assert response.data.listDatasets.nodes[0].datasetUri == dataset1.datasetUri
 
 
+def test_list_datasets_with_cursor(client, db, env_fixture, org_fixture):
+    with db.scoped_session() as session:
+        datasets = [
+            S3Dataset(
+                organizationUri=org_fixture.organizationUri,
+                environmentUri=env_fixture.environmentUri,
+                label=label,
+                name=label,
+                owner='cursor-owner',
+                stewards='cursor-group',
+                SamlAdminGroupName='cursor-group',
+                S3BucketName=label,
+                GlueDatabaseName=label,
+                KmsAlias='kmsalias',
+                AwsAccountId=env_fixture.AwsAccountId,
+                region=env_fixture.region,
+                IAMDatasetAdminUserArn=f'arn:aws:iam::{env_fixture.AwsAccountId}:user/dataset',
+                IAMDatasetAdminRoleArn=f'arn:aws:iam::{env_fixture.AwsAccountId}:role/dataset',
+            )
+            # datasets of the same label are ordered by datasetUri
+            for label in ['cursor-b', 'cursor-a', 'cursor-b', 'cursor-c', 'cursor-a']
+        ]
+        session.add_all(datasets)
+        session.commit()
+        expected = [d.datasetUri for d in sorted(datasets, key=lambda d: (d.label, d.datasetUri))]
+
+    q = """
+        query ListDatasets($filter:DatasetFilter){
+            listDatasets(filter:$filter){
+                hasNext
+                nextCursor
+                nodes{
+                    datasetUri
+                }
+            }
+        }
+    """
+    try:
+        dataset_uris = []
+        cursor = None
+        while True:
+            response = client.query(
+                q, username='cursor-owner', groups=['cursor-group'], filter={'pageSize': 2, 'cursor': cursor}
+            )
+            page = response.data.listDatasets
+            assert len(page.nodes) <= 2
+            dataset_uris += [node.datasetUri for node in page.nodes]
+            cursor = page.nextCursor
+            if not page.hasNext:
+                break
+        assert dataset_uris == expected
+
+        with db.scoped_session() as session:
+            # the union of the subqueries of the other dataset types is paginated by cursor too
+            page = DatasetListRepository.paginated_all_user_datasets(
+                session,
+                'cursor-owner',
+                ['cursor-group'],
+                [session.query(DatasetBase).filter(DatasetBase.owner == 'cursor-owner')],
+                data={'pageSize': 3, 'cursor': None},
+            )
+            assert [d.datasetUri for d in page['nodes']] == expected[:3]
+            assert page['hasNext']
+    finally:
+        with db.scoped_session() as session:
+            for dataset in session.query(S3Dataset).filter(S3Dataset.owner == 'cursor-owner').all():
+                session.delete(dataset)
+            session.commit()
+
+
 def test_update_dataset(dataset1, client, group, group2, module_mocker):
     # Mock the validate_kms_key function to return True
     module_mocker.patch(
@@ -1,3 +1,5 @@
+from sqlalchemy import event
+
 from dataall.modules.s3_datasets.indexers.location_indexer import DatasetLocationIndexer
 from dataall.modules.s3_datasets.indexers.table_indexer import DatasetTableIndexer
 from dataall.modules.s3_datasets.indexers.dataset_indexer import DatasetIndexer
@@ -39,3 +41,26 @@ def test_upsert_tables(db, dataset_fixture, folder_fixture):
     with db.scoped_session() as session:
         tables = DatasetTableIndexer.upsert_all(session, dataset_uri=dataset_fixture.datasetUri)
         assert len(tables) == 1
+
+
+def test_upsert_many_datasets_uses_constant_queries(db, dataset_fixture, table_fixture, folder_fixture, mocker):
+    index = mocker.patch('dataall.modules.catalog.indexers.base_indexer.BaseIndexer._index')
+    statements = []
+
+    def count_statement(*args, **kwargs):
+        statements.append(args)
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        with db.scoped_session() as session:
+            datasets = DatasetIndexer.upsert_many(session, [dataset_fixture.datasetUri, 'unknown'])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    assert [dataset.datasetUri for dataset in datasets] == [dataset_fixture.datasetUri]
+    assert len(statements) == 5
+    doc = index.call_args.kwargs['doc']
+    assert doc['tables'] == 1
+    assert doc['folders'] == 1
+    assert doc['upvotes'] == 0
+    assert doc['glossary'] == []
@@ -1,7 +1,10 @@
 from dataall.modules.s3_datasets.services.dataset_table_service import DatasetTableService
 from dataall.modules.s3_datasets.services.dataset_table_data_filter_service import DatasetTableDataFilterService
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTableColumn, DatasetTable, DatasetTableDataFilter
+from dataall.modules.s3_datasets.db.dataset_table_repositories import DatasetTableRepository
 from dataall.base.db.exceptions import UnauthorizedOperation
+from dataall.core.permissions.services.resource_policy_service import ResourcePolicyService
+from dataall.modules.s3_datasets.services.dataset_permissions import GET_DATASET_TABLE
 import pytest
 import boto3
 from unittest.mock import MagicMock
@@ -122,6 +125,41 @@ def test_list_dataset_tables(client, dataset_fixture):
     assert len(response.data.getDataset.tables.nodes) == 2
 
 
+def test_list_dataset_tables_with_cursor(client, dataset_fixture):
+    q = """
+        query GetDataset($datasetUri:String!,$tableFilter:DatasetTableFilter){
+            getDataset(datasetUri:$datasetUri){
+                datasetUri
+                tables(filter:$tableFilter){
+                    hasNext
+                    nextCursor
+                    nodes{
+                        tableUri
+                    }
+                }
+            }
+        }
+    """
+    table_uris = []
+    cursor = None
+    while True:
+        response = client.query(
+            q,
+            username=dataset_fixture.owner,
+            datasetUri=dataset_fixture.datasetUri,
+            tableFilter={'pageSize': 3, 'cursor': cursor},
+            groups=[dataset_fixture.SamlAdminGroupName],
+        )
+        tables = response.data.getDataset.tables
+        assert len(tables.nodes) <= 3
+        table_uris += [node.tableUri for node in tables.nodes]
+        cursor = tables.nextCursor
+        if not tables.hasNext:
+            break
+    assert len(table_uris) >= 10
+    assert len(table_uris) == len(set(table_uris))
+
+
 def test_update_dataset_table_column(client, table, dataset_fixture, db):
     with db.scoped_session() as session:
         table = session.query(DatasetTable).filter(DatasetTable.name == 'table1').first()
@@ -159,7 +197,8 @@ def test_update_dataset_table_column(client, table, dataset_fixture, db):
         assert 'Unauthorized' in response.errors[0].message
 
 
-def test_sync_tables_and_columns(client, table, dataset_fixture, db):
+def test_sync_tables_and_columns(client, table, dataset_fixture, db, mocker):
+    athena_client = mocker.patch('dataall.modules.s3_datasets.services.dataset_table_service.AthenaTableClient')
     with db.scoped_session() as session:
         table = session.query(DatasetTable).filter(DatasetTable.name == 'table1').first()
         column = session.query(DatasetTableColumn).filter(DatasetTableColumn.tableUri == table.tableUri).first()
@@ -220,6 +259,9 @@ def test_sync_tables_and_columns(client, table, dataset_fixture, db):
         new_table: DatasetTable = session.query(DatasetTable).filter(DatasetTable.name == 'new_table').first()
         assert new_table
         assert new_table.GlueTableName == 'new_table'
+        assert ResourcePolicyService.check_user_resource_permission(
+            session, dataset_fixture.owner, [dataset_fixture.SamlAdminGroupName], new_table.tableUri, GET_DATASET_TABLE
+        )
         columns: [DatasetTableColumn] = (
             session.query(DatasetTableColumn)
             .filter(DatasetTableColumn.tableUri == new_table.tableUri)
@@ -247,6 +289,54 @@ def test_sync_tables_and_columns(client, table, dataset_fixture, db):
         assert deleted_table.LastGlueTableStatus == 'Deleted'
 
 
+def test_sync_table_columns_only_writes_changes(table, dataset_fixture, db):
+    synced_table = table(dataset=dataset_fixture, name='table_columns_sync', username=dataset_fixture.owner)
+
+    def glue_table(version, columns, partitions=()):
+        return {
+            'Name': 'table_columns_sync',
+            'VersionId': version,
+            'StorageDescriptor': {'Columns': [{'Name': name, 'Type': type} for name, type in columns]},
+            'PartitionKeys': [{'Name': name, 'Type': 'string'} for name in partitions],
+        }
+
+    def active_columns(session):
+        return {
+            (c.name, c.columnType): c
+            for c in session.query(DatasetTableColumn).filter(
+                DatasetTableColumn.tableUri == synced_table.tableUri, DatasetTableColumn.deleted.is_(None)
+            )
+        }
+
+    with db.scoped_session() as session:
+        dataset_table = session.query(DatasetTable).get(synced_table.tableUri)
+        DatasetTableRepository.sync_table_columns(
+            session, dataset_table, glue_table('1', [('a', 'string'), ('b', 'int')], ['p'])
+        )
+        columns = active_columns(session)
+        assert set(columns) == {('a', 'column'), ('b', 'column'), ('p', 'partition_0')}
+        uris = {key: column.columnUri for key, column in columns.items()}
+        columns[('a', 'column')].description = 'edited by the user'
+        session.commit()
+
+        DatasetTableRepository.sync_table_columns(
+            session, dataset_table, glue_table('2', [('a', 'string'), ('b', 'bigint'), ('c', 'string')])
+        )
+        session.commit()
+        session.expire_all()
+        columns = active_columns(session)
+        assert set(columns) == {('a', 'column'), ('b', 'column'), ('c', 'column')}
+        assert columns[('a', 'column')].columnUri == uris[('a', 'column')]
+        assert columns[('a', 'column')].description == 'edited by the user'
+        assert columns[('b', 'column')].columnUri == uris[('b', 'column')]
+        assert columns[('b', 'column')].typeName == 'bigint'
+
+        DatasetTableRepository.sync_table_columns(session, dataset_table, glue_table('2', [('d', 'string')]))
+        session.commit()
+        session.expire_all()
+        assert set(active_columns(session)) == {('a', 'column'), ('b', 'column'), ('c', 'column')}
+
+
 def delete_table(client, tableUri, username, groups):
     return client.query(
         """
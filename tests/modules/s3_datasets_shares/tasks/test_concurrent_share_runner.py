@@ -0,0 +1,96 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from dataall.modules.shares_base.db.share_object_repositories import ShareObjectRepository
+from dataall.modules.shares_base.services.concurrent_share_runner import ConcurrentShareRunner
+
+
+def test_shares_run_concurrently_per_dataset_and_account(db, mocker):
+    shares = [
+        SimpleNamespace(
+            shareUri=f'share{i}',
+            datasetUri=f'dataset{i % 3}',
+            principalId=f'principal{i}',
+            principalType='Group',
+            environmentUri='env',
+        )
+        for i in range(9)
+    ]
+    mocker.patch.object(
+        ShareObjectRepository,
+        'get_share_objects_target_accounts',
+        return_value={share.shareUri: 'account' for share in shares},
+    )
+    lock = threading.Lock()
+    running = {'datasets': set(), 'account': 0, 'max_account': 0}
+
+    def action(engine, share_uri):
+        dataset_uri = next(share.datasetUri for share in shares if share.shareUri == share_uri)
+        with lock:
+            assert dataset_uri not in running['datasets']
+            running['datasets'].add(dataset_uri)
+            running['account'] += 1
+            running['max_account'] = max(running['max_account'], running['account'])
+        time.sleep(0.01)
+        with lock:
+            running['datasets'].remove(dataset_uri)
+            running['account'] -= 1
+        if share_uri == 'share4':
+            raise Exception('verification failed')
+        return True
+
+    results = ConcurrentShareRunner(db, action, max_workers=3, max_workers_per_account=2).run(shares)
+
+    assert sorted(result.shareUri for result in results) == sorted(share.shareUri for share in shares)
+    assert running['max_account'] <= 2
+    assert [result.shareUri for result in results if not result.success] == ['share4']
+    assert all(result.duration > 0 for result in results)
+
+
+def test_shares_of_the_same_principal_are_not_run_concurrently(db, mocker):
+    shares = [
+        SimpleNamespace(
+            shareUri=f'share{i}',
+            datasetUri=f'dataset{i}',
+            principalId=principal,
+            principalType=principal_type,
+            environmentUri='env',
+        )
+        for i, (principal, principal_type) in enumerate(
+            [('role', 'ConsumptionRole'), ('role', 'ConsumptionRole'), ('group', 'Group'), ('other', 'Group')]
+        )
+    ]
+    # dataset3 links the shares of group and other
+    shares.append(
+        SimpleNamespace(
+            shareUri='share4', datasetUri='dataset3', principalId='group', principalType='Group', environmentUri='env'
+        )
+    )
+    mocker.patch.object(
+        ShareObjectRepository,
+        'get_share_objects_target_accounts',
+        return_value={share.shareUri: share.shareUri for share in shares},
+    )
+    lock = threading.Lock()
+    running = []
+    threads = {}
+
+    def action(engine, share_uri):
+        share = next(share for share in shares if share.shareUri == share_uri)
+        with lock:
+            assert share.principalId not in {s.principalId for s in running}
+            assert share.datasetUri not in {s.datasetUri for s in running}
+            running.append(share)
+            threads[share_uri] = threading.get_ident()
+        time.sleep(0.01)
+        with lock:
+            running.remove(share)
+        return True
+
+    results = ConcurrentShareRunner(db, action, max_workers=4).run(shares)
+
+    assert all(result.success for result in results)
+    # the shares of a principal across datasets are processed by the same worker
+    assert threads['share0'] == threads['share1']
+    assert threads['share2'] == threads['share3'] == threads['share4']
@@ -4,7 +4,7 @@ Remarks
 
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 
 import boto3
 import pytest
@@ -17,6 +17,7 @@ from dataall.core.environment.db.environment_models import Environment, Environm
 from dataall.modules.shares_base.services.shares_enums import ShareItemStatus
 from dataall.modules.shares_base.db.share_object_models import ShareObject, ShareObjectItem, ShareObjectItemDataFilter
 from dataall.modules.s3_datasets.db.dataset_models import DatasetTable, S3Dataset
+from dataall.modules.s3_datasets_shares.aws.lakeformation_client import LakeFormationClient
 from dataall.modules.s3_datasets_shares.services.s3_share_alarm_service import S3ShareAlarmService
 from dataall.modules.s3_datasets_shares.services.share_processors.glue_table_share_processor import (
     ProcessLakeFormationShare,
@@ -924,3 +925,85 @@ def test_handle_revoke_failure(
 
     # Then
     alarm_service_mock.assert_called_once()
+
+
+def test_grant_principals_permissions_to_source_tables(
+    manager_with_mocked_clients,
+    source_environment: Environment,
+    table1: DatasetTable,
+):
+    manager, lf_client, glue_client, mock_glue_client = manager_with_mocked_clients
+    lf_client.grant_permissions_batch.return_value = {0: 'AccessDeniedException: denied'}
+    # When
+    errors = manager.grant_principals_permissions_to_source_tables([(table1, None)])
+    # Then
+    grants = lf_client.grant_permissions_batch.call_args.args[0]
+    assert [grant['principal'] for grant in grants] == manager.principals
+    assert grants[0]['resource'] == {
+        'TableWithColumns': {
+            'DatabaseName': table1.GlueDatabaseName,
+            'Name': table1.GlueTableName,
+            'CatalogId': source_environment.AwsAccountId,
+            'ColumnWildcard': {},
+        }
+    }
+    assert grants[0]['permissions'] == ['DESCRIBE', 'SELECT']
+    assert list(errors) == [table1.tableUri]
+
+
+def test_lf_client_permissions_snapshot_and_batch_grants(mocker):
+    session = MagicMock()
+    mocker.patch('dataall.base.aws.sts.SessionHelper.remote_session', return_value=session)
+    mocker.patch('dataall.modules.s3_datasets_shares.aws.lakeformation_client.time.sleep')
+    client = session.client.return_value
+    principal = f'arn:aws:iam::{TARGET_ACCOUNT_ENV}:role/{TARGET_ACCOUNT_ENV_ROLE_NAME}'
+    paginate = client.get_paginator.return_value.paginate
+    paginate.side_effect = [
+        [{'PrincipalResourcePermissions': []}],
+        [
+            {
+                'PrincipalResourcePermissions': [
+                    {
+                        'Principal': {'DataLakePrincipalIdentifier': principal},
+                        'Resource': {'TableWithColumns': {'DatabaseName': 'db', 'Name': 't1', 'ColumnWildcard': {}}},
+                        'Permissions': ['DESCRIBE', 'SELECT'],
+                        'PermissionsWithGrantOption': [],
+                    },
+                    {
+                        'Principal': {'DataLakePrincipalIdentifier': 'arn:aws:iam::111111111111:role/other'},
+                        'Resource': {'TableWithColumns': {'DatabaseName': 'db', 'Name': 't2', 'ColumnWildcard': {}}},
+                        'Permissions': ['DESCRIBE', 'SELECT'],
+                        'PermissionsWithGrantOption': [],
+                    },
+                ]
+            }
+        ],
+    ]
+    client.batch_grant_permissions.side_effect = [
+        {'Failures': [{'RequestEntry': {'Id': '1'}, 'Error': {'ErrorCode': 'ConcurrentModificationException'}}]},
+        {'Failures': []},
+    ]
+    lf_client = LakeFormationClient(account_id=SOURCE_ENV_ACCOUNT, region='eu-west-1')
+    lf_client.load_permissions([principal], ['db'])
+    # list_permissions rejects a principal without a resource, the permissions are filtered by principal locally
+    assert paginate.call_args_list == [
+        call(CatalogId=SOURCE_ENV_ACCOUNT, ResourceType='DATABASE'),
+        call(CatalogId=SOURCE_ENV_ACCOUNT, ResourceType='TABLE'),
+    ]
+
+    # the checks are answered by the snapshot
+    assert lf_client.check_permissions_to_table_with_columns([principal], 'db', 't1', SOURCE_ENV_ACCOUNT, ['SELECT'])
+    assert not lf_client.check_permissions_to_table_with_columns(
+        [principal], 'db', 't2', SOURCE_ENV_ACCOUNT, ['SELECT']
+    )
+    client.list_permissions.assert_not_called()
+
+    # the granted permissions are skipped and the concurrent modifications retried
+    grants = [
+        *LakeFormationClient.build_table_grants([principal], 'db', 't1', SOURCE_ENV_ACCOUNT, ['DESCRIBE', 'SELECT']),
+        *LakeFormationClient.build_table_grants([principal], 'db', 't2', SOURCE_ENV_ACCOUNT, ['DESCRIBE', 'SELECT']),
+    ]
+    assert lf_client.grant_permissions_batch(grants) == {}
+    assert client.batch_grant_permissions.call_count == 2
+    assert [entry['Id'] for entry in client.batch_grant_permissions.call_args.kwargs['Entries']] == ['1']
+    assert lf_client.check_permissions_to_table_with_columns([principal], 'db', 't2', SOURCE_ENV_ACCOUNT, ['SELECT'])
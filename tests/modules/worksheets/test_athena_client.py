@@ -0,0 +1,124 @@
+import base64
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataall.modules.worksheets.aws.athena_client import AthenaClient, UnknownQueryError
+
+MODULE = 'dataall.modules.worksheets.aws.athena_client'
+TOKEN_KEY = b'token-key'
+
+
+def _rows(*values):
+    return [{'Data': [{'VarCharValue': value}]} for value in values]
+
+
+def _results(rows, next_token=None):
+    response = {'ResultSet': {'Rows': rows, 'ResultSetMetadata': {'ColumnInfo': [{'Name': 'id', 'Type': 'integer'}]}}}
+    if next_token:
+        response['NextToken'] = next_token
+    return response
+
+
+@pytest.fixture
+def athena(mocker):
+    session = MagicMock()
+    mocker.patch(f'{MODULE}.SessionHelper.remote_session')
+    mocker.patch(f'{MODULE}.SessionHelper.get_session', return_value=session)
+    client = session.client.return_value
+    client.get_query_execution.return_value = {
+        'QueryExecution': {
+            'StatementType': 'DML',
+            'WorkGroup': 'team-workgroup',
+            'Status': {'State': 'SUCCEEDED'},
+            'Statistics': {'TotalExecutionTimeInMillis': 120, 'DataScannedInBytes': 2048},
+        }
+    }
+    yield client
+
+
+def _get_results(query_id='qid', **kwargs):
+    return AthenaClient.get_athena_query_results(
+        aws_account_id='111111111111',
+        env_group=MagicMock(environmentAthenaWorkGroup='team-workgroup'),
+        region='eu-west-1',
+        query_id=query_id,
+        token_key=TOKEN_KEY,
+        **kwargs,
+    )
+
+
+def test_running_query_returns_status_only(athena):
+    athena.get_query_execution.return_value = {
+        'QueryExecution': {'WorkGroup': 'team-workgroup', 'Status': {'State': 'RUNNING'}}
+    }
+    result = _get_results()
+    assert result['Status'] == 'RUNNING'
+    assert result['records'] == []
+    athena.get_query_results.assert_not_called()
+
+
+def test_results_are_paginated(athena):
+    athena.get_query_results.return_value = _results(_rows('id', '1', '2'), next_token='athena-token')
+    first = _get_results(page_size=2)
+    assert athena.get_query_results.call_args.kwargs == {'QueryExecutionId': 'qid', 'MaxResults': 3}
+    assert first['records'] == [['1'], ['2']]
+    assert first['columns'] == [{'columnName': 'id', 'typeName': 'integer'}]
+    assert first['DataScannedInBytes'] == 2048
+
+    athena.get_query_results.return_value = _results(_rows('3'))
+    second = _get_results(page_size=2, next_token=first['nextToken'])
+    assert athena.get_query_results.call_args.kwargs['NextToken'] == 'athena-token'
+    assert second['records'] == [['3']]
+    assert second['nextToken'] is None
+
+
+def test_results_stop_at_max_rows(athena):
+    athena.get_query_results.return_value = _results(_rows('id', '1', '2'), next_token='athena-token')
+    first = _get_results(page_size=2, max_rows=3)
+    assert first['nextToken']
+
+    athena.get_query_results.return_value = _results(_rows('3'), next_token='athena-token-2')
+    second = _get_results(page_size=2, max_rows=3, next_token=first['nextToken'])
+    assert athena.get_query_results.call_args.kwargs['MaxResults'] == 1
+    assert second['nextToken'] is None
+
+
+def _token(*values):
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    'token',
+    [
+        'not-a-token',
+        _token('athena-token'),
+        _token({'a': 1}, 2, 'signature'),
+        _token('athena-token', -100, AthenaClient._token_signature('athena-token', -100, 'qid', TOKEN_KEY)),
+        _token('athena-token', 5, AthenaClient._token_signature('athena-token', 5, 'qid', TOKEN_KEY)),
+        _token('athena-token', 1, AthenaClient._token_signature('athena-token', 1, 'other-qid', TOKEN_KEY)),
+        _token('athena-token', 1, AthenaClient._token_signature('athena-token', 1, 'qid', b'other-key')),
+    ],
+)
+def test_invalid_token_is_rejected(athena, token):
+    with pytest.raises(ValueError):
+        _get_results(next_token=token, max_rows=3)
+    athena.get_query_results.assert_not_called()
+
+
+def test_token_rows_can_not_be_tampered_with(athena):
+    athena.get_query_results.return_value = _results(_rows('id', '1', '2'), next_token='athena-token')
+    athena_token, returned_rows, signature = json.loads(
+        base64.urlsafe_b64decode(_get_results(page_size=2, max_rows=3)['nextToken'])
+    )
+    assert returned_rows == 2
+    with pytest.raises(ValueError):
+        _get_results(next_token=_token(athena_token, 0, signature), max_rows=3)
+
+
+def test_queries_of_other_work_groups_are_rejected(athena):
+    athena.get_query_execution.return_value['QueryExecution']['WorkGroup'] = 'other-workgroup'
+    with pytest.raises(UnknownQueryError):
+        _get_results()
+    athena.get_query_results.assert_not_called()
@@ -59,6 +59,13 @@ def setup_Mutation_generateMetadata(iargs, **kwargs):
     iargs['targetType'] = 'S3_Dataset'
 
 
+def setup_Query_getStack(mocker, **kwargs):
+    mocker.patch(
+        'dataall.core.environment.services.environment_service.EnvironmentService.find_environment_by_uri_simplified',
+        return_value=MagicMock(),
+    )
+
+
 setup_EnvironmentSimplified_networks = setup_networks
 setup_Environment_networks = setup_networks
 